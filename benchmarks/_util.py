@@ -0,0 +1,10 @@
+"""Helpers shared by the benchmark scripts."""
+
+import time
+
+
+def timed(fn, *args, **kwargs):
+    """``(fn(*args, **kwargs), seconds it took)``."""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
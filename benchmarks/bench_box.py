@@ -0,0 +1,91 @@
+"""Box plot: raw-point figure against precomputed per-city statistics.
+
+For each city count and rows per city, a synthetic livability_index column
+is drawn as before, with px.box over every row, and with
+livability.quantiles: CityQuantiles folds the rows, then
+figures.box_figure draws its statistics. The report gives the time of each
+step, the serialized size of both figures, and the largest rank error of
+the sketched quartiles (0 while every city is kept exactly). The last step
+appends a row to 1% of the cities and recomputes only those.
+
+    python -m benchmarks.bench_box
+    python -m benchmarks.bench_box --cities 100 --rows-per-city 10 1000 100000 --max-raw-rows 1000000
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from benchmarks._util import timed
+from livability import figures
+from livability.figure_cache import figure_bytes
+from livability.quantiles import CityQuantiles
+
+
+def synthetic_rows(n_cities, rows_per_city, seed=0):
+    """``rows_per_city`` skewed livability_index values for each of ``n_cities`` cities."""
+    rng = np.random.default_rng(seed)
+    names = pd.Index([f'City{i:06d}' for i in range(n_cities)])
+    codes = np.repeat(np.arange(n_cities), rows_per_city)
+    # Each city its own spread and skew, so the quartiles differ between cities
+    shape = rng.uniform(1, 6, n_cities)[codes]
+    values = 100 * rng.beta(shape, 3, len(codes))
+    return pd.DataFrame({'city': pd.Categorical.from_codes(codes, names),
+                         'livability_index': values.astype(np.float32)})
+
+
+def max_rank_error(frame, stats):
+    """Largest |empirical CDF at a sketched quartile - its probability| over sketched cities."""
+    worst = 0.0
+    for city, values in frame.groupby('city', observed=True)['livability_index']:
+        row = stats.loc[city]
+        if row['exact']:
+            continue
+        values = np.sort(values.to_numpy(dtype=np.float64))
+        for p, column in ((0.25, 'q1'), (0.5, 'median'), (0.75, 'q3')):
+            rank = np.searchsorted(values, row[column]) / len(values)
+            worst = max(worst, abs(rank - p))
+    return worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cities', type=int, nargs='+', default=[50, 1000])
+    parser.add_argument('--rows-per-city', type=int, nargs='+', default=[5, 100, 10_000])
+    parser.add_argument('--max-raw-rows', type=int, default=2_000_000,
+                        help="skip the raw-point figure above this many rows")
+    args = parser.parse_args()
+
+    print(f"{'cities':>7} {'rows':>11} {'step':<18} {'time (ms)':>10} {'figure KB':>10} {'rank error':>11}")
+    for n_cities in args.cities:
+        for rows_per_city in args.rows_per_city:
+            frame = synthetic_rows(n_cities, rows_per_city)
+            rows = len(frame)
+
+            def line(step, seconds, fig=None, error=None):
+                size = f'{figure_bytes(fig) / 1024:>10.1f}' if fig is not None else f"{'':>10}"
+                error = f'{error:>11.4f}' if error is not None else ''
+                print(f"{n_cities:>7} {rows:>11,} {step:<18} {seconds * 1e3:>10.1f} {size} {error}")
+
+            if rows <= args.max_raw_rows:
+                fig, seconds = timed(px.box, frame, 'city', 'livability_index')
+                line('px.box (points)', seconds, fig)
+
+            quantiles = CityQuantiles('livability_index')
+            _, fold_s = timed(quantiles.update, frame)
+            stats, stats_s = timed(quantiles.stats)
+            line('fold', fold_s)
+            line('stats', stats_s, error=max_rank_error(frame, stats))
+            fig, seconds = timed(figures.box_figure, stats)
+            line('box figure', seconds, fig)
+
+            appended = synthetic_rows(n_cities, 1, seed=1).iloc[::100]
+            _, update_s = timed(quantiles.update, appended)
+            _, stats_s = timed(quantiles.stats)
+            line('append 1% + stats', update_s + stats_s)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Peak memory and time of the chunked backend's fold against loading the whole CSV.
+
+Writes synthetic CSVs chunk by chunk, then builds what the Leaderboard,
+heatmap and box plot pages read, in a fresh interpreter for each run so each
+peak RSS belongs to that run alone. ``--repeats`` writes every city-year that
+many times (several stations or wards per city), so rows grow while cities ×
+years stay fixed:
+
+- in-memory: load the frame, then the running leaderboard, the heatmap
+  pivot and the box plot statistics, as the default dashboard does
+- chunked: fold the file's chunks into livability.chunked.ChunkAggregates
+  and CityQuantiles, for each chunk size, then read the leaderboard, the
+  city × year table and the box plot statistics
+
+    python -m benchmarks.bench_chunked
+    python -m benchmarks.bench_chunked --cities 1000000 --repeats 1 --chunk-rows 100000 1000000
+"""
+
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from livability.synthetic import livability_chunks, write_chunks
+
+CHILD = r"""
+import json, resource, sys, time
+
+def peak_rss_kb():
+    # ru_maxrss can carry the parent's high-water mark across exec; VmHWM does not
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+from livability.chunked import ChunkedQueries
+from livability.heatmap import pivot_table
+from livability.quantiles import CityQuantiles
+from livability.reload import CityStats
+from livability.storage import DATASET_COLUMNS, prepare_rows, read_csv
+
+mode, path, chunk_rows = sys.argv[1], sys.argv[2], int(sys.argv[3])
+base = peak_rss_kb()
+start = time.perf_counter()
+if mode == 'in-memory':
+    frame = prepare_rows(read_csv(path, columns=DATASET_COLUMNS))
+    stats, quantiles = CityStats('livability_index'), CityQuantiles('livability_index')
+    stats.reset(frame)
+    quantiles.reset(frame)
+    leaderboard, table, box = stats.top(50), pivot_table(frame), quantiles.stats()
+    held = frame.memory_usage(deep=True).sum() + quantiles.nbytes()
+else:
+    queries = ChunkedQueries(path, chunk_rows)
+    queries.refresh()
+    leaderboard, table, box = queries.leaderboard(50), queries.pivot(), queries.box_stats()
+    held = queries.aggregates.nbytes() + queries.quantiles.nbytes()
+print(json.dumps({
+    'seconds': time.perf_counter() - start,
+    'peak_rss_mb': (peak_rss_kb() - base) / 1024,
+    'held_mb': held / 2**20,
+}))
+"""
+
+
+def measure(mode, path, chunk_rows=0):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run(
+        [sys.executable, '-c', CHILD, mode, path, str(chunk_rows)],
+        check=True, capture_output=True, text=True, cwd=root,
+    )
+    return json.loads(out.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cities', type=int, default=200_000)
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--repeats', type=int, nargs='+', default=[1, 4])
+    parser.add_argument('--chunk-rows', type=int, nargs='+', default=[50_000, 250_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>11} {'CSV (MB)':>9} {'mode':>10} {'chunk rows':>11} {'seconds':>8} {'peak RSS (MB)':>14} "
+          f"{'held (MB)':>10}")
+    for repeats in args.repeats:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'livability.csv')
+            rows = write_chunks(itertools.chain.from_iterable(
+                livability_chunks(args.cities, args.years, seed=seed) for seed in range(repeats)), path)
+            size = os.path.getsize(path) / 2**20
+            runs = [('in-memory', 0)] + [('chunked', chunk_rows) for chunk_rows in args.chunk_rows]
+            for mode, chunk_rows in runs:
+                result = measure(mode, path, chunk_rows)
+                print(f"{rows:>11,} {size:>9,.0f} {mode:>10} {chunk_rows or '-':>11} {result['seconds']:>8.1f} "
+                      f"{result['peak_rss_mb']:>14.0f} {result['held_mb']:>10.0f}")
+    print(f"\n{args.cities:,} cities × {args.years} years. held: the loaded frame, or the chunked backend's "
+          f"aggregates, which grow with cities × years, and with rows only up to a few hundred per city.")
+
+
+if __name__ == '__main__':
+    main()
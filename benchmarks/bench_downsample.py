@@ -0,0 +1,79 @@
+"""Serialized size and build time of a line chart, full SVG trace vs WebGL + downsampling.
+
+For each series length a random-walk sensor series is plotted three ways:
+the plain Scatter trace, and optimize_line_figure() with LTTB and with
+min/max bucketing. Time covers building the figure and serializing it to
+JSON, which is what st.plotly_chart ships to the browser.
+
+Then, for each city count, the whole-dataset trend and grouped-bar figures
+are built from a synthetic dataset: with a trace per city, as px draws them
+(up to ``--max-full-cities``), and as livability.figures draws them, with
+the best MAX_CITY_TRACES cities and the mean of the others.
+
+    python -m benchmarks.bench_downsample
+    python -m benchmarks.bench_downsample --points 10000 1000000 --max-points 1000 --cities 100 10000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from livability import figures
+from livability.downsample import MAX_POINTS, optimize_line_figure
+from livability.synthetic import livability_chunks
+
+
+def build(x, y, method, max_points):
+    fig = go.Figure(go.Scatter(x=x, y=y, mode='lines'))
+    if method is not None:
+        optimize_line_figure(fig, max_points=max_points, method=method)
+    return fig.to_json()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--points', type=int, nargs='+', default=[1_000, 100_000, 1_000_000, 10_000_000])
+    parser.add_argument('--max-points', type=int, default=MAX_POINTS)
+    parser.add_argument('--cities', type=int, nargs='+', default=[20, 1000, 5000])
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--max-full-cities', type=int, default=1000,
+                        help="skip the trace-per-city figures above this many cities")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    build(np.arange(10), np.arange(10), None, args.max_points)  # warm up plotly's validators
+    print(f"{'points':>12} {'renderer':<16} {'time (s)':>9} {'payload KB':>11}")
+    for n in args.points:
+        x = pd.date_range('2024-10-15 14:00:00', periods=n, freq='10ms').to_numpy()
+        y = 25 + rng.standard_normal(n).cumsum() * 0.01
+        for label, method in (('svg (full)', None), ('webgl + lttb', 'lttb'), ('webgl + minmax', 'minmax')):
+            start = time.perf_counter()
+            payload = build(x, y, method, args.max_points)
+            elapsed = time.perf_counter() - start
+            print(f"{n:>12,} {label:<16} {elapsed:>9.3f} {len(payload) / 1024:>11.1f}")
+
+    print(f"\n{'cities':>12} {'figure':<22} {'time (s)':>9} {'payload KB':>11}")
+    for n_cities in args.cities:
+        df = pd.concat(livability_chunks(n_cities, args.years))[['city', 'year', 'livability_index']]
+        builds = [
+            ('trends (per city)', lambda: optimize_line_figure(
+                px.line(df, x='year', y='livability_index', color='city', markers=True))),
+            ('trends (top + others)', lambda: figures.trends_figure(df)),
+            ('bars (per city)', lambda: px.bar(df, x='year', y='livability_index', color='city', barmode='group')),
+            ('bars (top + others)', lambda: figures.grouped_bar_figure(df)),
+        ]
+        for label, build_figure in builds:
+            if '(per city)' in label and n_cities > args.max_full_cities:
+                continue
+            start = time.perf_counter()
+            payload = build_figure().to_json()
+            elapsed = time.perf_counter() - start
+            print(f"{n_cities:>12,} {label:<22} {elapsed:>9.3f} {len(payload) / 1024:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
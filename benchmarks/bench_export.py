@@ -0,0 +1,53 @@
+"""Figure export throughput and scaling with the number of worker processes.
+
+Exports every figure of a synthetic dataset (see livability.export) with 1,
+2, 4, ... up to --max-workers processes and reports figures/sec and the
+speedup over a single process. Building a figure is CPU-bound Python, so
+the speedup is bounded by the physical core count.
+
+    python -m benchmarks.bench_export
+    python -m benchmarks.bench_export --cities 200 --max-workers 16 --format html
+"""
+
+import argparse
+import os
+import tempfile
+
+from livability.export import FORMATS, export_figures
+from livability.synthetic import livability_chunks, write_chunks
+
+
+def worker_counts(max_workers):
+    count = 1
+    while count < max_workers:
+        yield count
+        count *= 2
+    yield max_workers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cities', type=int, default=20)
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--comparison-size', type=int, default=2)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--format', choices=FORMATS, default='json')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'livability.csv')
+        write_chunks(livability_chunks(args.cities, args.years), source)
+        print(f"{args.cities} cities × {args.years} years, {os.cpu_count()} CPUs")
+        print(f"{'workers':>8} {'figures':>8} {'time (s)':>9} {'figures/s':>10} {'speedup':>8}")
+
+        baseline = None
+        for workers in worker_counts(args.max_workers):
+            output = os.path.join(tmp, f'figures_{workers}')
+            count, _, elapsed = export_figures(source, output, args.format, workers, args.comparison_size)
+            rate = count / elapsed
+            baseline = baseline or rate
+            print(f"{workers:>8} {count:>8,} {elapsed:>9.2f} {rate:>10.1f} {rate / baseline:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
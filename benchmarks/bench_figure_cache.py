@@ -0,0 +1,99 @@
+"""Shared figure cache: hit rate, memory and time per request for many viewers.
+
+Simulates --requests figure requests from concurrent viewers over a
+synthetic dataset. Each request asks for a radar, City Analysis trend or
+comparison figure, with cities drawn from a Zipf distribution, since a few
+popular cities get most views. The requests are served by building every
+figure, and then through a FigureCache (see livability.figure_cache) at each
+--budget-mb. With --spill, evicted figures go to a temporary directory.
+
+    python -m benchmarks.bench_figure_cache
+    python -m benchmarks.bench_figure_cache --cities 1000 --budget-mb 1 4 16 --spill
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from livability import figures
+from livability.export import load_city_index
+from livability.figure_cache import FigureCache
+from livability.synthetic import livability_chunks, write_chunks
+from livability.transforms import take_sub_indices
+
+
+def request_keys(city_index, n_requests, zipf, seed=0):
+    """(kind, city, year) of every request, popular cities first."""
+    rng = np.random.default_rng(seed)
+    cities = city_index.cities.tolist()
+    years = city_index.years.tolist()
+    ranks = np.minimum(rng.zipf(zipf, n_requests), len(cities)) - 1
+    kinds = rng.choice(['radar', 'city_trend', 'comparison'], n_requests)
+    picked_years = rng.choice(years, n_requests)
+    return [(kind, cities[rank], int(year)) for kind, rank, year in zip(kinds, ranks, picked_years)]
+
+
+def build(city_index, key):
+    kind, city, year = key
+    if kind == 'radar':
+        return figures.radar_figure(city_index.city(city, year, year).iloc[0], city, year)
+    if kind == 'city_trend':
+        return figures.city_trend_figure(city_index.city(city), city)
+    rows = city_index.cities_positions([city, city_index.cities[0]], year=year)
+    sub_df = take_sub_indices(city_index.sub_indices, rows)
+    return figures.sub_indices_bar_figure(sub_df, year)
+
+
+def serve(keys, viewers, fetch):
+    """Seconds to serve ``keys`` split across ``viewers`` threads calling ``fetch(key)``."""
+    def viewer(offset):
+        for key in keys[offset::viewers]:
+            fetch(key)
+
+    threads = [threading.Thread(target=viewer, args=(offset,)) for offset in range(viewers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cities', type=int, default=200)
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--requests', type=int, default=3000)
+    parser.add_argument('--viewers', type=int, default=8)
+    parser.add_argument('--zipf', type=float, default=1.3, help="Zipf exponent of city popularity")
+    parser.add_argument('--budget-mb', type=float, nargs='+', default=[0.5, 2, 8, 64])
+    parser.add_argument('--spill', action='store_true', help="spill evicted figures to a temporary directory")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = f'{tmp}/livability.csv'
+        write_chunks(livability_chunks(args.cities, args.years), source)
+        city_index = load_city_index(source)
+        keys = request_keys(city_index, args.requests, args.zipf)
+        print(f"{args.cities} cities × {args.years} years, {args.requests:,} requests from {args.viewers} viewers, "
+              f"{len(set(keys)):,} distinct figures")
+
+        uncached = serve(keys, args.viewers, lambda key: build(city_index, key))
+        print(f"\n{'budget MB':>10} {'hit rate':>9} {'disk hits':>10} {'evicted':>8} {'held MB':>8} "
+              f"{'ms/request':>11} {'speedup':>8}")
+        print(f"{'no cache':>10} {'':>9} {'':>10} {'':>8} {'':>8} {uncached / len(keys) * 1e3:>11.2f} {1:>7.2f}x")
+
+        for budget in args.budget_mb:
+            spill_dir = tempfile.mkdtemp(dir=tmp) if args.spill else None
+            cache = FigureCache(int(budget * 2**20), spill_dir=spill_dir)
+            elapsed = serve(keys, args.viewers, lambda key: cache.get_or_build(key, lambda: build(city_index, key)))
+            stats = cache.stats()
+            print(f"{budget:>10g} {stats['hit_rate']:>9.1%} {stats['disk_hits']:>10,} {stats['evictions']:>8,} "
+                  f"{stats['bytes'] / 2**20:>8.2f} {elapsed / len(keys) * 1e3:>11.2f} {uncached / elapsed:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
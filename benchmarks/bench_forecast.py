@@ -0,0 +1,87 @@
+"""Trend forecasting: one batched fit of every city against a least-squares loop per city.
+
+For each city count, a synthetic city × year table (with a few missing
+cells) is fitted with livability.forecast.TrendForecast, then projected
+with its prediction band for every city. The same fit and band are then
+computed city by city with np.linalg.lstsq, as a loop would, up to
+``--max-loop-cities``. The report gives both times and the largest
+difference between their projections.
+
+    python -m benchmarks.bench_forecast
+    python -m benchmarks.bench_forecast --cities 1000 100000 --years 20 --horizon 5
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.stats import t
+
+from livability.forecast import DEFAULT_LEVEL, TrendForecast
+
+
+def synthetic_table(n_cities, n_years, seed=0, missing=0.02):
+    """Noisy linear livability trends of ``n_cities`` cities from 2019, with ``missing`` of the cells empty."""
+    rng = np.random.default_rng(seed)
+    years = np.arange(2019, 2019 + n_years)
+    values = (rng.uniform(20, 80, (n_cities, 1)) + rng.normal(0, 2, (n_cities, 1)) * (years - 2019)
+              + rng.normal(0, 3, (n_cities, n_years)))
+    values[rng.random(values.shape) < missing] = np.nan
+    return pd.DataFrame(values, index=[f'City{i:06d}' for i in range(n_cities)], columns=years)
+
+
+def loop_forecast(table, horizon, level=DEFAULT_LEVEL):
+    """Projections of each city fitted on its own, as (n_cities, horizon)."""
+    years = table.columns.to_numpy(dtype=np.float64)
+    center = years.mean()
+    future = np.vander(np.arange(years.max() + 1, years.max() + 1 + horizon) - center, 2, increasing=True)
+    forecast = np.full((len(table), horizon), np.nan)
+    upper = np.full((len(table), horizon), np.nan)
+    for i, row in enumerate(table.to_numpy(dtype=np.float64)):
+        observed = ~np.isnan(row)
+        design = np.vander(years[observed] - center, 2, increasing=True)
+        if observed.sum() < 2:
+            continue
+        coef, *_ = np.linalg.lstsq(design, row[observed], rcond=None)
+        forecast[i] = future @ coef
+        dof = observed.sum() - 2
+        if dof > 0:
+            variance = ((row[observed] - design @ coef) ** 2).sum() / dof
+            spread = np.einsum('yi,ij,yj->y', future, np.linalg.inv(design.T @ design), future)
+            upper[i] = forecast[i] + t.ppf((1 + level) / 2, dof) * np.sqrt(variance * (1 + spread))
+    return forecast, upper
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cities', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--horizon', type=int, default=3)
+    parser.add_argument('--max-loop-cities', type=int, default=10000)
+    args = parser.parse_args()
+
+    print(f"{'cities':>8} {'fit (ms)':>9} {'predict (ms)':>13} {'loop (ms)':>10} {'speedup':>8} {'max diff':>9}")
+    for n_cities in args.cities:
+        table = synthetic_table(n_cities, args.years)
+
+        start = time.perf_counter()
+        model = TrendForecast(table)
+        fit_s = time.perf_counter() - start
+        start = time.perf_counter()
+        forecast, _, upper = model.predict(model.future_years(args.horizon))
+        predict_s = time.perf_counter() - start
+
+        loop, diff = f"{'':>10} {'':>8}", ''
+        if n_cities <= args.max_loop_cities:
+            start = time.perf_counter()
+            looped, looped_upper = loop_forecast(table, args.horizon)
+            loop_s = time.perf_counter() - start
+            loop = f"{loop_s * 1e3:>10.1f} {loop_s / (fit_s + predict_s):>7.0f}x"
+            diff = f"{np.nanmax(np.abs(np.concatenate([forecast - looped, upper - looped_upper]))):>9.1e}"
+        print(f"{n_cities:>8,} {fit_s * 1e3:>9.1f} {predict_s * 1e3:>13.1f} {loop} {diff}")
+    print(f"\n{args.years} years, projected {args.horizon} years ahead with a {DEFAULT_LEVEL:.0%} prediction band.")
+
+
+if __name__ == '__main__':
+    main()
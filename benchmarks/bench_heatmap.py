@@ -0,0 +1,48 @@
+"""Heatmap engine: time per step and figure payload against the dense heatmap.
+
+For each city count, a synthetic dataset's heatmap is built as before, from
+the dense pivot of every city. It is then built with livability.heatmap:
+each row order, then aggregation to MAX_ROWS rows. The report gives the
+time of each step and the serialized size of both figures.
+
+    python -m benchmarks.bench_heatmap
+    python -m benchmarks.bench_heatmap --cities 1000 10000 50000
+"""
+
+import argparse
+
+import pandas as pd
+
+from benchmarks._util import timed
+from livability import figures
+from livability.figure_cache import figure_bytes
+from livability.heatmap import MAX_ROWS, ORDERS, aggregate_rows, pivot_table, row_order
+from livability.synthetic import livability_chunks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cities', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--years', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'cities':>7} {'step':<18} {'time (ms)':>10} {'figure KB':>10}")
+    for n_cities in args.cities:
+        frame = pd.concat(livability_chunks(n_cities, args.years), ignore_index=True)
+        table, seconds = timed(pivot_table, frame)
+        print(f"{n_cities:>7} {'pivot':<18} {seconds * 1e3:>10.1f}")
+
+        dense, seconds = timed(figures.heatmap_figure, table)
+        print(f"{n_cities:>7} {'dense figure':<18} {seconds * 1e3:>10.1f} {figure_bytes(dense) / 1024:>10.1f}")
+
+        for order in ORDERS:
+            positions, order_s = timed(row_order, table, order)
+            aggregated, aggregate_s = timed(aggregate_rows, table, positions, MAX_ROWS)
+            fig, figure_s = timed(figures.heatmap_figure, aggregated)
+            print(f"{n_cities:>7} {'order: ' + order:<18} {order_s * 1e3:>10.1f}")
+            print(f"{n_cities:>7} {'  aggregate + fig':<18} {(aggregate_s + figure_s) * 1e3:>10.1f} "
+                  f"{figure_bytes(fig) / 1024:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Throughput benchmark for the vectorized livability index engine.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_indices
+    python -m benchmarks.bench_indices --sizes 100000 1000000 --repeat 5
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from livability.indices import compute_indices
+
+
+def synthetic_frame(n_rows, seed=0):
+    """Raw indicators in the ranges seen in urban_livability_data.csv."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'pm2.5': rng.uniform(25, 110, n_rows),
+        'pm10': rng.uniform(50, 215, n_rows),
+        'no2': rng.uniform(20, 62, n_rows),
+        'so2': rng.uniform(2, 24, n_rows),
+        'population': rng.uniform(1e7, 3.1e7, n_rows),
+        'area': rng.uniform(580, 1900, n_rows),
+        'bpl_population': rng.uniform(30, 60, n_rows),
+        'hi': rng.uniform(0.65, 0.85, n_rows),
+    })
+
+
+def run(sizes, repeat):
+    print(f"{'rows':>12} {'best (s)':>10} {'rows/sec':>14}")
+    for n_rows in sizes:
+        df = synthetic_frame(n_rows)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            compute_indices(df)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        print(f"{n_rows:>12,} {best:>10.4f} {n_rows / best:>14,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10**5, 10**6, 10**7])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
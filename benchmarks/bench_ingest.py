@@ -0,0 +1,55 @@
+"""Ingest time of per-city indicator files against reader threads.
+
+Splits a synthetic dataset into one file per city and source
+(livability.ingest) and times loading, validating and joining them with 1 to
+64 reader threads. Local files sit in the page cache, so reading them is
+CPU-bound. ``--latency-ms`` adds a per-file wait before each read, like the
+round trip to a network share or object store. That wait is what the thread
+pool overlaps.
+
+    python -m benchmarks.bench_ingest
+    python -m benchmarks.bench_ingest --cities 5000 --latency-ms 0 20
+"""
+
+import argparse
+import tempfile
+import time
+
+import pandas as pd
+
+from livability.ingest import load_indicator_files, read_indicator_file, write_indicator_files
+from livability.synthetic import livability_chunks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cities', type=int, default=2000)
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 16, 64])
+    parser.add_argument('--latency-ms', type=float, nargs='+', default=[0, 10])
+    args = parser.parse_args()
+
+    frame = pd.concat(livability_chunks(args.cities, args.years), ignore_index=True)
+    with tempfile.TemporaryDirectory() as root:
+        n_files = write_indicator_files(frame, root)
+        print(f"{n_files:,} files ({args.cities:,} cities × {n_files // args.cities} sources, "
+              f"{args.years} years each)")
+        print(f"{'latency (ms)':>12} {'workers':>8} {'seconds':>9} {'files/s':>9} {'speed-up':>9}")
+        for latency_ms in args.latency_ms:
+            def read(source, city, path):
+                time.sleep(latency_ms / 1000)
+                return read_indicator_file(source, city, path)
+
+            baseline = None
+            for workers in args.workers:
+                start = time.perf_counter()
+                joined = load_indicator_files(root, workers, read=read)
+                seconds = time.perf_counter() - start
+                assert len(joined) == len(frame)
+                baseline = baseline or seconds
+                print(f"{latency_ms:>12g} {workers:>8} {seconds:>9.2f} {n_files / seconds:>9,.0f} "
+                      f"{baseline / seconds:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
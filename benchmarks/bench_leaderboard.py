@@ -0,0 +1,71 @@
+"""Leaderboard rerun cost: groupby + per-city annotations vs the incremental aggregate store.
+
+The old page grouped the whole frame on every rerun and added one Plotly
+annotation per city. The new page reads the cached ranking of CityStats and
+labels ranks with a single text trace. Time covers ranking, building the
+figure and serializing it to JSON; top-K shows the cost of charting only
+the best K cities. Every add_annotation() call revalidates the annotations
+added so far, so the old variant is quadratic and only runs up to
+--baseline-max cities.
+
+    python -m benchmarks.bench_leaderboard
+    python -m benchmarks.bench_leaderboard --cities 5000 50000 --top 50
+"""
+
+import argparse
+
+import pandas as pd
+import plotly.express as px
+
+from benchmarks._util import timed
+from livability.figures import leaderboard_figure
+from livability.reload import CityStats
+from livability.synthetic import livability_chunks
+
+
+def annotated_leaderboard(df):
+    """The leaderboard page before the aggregate store"""
+    leaderboard = df.groupby('city', observed=True)['livability_index'].mean().sort_values(ascending=False).reset_index()
+    leaderboard['rank'] = range(1, len(leaderboard) + 1)
+    fig = px.bar(leaderboard, x='city', y='livability_index', color='livability_index',
+                 color_continuous_scale='viridis')
+    for i, row in leaderboard.iterrows():
+        fig.add_annotation(x=row['city'], y=row['livability_index'] + 1, text=f"#{row['rank']}",
+                           showarrow=False, font=dict(size=14, color="black"))
+    return fig.to_json()
+
+
+def aggregate_leaderboard(stats, k=None):
+    leaderboard = stats.table() if k is None else stats.top(k)
+    return leaderboard_figure(leaderboard).to_json()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cities', type=int, nargs='+', default=[200, 5000])
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--top', type=int, default=50)
+    parser.add_argument('--baseline-max', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'cities':>8} {'variant':<28} {'time (s)':>9} {'payload KB':>11}")
+    for n_cities in args.cities:
+        df = pd.concat(livability_chunks(n_cities, args.years))
+        stats = CityStats('livability_index')
+        stats.reset(df)
+        stats.table()  # ranked once per data update, as on the page
+
+        variants = [
+            ("groupby + annotations", annotated_leaderboard, df),
+            ("aggregates + text trace", aggregate_leaderboard, stats),
+            (f"aggregates, top {args.top}", aggregate_leaderboard, stats, args.top),
+        ]
+        if n_cities > args.baseline_max:
+            variants = variants[1:]
+        for label, fn, *fn_args in variants:
+            payload, elapsed = timed(fn, *fn_args)
+            print(f"{n_cities:>8,} {label:<28} {elapsed:>9.3f} {len(payload) / 1024:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Page filter latency: boolean masks over the full frame vs CityYearIndex slices.
+
+    python -m benchmarks.bench_lookup
+    python -m benchmarks.bench_lookup --cities 20000 --years 25
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from livability.lookup import CityYearIndex
+
+
+def synthetic_frame(n_cities, n_years, seed=0):
+    rng = np.random.default_rng(seed)
+    n_rows = n_cities * n_years
+    return pd.DataFrame({
+        'year': np.tile(np.arange(2019, 2019 + n_years), n_cities).astype('int16'),
+        'city': pd.Categorical(np.repeat([f"City{i:06d}" for i in range(n_cities)], n_years)),
+        'livability_index': rng.uniform(40, 60, n_rows).astype('float32'),
+    })
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cities', type=int, default=10000)
+    parser.add_argument('--years', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    df = synthetic_frame(args.cities, args.years)
+    start = time.perf_counter()
+    index = CityYearIndex(df)
+    print(f"{len(df):,} rows; index built in {time.perf_counter() - start:.3f} s")
+
+    city = index.cities[len(index.cities) // 2]
+    cities = list(index.cities[:: max(1, len(index.cities) // 5)])
+    first, last = int(index.years[2]), int(index.years[-3])
+    year = int(index.years[-1])
+    cases = [
+        ("city + year range",
+         lambda: df[(df['city'] == city) & (df['year'] >= first) & (df['year'] <= last)].sort_values('year'),
+         lambda: index.city(city, first, last)),
+        ("cities in one year",
+         lambda: df[df['city'].isin(cities) & (df['year'] == year)],
+         lambda: index.take(index.cities_positions(cities, year=year))),
+        ("one year",
+         lambda: df[df['year'] == year],
+         lambda: index.year(year)),
+    ]
+
+    print(f"{'lookup':>20} {'mask (ms)':>10} {'index (ms)':>11} {'speedup':>8}")
+    for name, mask, lookup in cases:
+        t_mask = best_of(mask, args.repeat) * 1e3
+        t_index = best_of(lookup, args.repeat) * 1e3
+        print(f"{name:>20} {t_mask:>10.3f} {t_index:>11.3f} {t_mask / t_index:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Bytes per row of the in-process dataset and its derived structures, before and after compaction.
+
+"before" is the representation the dashboard used to hold:
+- the frame as read_csv infers it: object city strings, 64-bit numbers
+- a re-sorted copy of it in the city×year index
+- the sub-indices melted with object sub-index names
+- a float64 what-if matrix
+- copies for every filter
+
+"after" is the current one:
+- the schema-typed frame: categorical city, float32, int16 year
+- the index sharing the frame when it is already city-major
+- a categorical long frame
+- a float32 matrix
+- a city filter that is a view of the frame
+
+Each "before" structure besides the frame is built, measured (deep memory
+usage) and freed in turn, so the peak stays near two copies of the loose frame.
+
+    python -m benchmarks.bench_memory                    # 10^7 rows
+    python -m benchmarks.bench_memory --rows 1000000
+"""
+
+import argparse
+import gc
+
+import numpy as np
+import pandas as pd
+
+from livability.indices import SUB_INDICES
+from livability.lookup import CityYearIndex
+from livability.storage import apply_schema
+from livability.synthetic import livability_chunks
+from livability.whatif import WeightedIndex
+
+
+def frame_bytes(df):
+    return int(df.memory_usage(deep=True, index=False).sum())
+
+
+def report(name, before, after, rows):
+    saved = 1 - after / before if before else 0.0
+    print(f"{name:<30} {before / rows:>10.1f} {after / rows:>10.1f} {saved:>8.0%}")
+    return before, after
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--years', type=int, default=5)
+    args = parser.parse_args()
+
+    n_cities = max(1, args.rows // args.years)
+    # The synthetic chunks come as read_csv infers them without a schema
+    baseline = pd.concat(livability_chunks(n_cities, args.years), ignore_index=True)
+    baseline['city'] = baseline['city'].astype(object)
+    melted = baseline.melt(id_vars=['city', 'year'], value_vars=SUB_INDICES, var_name='subindex',
+                           value_name='value')
+    melted_bytes = frame_bytes(melted)
+    del melted
+    gc.collect()
+    compact = apply_schema(baseline)
+    rows = len(compact)
+    print(f"{rows:,} rows ({n_cities:,} cities × {args.years} years)")
+    print(f"{'structure (bytes/row)':<30} {'before':>10} {'after':>10} {'saved':>8}")
+    totals = []
+
+    totals.append(report("dataset frame", frame_bytes(baseline), frame_bytes(compact), rows))
+
+    # The old index always held a sorted copy; the new one shares a city-major frame
+    index = CityYearIndex(compact)
+    shared = np.shares_memory(index.frame['pm2.5'].to_numpy(), compact['pm2.5'].to_numpy())
+    totals.append(report("city×year index frame", frame_bytes(baseline), 0 if shared else frame_bytes(index.frame),
+                         rows))
+
+    totals.append(report("sub-indices (long)", melted_bytes, frame_bytes(index.sub_indices), rows))
+
+    weighted = WeightedIndex(index)
+    old_weighted = rows * (len(SUB_INDICES) + 1) * 8
+    totals.append(report("what-if arrays", old_weighted, weighted.matrix.nbytes + weighted.published.nbytes, rows))
+
+    # A 5-year city filter, as Dashboard.city_rows takes it: a copy of its rows before,
+    # a view of the frame and of the what-if scores now (0 bytes held per rerun)
+    city = index.cities[0]
+    city_rows = index.city_slice(city)
+    view = index.take(city_rows)
+    scores = weighted.scores((0.4, 0.1, 0.3, 0.2))
+    view_shared = (np.shares_memory(view['pm2.5'].to_numpy(), index.frame['pm2.5'].to_numpy())
+                   and np.shares_memory(scores[city_rows], scores))
+    copy_bytes = frame_bytes(baseline.loc[baseline['city'] == city].copy())
+    print(f"{'city filter (bytes/result)':<30} {copy_bytes:>10,} {0 if view_shared else frame_bytes(view):>10,}")
+
+    before = sum(b for b, _ in totals)
+    after = sum(a for _, a in totals)
+    print(f"{'total':<30} {before / rows:>10.1f} {after / rows:>10.1f} {1 - after / before:>8.0%}")
+    print(f"{'total MB':<30} {before / 2**20:>10,.0f} {after / 2**20:>10,.0f}")
+
+
+if __name__ == '__main__':
+    main()
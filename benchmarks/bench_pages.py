@@ -0,0 +1,213 @@
+"""End-to-end rerun benchmark of every dashboard page, driven headlessly by AppTest.
+
+For each dataset size a synthetic dataset is generated (see sample.py
+livability) and urban-livability-dashboard.py is pointed at it through
+LIVABILITY_DATA. The standalone variant runs once on its embedded data. For
+every page the report records:
+
+- cold_s: the first visit, with the page's caches empty
+- warm_s: the median of --repeat reruns with unchanged widgets
+- peak_mb: peak heap allocated on top of what was already held, during a cold
+  visit (tracemalloc, in a separate pass)
+- figure_bytes / table_bytes: serialized size of the page's Plotly charts and dataframes
+
+Results go to a JSON report. --compare against an earlier report prints the
+change in warm latency per page.
+
+    python -m benchmarks.bench_pages --cities 100 1000 10000 --output bench_pages.json
+    python -m benchmarks.bench_pages --skip-memory --repeat 1
+    python -m benchmarks.bench_pages --compare bench_pages.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import pandas as pd
+import plotly
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from livability.synthetic import livability_chunks, write_chunks
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DASHBOARD = os.path.join(ROOT, 'urban-livability-dashboard.py')
+STANDALONE = os.path.join(ROOT, 'urban-livability-dashboard-standalone.py')
+PAGES = ["🏠 Home", "📊 City Analysis", "🔄 City Comparison", "📈 Visualizations", "🏆 Leaderboard", "ℹ️ About"]
+ALL_FIGURES = "📈 Visualizations (all figures)"
+
+
+def payload_bytes(at, element_type):
+    return sum(element.proto.ByteSize() for element in at.get(element_type))
+
+
+def reset_caches():
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+def visit(at, page):
+    """Put the app on ``page`` without running it yet."""
+    if page == ALL_FIGURES:
+        at.sidebar.selectbox[0].select(PAGES[3])
+        at.run()
+        at.radio(key='viz_layout').set_value("All figures")
+    else:
+        at.sidebar.selectbox[0].select(page)
+
+
+def timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return elapsed
+
+
+def bench_app(script, timeout, repeat):
+    """Latency and payload per page; the first entry is the cold start on the Home page."""
+    reset_caches()
+    at = AppTest.from_file(script, default_timeout=timeout)
+    results = {'startup': {'cold_s': timed_run(at)}}
+    for page in PAGES + [ALL_FIGURES]:
+        visit(at, page)
+        cold = timed_run(at)
+        warm = statistics.median(timed_run(at) for _ in range(repeat))
+        results[page] = {
+            'cold_s': cold,
+            'warm_s': warm,
+            'figure_bytes': payload_bytes(at, 'plotly_chart'),
+            'table_bytes': payload_bytes(at, 'dataframe'),
+        }
+    return results
+
+
+def bench_memory(script, timeout, results):
+    """Peak traced allocation per cold page visit, in a pass of its own."""
+    reset_caches()
+    tracemalloc.start()
+    try:
+        at = AppTest.from_file(script, default_timeout=timeout)
+        timed_run(at)
+        results['startup']['peak_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+        for page in PAGES + [ALL_FIGURES]:
+            visit(at, page)
+            tracemalloc.reset_peak()
+            held = tracemalloc.get_traced_memory()[0]
+            timed_run(at)
+            results[page]['peak_mb'] = (tracemalloc.get_traced_memory()[1] - held) / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(cities, years, repeat, timeout, memory=True):
+    runs = []
+    standalone = bench_app(STANDALONE, timeout, repeat)
+    if memory:
+        bench_memory(STANDALONE, timeout, standalone)
+    runs.append({'script': os.path.basename(STANDALONE), 'cities': 5, 'rows': 25, 'pages': standalone})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = os.environ.get('LIVABILITY_DATA')
+        try:
+            for n_cities in cities:
+                path = os.path.join(tmp, f'livability_{n_cities}.csv')
+                rows = write_chunks(livability_chunks(n_cities, years), path)
+                os.environ['LIVABILITY_DATA'] = path
+                pages = bench_app(DASHBOARD, timeout, repeat)
+                if memory:
+                    bench_memory(DASHBOARD, timeout, pages)
+                runs.append({'script': os.path.basename(DASHBOARD), 'cities': n_cities, 'rows': rows,
+                             'pages': pages})
+                print_run(runs[-1])
+        finally:
+            if previous is None:
+                os.environ.pop('LIVABILITY_DATA', None)
+            else:
+                os.environ['LIVABILITY_DATA'] = previous
+
+    print_run(runs[0])
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'streamlit': st.__version__,
+            'pandas': pd.__version__,
+            'plotly': plotly.__version__,
+            'years': years,
+            'repeat': repeat,
+        },
+        'runs': runs,
+    }
+
+
+def print_run(run):
+    print(f"\n{run['script']} — {run['cities']:,} cities, {run['rows']:,} rows")
+    print(f"{'page':<34} {'cold (s)':>9} {'warm (s)':>9} {'peak MB':>8} {'fig KB':>9} {'table KB':>9}")
+    for page, stats in run['pages'].items():
+        print(f"{page:<34} {stats['cold_s']:>9.3f} {stats.get('warm_s', float('nan')):>9.3f} "
+              f"{stats.get('peak_mb', float('nan')):>8.1f} {stats.get('figure_bytes', 0) / 1024:>9.1f} "
+              f"{stats.get('table_bytes', 0) / 1024:>9.1f}")
+
+
+def compare(report, baseline):
+    """Print warm-latency ratios (current / baseline) for runs present in both reports."""
+    previous = {(r['script'], r['cities']): r['pages'] for r in baseline['runs']}
+    print(f"\nWarm rerun vs {baseline['meta'].get('commit') or 'baseline'} (ratio < 1 is faster)")
+    for run in report['runs']:
+        old_pages = previous.get((run['script'], run['cities']))
+        if old_pages is None:
+            continue
+        print(f"{run['script']} — {run['cities']:,} cities")
+        for page, stats in run['pages'].items():
+            old = old_pages.get(page, {})
+            if 'warm_s' in stats and old.get('warm_s'):
+                print(f"  {page:<34} {old['warm_s']:>8.3f} -> {stats['warm_s']:>8.3f} s "
+                      f"({stats['warm_s'] / old['warm_s']:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cities', type=int, nargs='+', default=[100, 1000])
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--timeout', type=float, default=600)
+    parser.add_argument('--skip-memory', action='store_true', help="skip the (slower) tracemalloc pass")
+    parser.add_argument('--output', default='bench_pages.json')
+    parser.add_argument('--compare', help="earlier JSON report to compare warm latencies against")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    report = run(args.cities, args.years, args.repeat, args.timeout, memory=not args.skip_memory)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {args.output}")
+
+    if baseline is not None:
+        compare(report, baseline)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Page latency of the SQL backend against the in-memory pandas path.
+
+Writes a synthetic dataset to a SQLite database indexed on (city, year)
+(livability.query) and to a Parquet file. The pandas path pays once to load
+the whole frame and build its structures, as the dashboard's first run does:
+the city×year index, the running leaderboard and the heatmap pivot. After
+that each page is an in-memory lookup. The SQL path loads nothing up front;
+each page runs its query cold and materializes only the rows it returns.
+
+    python -m benchmarks.bench_query                     # 10^7 rows
+    python -m benchmarks.bench_query --rows 1000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks._util import timed
+from livability.heatmap import pivot_table
+from livability.lookup import CityYearIndex
+from livability.query import SqlQueries, SqlTableView, write_database
+from livability.reload import CityStats
+from livability.storage import apply_schema, parquet_available, read_parquet
+from livability.synthetic import livability_chunks
+from livability.tables import TableView
+from livability.whatif import WeightedIndex, normalize_weights
+
+WHATIF = normalize_weights((0.4, 0.2, 0.2, 0.2))
+
+
+def frame_bytes(df):
+    return int(df.memory_usage(deep=True, index=False).sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--years', type=int, default=5)
+    args = parser.parse_args()
+
+    n_cities = max(1, args.rows // args.years)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'livability.db')
+        (_, rows), build_s = timed(write_database, livability_chunks(n_cities, args.years), db_path)
+        print(f"{rows:,} rows ({n_cities:,} cities × {args.years} years); "
+              f"database built in {build_s:.1f} s, {os.path.getsize(db_path) / 2**20:,.0f} MB")
+
+        # Pandas path: load everything, then build what the pages use
+        start = time.perf_counter()
+        if parquet_available():
+            parquet_path = os.path.join(tmp, 'livability.parquet')
+            pd.concat(livability_chunks(n_cities, args.years), ignore_index=True).to_parquet(parquet_path,
+                                                                                             index=False)
+            start = time.perf_counter()
+            frame = read_parquet(parquet_path)
+        else:
+            frame = apply_schema(pd.concat(livability_chunks(n_cities, args.years), ignore_index=True))
+        load_s = time.perf_counter() - start
+        index = CityYearIndex(frame)
+        stats = CityStats('livability_index')
+        stats.reset(index.frame)
+        stats.table()
+        startup_s = time.perf_counter() - start
+        print(f"pandas startup: {startup_s:.1f} s ({load_s:.1f} s to load), {frame_bytes(frame) / 2**20:,.0f} MB "
+              f"frame in memory; SQL startup: none\n")
+
+        queries = SqlQueries(db_path)
+        city = str(index.cities[len(index.cities) // 2])
+        cities = [str(c) for c in index.cities[:5]]
+        year = int(index.years[-1])
+        weighted = WeightedIndex(index)
+        view, sql_view = TableView(index.frame), SqlTableView(queries)
+        page = max(1, rows // 25 // 2)
+
+        pages = [
+            ("overview metrics",
+             lambda: pd.Series({'rows': len(frame), 'cities': frame['city'].nunique(),
+                                'mean': frame['livability_index'].mean()}),
+             queries.overview),
+            ("home page (sorted, 25 rows)",
+             lambda: view.page(page, 25, sort_by='livability_index', ascending=False)[0],
+             lambda: sql_view.page(page, 25, sort_by='livability_index', ascending=False)[0]),
+            ("city analysis (1 city)", lambda: index.city(city), lambda: queries.city(city)),
+            ("comparison (5 cities, 1 year)",
+             lambda: index.take(index.cities_positions(cities, year=year)),
+             lambda: queries.cities_year(cities, year)),
+            ("sub-indices (1 year)", lambda: index.year(year), lambda: queries.year(year)),
+            ("leaderboard (top 50)", lambda: stats.top(50), lambda: queries.leaderboard(50)),
+            ("what-if leaderboard (top 50)",
+             lambda: weighted.ranking(WHATIF).head(50),
+             lambda: queries.leaderboard(50, WHATIF)),
+            ("heatmap pivot", lambda: pivot_table(index.frame, 'livability_index'), queries.pivot),
+        ]
+        print(f"{'page':<32} {'pandas (ms)':>12} {'SQL (ms)':>10} {'SQL rows':>12}")
+        for name, in_memory, sql in pages:
+            _, pandas_s = timed(in_memory)
+            result, sql_s = timed(sql)
+            n = len(result) if isinstance(result, pd.DataFrame) else 1
+            print(f"{name:<32} {pandas_s * 1e3:>12,.1f} {sql_s * 1e3:>10,.1f} {n:>12,}")
+        print("\nSQL results are memoized per database stamp, so repeat page views cost a dictionary lookup.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Cost of picking up one appended year: full reload vs incremental merge.
+
+A dataset of --cities × --years rows is written as CSV and loaded once. Then
+one more year for every city is appended and picked up two ways: a full
+reload of the file (what clearing the cache would do), and
+ReloadingDataset.refresh(), which parses only the appended bytes and updates
+the leaderboard and heatmap aggregates from those rows.
+
+    python -m benchmarks.bench_reload
+    python -m benchmarks.bench_reload --cities 100000 --years 10
+"""
+
+import argparse
+import os
+import tempfile
+
+import pandas as pd
+
+from benchmarks._util import timed
+from livability.reload import CityStats, CityYearPivot, ReloadingDataset
+from livability.sources import FileSource
+from livability.storage import DATASET_COLUMNS, prepare_rows
+from livability.synthetic import livability_chunks, write_chunks
+
+
+def dataset(path):
+    return ReloadingDataset(
+        FileSource(path),
+        columns=DATASET_COLUMNS,
+        prepare=prepare_rows,
+        aggregates={'leaderboard': CityStats('livability_index'), 'heatmap': CityYearPivot('livability_index')},
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cities', type=int, default=20000)
+    parser.add_argument('--years', type=int, default=5)
+    args = parser.parse_args()
+
+    full = pd.concat(livability_chunks(args.cities, args.years + 1))
+    last_year = full['year'].max()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'livability.csv')
+        write_chunks([full[full['year'] < last_year]], path)
+        live = dataset(path)
+        rows, initial = timed(live.refresh)
+        print(f"{args.cities:,} cities × {args.years} years: initial load of {rows:,} rows {initial:.3f} s")
+
+        appended = full[full['year'] == last_year]
+        with open(path, 'a') as out:
+            appended.to_csv(out, header=False, index=False)
+
+        new_rows, incremental = timed(live.refresh)
+        _, reload_s = timed(lambda: dataset(path).refresh())
+        print(f"append of {new_rows:,} rows ({last_year}):")
+        print(f"  full reload           {reload_s:>8.3f} s")
+        print(f"  incremental refresh   {incremental:>8.3f} s  ({reload_s / incremental:.1f}x faster)")
+
+        frame = live.frame
+        _, groupby_s = timed(lambda: frame.groupby('city', observed=True)['livability_index'].mean())
+        _, pivot_s = timed(lambda: frame.pivot(index='city', columns='year', values='livability_index'))
+        print(f"  recomputing leaderboard / heatmap from the full frame would add "
+              f"{groupby_s:.3f} s / {pivot_s:.3f} s")
+        print(f"  reloads {live.reloads}, appends {live.appends}")
+
+
+if __name__ == '__main__':
+    main()
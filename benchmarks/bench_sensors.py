@@ -0,0 +1,95 @@
+"""Append-to-chart latency and memory of the live sensor stream at a given input rate.
+
+A writer thread appends readings to a CSV at --rate Hz while the main thread
+polls every --interval seconds the way the sensor dashboard does: tail the
+file, snapshot the ring buffer and serialize a three-trace Plotly figure
+(WebGL and min/max downsampled, unless --no-downsample).
+Latency is measured per reading, from its write to the end of that refresh.
+
+    python -m benchmarks.bench_sensors
+    python -m benchmarks.bench_sensors --rate 1000 --seconds 20 --capacity 60000
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import plotly.graph_objects as go
+
+from livability.downsample import optimize_line_figure
+from livability.sensors import SENSOR_HEADER, SensorStream
+
+
+def rss_mb():
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return float('nan')
+
+
+def writer(path, rate, stop):
+    rng = np.random.default_rng(0)
+    interval = 1.0 / rate
+    next_tick = time.perf_counter()
+    with open(path, 'a') as out:
+        out.write(SENSOR_HEADER + '\n')
+        while not stop.is_set():
+            stamp = datetime.fromtimestamp(time.time(), timezone.utc).replace(tzinfo=None)
+            out.write(f"{stamp.isoformat(sep=' ', timespec='microseconds')},"
+                      f"{rng.integers(0, 1023)},{20 + 10 * rng.random():.2f},{40 + 20 * rng.random():.2f}\n")
+            out.flush()
+            next_tick += interval
+            time.sleep(max(0.0, next_tick - time.perf_counter()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rate', type=float, default=100.0)
+    parser.add_argument('--interval', type=float, default=0.5)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--capacity', type=int, default=6000)
+    parser.add_argument('--no-downsample', action='store_true', help="serialize every buffered reading as SVG")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sensor_data.csv')
+        stop = threading.Event()
+        thread = threading.Thread(target=writer, args=(path, args.rate, stop), daemon=True)
+        thread.start()
+
+        stream = SensorStream(path, capacity=args.capacity)
+        latencies, rss = [], []
+        deadline = time.perf_counter() + args.seconds
+        while time.perf_counter() < deadline:
+            time.sleep(args.interval)
+            new_rows = stream.poll()
+            readings = stream.snapshot()
+            fig = go.Figure([go.Scatter(x=readings['timestamp'], y=readings[col], mode='lines')
+                             for col in ('light_intensity', 'temperature', 'humidity')])
+            if not args.no_downsample:
+                optimize_line_figure(fig, method='minmax')
+            fig.to_json()
+            done = time.time()
+            if new_rows:
+                written = readings['timestamp'].iloc[-new_rows:].astype('int64').to_numpy() / 1e6
+                latencies.append(done - written)
+            rss.append(rss_mb())
+
+        stop.set()
+        thread.join()
+
+    latencies = np.concatenate(latencies)
+    print(f"{stream.buffer.total:,} readings at {args.rate:g} Hz, refresh every {args.interval:g} s, "
+          f"buffer {args.capacity:,}")
+    print(f"latency  p50 {np.percentile(latencies, 50):.3f} s  p99 {np.percentile(latencies, 99):.3f} s  "
+          f"max {latencies.max():.3f} s")
+    print(f"RSS      first refresh {rss[0]:.1f} MB  last {rss[-1]:.1f} MB  max {max(rss):.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
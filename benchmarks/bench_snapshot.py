@@ -0,0 +1,132 @@
+"""Requests/sec of the static snapshot server against live reruns of the dashboard script.
+
+A synthetic dataset is exported as a snapshot (see livability.snapshot) and
+served on a local port. --clients threads then fetch random figure and
+table routes over keep-alive connections for --seconds, and the report
+gives requests/sec and latency percentiles. For comparison, the live
+dashboard is pointed at the same data and every page is rerun warm with
+AppTest; one rerun is what each viewer interaction costs there. The
+in-process lookup time (resolving a route and opening its file) is the
+floor the server's HTTP handling adds to.
+
+    python -m benchmarks.bench_snapshot
+    python -m benchmarks.bench_snapshot --cities 100 --clients 8 --seconds 10
+"""
+
+import argparse
+import http.client
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+import timeit
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.bench_pages import DASHBOARD, PAGES, timed_run
+from livability.snapshot import build_snapshot, make_server
+from livability.synthetic import livability_chunks, write_chunks
+
+
+def hammer(port, routes, clients, seconds):
+    """(requests, per-request latencies) of ``clients`` threads fetching ``routes`` for ``seconds``."""
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def client(seed):
+        rng = random.Random(seed)
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        mine = []
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            conn.request('GET', rng.choice(routes))
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                raise RuntimeError(f"HTTP {response.status}")
+            mine.append(time.perf_counter() - start)
+        conn.close()
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=client, args=(seed,)) for seed in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(latencies), latencies
+
+
+def live_reruns(source, repeat, timeout):
+    """Median warm rerun time per page of the live dashboard over ``source``."""
+    previous = os.environ.get('LIVABILITY_DATA')
+    os.environ['LIVABILITY_DATA'] = source
+    try:
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        at = AppTest.from_file(DASHBOARD, default_timeout=timeout)
+        timed_run(at)
+        results = {}
+        for page in PAGES:
+            at.sidebar.selectbox[0].select(page)
+            timed_run(at)
+            results[page] = statistics.median(timed_run(at) for _ in range(repeat))
+        return results
+    finally:
+        if previous is None:
+            os.environ.pop('LIVABILITY_DATA', None)
+        else:
+            os.environ['LIVABILITY_DATA'] = previous
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cities', type=int, default=10)
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--clients', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--timeout', type=float, default=600)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'livability.csv')
+        write_chunks(livability_chunks(args.cities, args.years), source)
+        start = time.perf_counter()
+        build_snapshot(source, os.path.join(tmp, 'snapshot'))
+        print(f"Snapshot built in {time.perf_counter() - start:.1f} s")
+
+        server = make_server(os.path.join(tmp, 'snapshot'), port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        store = server.store
+        routes = [route for route in store.routes if route.startswith(('/figures/', '/tables/'))]
+        lookup_s = min(timeit.repeat(lambda: store.lookup(routes[0])[0].close(), number=10_000, repeat=5)) / 10_000
+        try:
+            requests, latencies = hammer(server.server_address[1], routes, args.clients, args.seconds)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        print(f"\nSnapshot server — {len(routes):,} routes, {args.clients} clients, {os.cpu_count()} CPUs")
+        print(f"  route lookup      {lookup_s * 1e6:>10.2f} µs")
+        print(f"  requests/sec      {requests / args.seconds:>10,.0f}")
+        print(f"  latency p50 / p99 {percentile(latencies, 0.5) * 1e3:>6.2f} / "
+              f"{percentile(latencies, 0.99) * 1e3:.2f} ms")
+
+        print(f"\nLive dashboard — warm reruns, {args.cities} cities × {args.years} years")
+        print(f"{'page':<24} {'rerun (ms)':>11} {'reruns/sec':>11}")
+        for page, seconds in live_reruns(source, args.repeat, args.timeout).items():
+            print(f"{page:<24} {seconds * 1e3:>11.1f} {1 / seconds:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""Cold-start load time and resident memory: plain CSV vs schema-typed CSV vs Parquet.
+
+Each load runs in a fresh interpreter so timings include no warm caches and the
+peak RSS is attributable to that load alone. Parquet needs pyarrow.
+
+    python -m benchmarks.bench_storage
+    python -m benchmarks.bench_storage --rows 5000000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from livability.storage import convert_csv, parquet_available
+
+CHILD = r"""
+import json, resource, sys, time
+import pandas as pd
+from livability.storage import read_csv, read_parquet
+
+def peak_rss_kb():
+    # ru_maxrss can carry the parent's high-water mark across exec; VmHWM does not
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+mode, path = sys.argv[1], sys.argv[2]
+base = peak_rss_kb()
+start = time.perf_counter()
+if mode == 'csv':
+    df = pd.read_csv(path)
+elif mode == 'typed-csv':
+    df = read_csv(path)
+else:
+    df = read_parquet(path)
+elapsed = time.perf_counter() - start
+peak = peak_rss_kb()
+print(json.dumps({
+    'seconds': elapsed,
+    'peak_rss_mb': (peak - base) / 1024,
+    'frame_mb': df.memory_usage(deep=True).sum() / 2**20,
+}))
+"""
+
+
+def synthetic_csv(path, n_rows, seed=0):
+    """Write an n_rows dataset shaped like urban_livability_data.csv."""
+    rng = np.random.default_rng(seed)
+    n_cities = max(1, n_rows // 5)
+    city = np.repeat([f"City{i:06d}" for i in range(n_cities)], 5)[:n_rows]
+    year = np.tile(np.arange(2019, 2024), n_cities)[:n_rows]
+    df = pd.DataFrame({
+        'year': year,
+        'city': city,
+        'pm2.5': rng.uniform(25, 110, n_rows).round(2),
+        'pm10': rng.uniform(50, 215, n_rows).round(2),
+        'no2': rng.uniform(20, 62, n_rows).round(2),
+        'so2': rng.uniform(2, 24, n_rows).round(2),
+        'population': rng.integers(10_000_000, 31_000_000, n_rows),
+        'area': rng.uniform(580, 1900, n_rows).round(2),
+        'bpl_population': rng.uniform(30, 60, n_rows).round(2),
+        'aqi': rng.uniform(0.3, 0.75, n_rows),
+        'pdi': rng.uniform(0, 0.6, n_rows),
+        'hi': rng.uniform(0.65, 0.85, n_rows),
+        'bpl_index': rng.uniform(0.4, 0.7, n_rows),
+        'livability_index': rng.uniform(40, 60, n_rows),
+    })
+    df.to_csv(path, index=False)
+
+
+def measure(mode, path):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run(
+        [sys.executable, '-c', CHILD, mode, path],
+        check=True, capture_output=True, text=True, cwd=root,
+    )
+    return json.loads(out.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10**6)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'livability.csv')
+        synthetic_csv(csv_path, args.rows)
+        runs = [('csv', csv_path), ('typed-csv', csv_path)]
+        if parquet_available():
+            runs.append(('parquet', convert_csv(csv_path)))
+        else:
+            print("pyarrow not installed; skipping parquet")
+
+        print(f"{args.rows:,} rows")
+        print(f"{'format':>10} {'load (s)':>10} {'peak RSS (MB)':>14} {'frame (MB)':>11} {'file (MB)':>10}")
+        for mode, path in runs:
+            result = measure(mode, path)
+            size = os.path.getsize(path) / 2**20
+            print(f"{mode:>10} {result['seconds']:>10.3f} {result['peak_rss_mb']:>14.1f} "
+                  f"{result['frame_mb']:>11.1f} {size:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Data table payload: the whole frame against one server-side page, per page size.
+
+st.dataframe serializes its frame to Arrow bytes for the browser. This
+benchmark times that serialization for a whole synthetic dataset. For each
+page size it then times the server-side steps of a TableView
+(livability.tables): sorting by livability_index (cold, then memoized),
+filtering on a city name, cutting out a page, and serializing that page.
+
+    python -m benchmarks.bench_tables
+    python -m benchmarks.bench_tables --rows 10000000 --page-sizes 25 250
+"""
+
+import argparse
+
+import pandas as pd
+from streamlit.dataframe_util import convert_pandas_df_to_arrow_bytes
+
+from benchmarks._util import timed
+from livability.storage import apply_schema
+from livability.synthetic import livability_chunks
+from livability.tables import PAGE_SIZES, TableView
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--page-sizes', type=int, nargs='+', default=list(PAGE_SIZES))
+    args = parser.parse_args()
+
+    frame = apply_schema(pd.concat(livability_chunks(max(1, args.rows // args.years), args.years),
+                                   ignore_index=True))
+    payload, seconds = timed(convert_pandas_df_to_arrow_bytes, frame)
+    print(f"{len(frame):,} rows; whole table: {seconds * 1e3:,.1f} ms to serialize, {len(payload) / 2**20:,.1f} MB")
+
+    view = TableView(frame)
+    _, sort_cold = timed(view.rows, sort_by='livability_index', ascending=False)
+    _, sort_warm = timed(view.rows, sort_by='livability_index', ascending=False)
+    query = str(frame['city'].iat[len(frame) // 2])[:-1]
+    _, filter_s = timed(view.rows, query=query)
+    print(f"sort: {sort_cold * 1e3:.1f} ms cold, {sort_warm * 1e6:.1f} µs memoized; "
+          f"filter '{query}': {filter_s * 1e3:.1f} ms")
+
+    print(f"\n{'page size':>10} {'window (ms)':>12} {'serialize (ms)':>15} {'page KB':>9} {'vs whole':>9}")
+    for page_size in args.page_sizes:
+        page = max(1, len(frame) // page_size // 2)
+        (window, _), window_s = timed(view.page, page, page_size, sort_by='livability_index', ascending=False)
+        page_payload, serialize_s = timed(convert_pandas_df_to_arrow_bytes, window)
+        print(f"{page_size:>10} {window_s * 1e3:>12.2f} {serialize_s * 1e3:>15.2f} "
+              f"{len(page_payload) / 1024:>9.1f} {len(page_payload) / len(payload):>9.2%}")
+
+
+if __name__ == '__main__':
+    main()
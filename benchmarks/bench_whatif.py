@@ -0,0 +1,77 @@
+"""What-if recomputation latency at dataset scale: pandas vs the matrix engine and its LRU.
+
+For each slider position a new weights vector re-scores every row and
+re-ranks every city over a year window. The pandas variant does what a page
+would do without the engine (weighted column sum + groupby mean + sort). The
+engine variants show a cold recomputation (matrix-vector product +
+bincounts) and a warm one, where scrubbing back to a visited position is an
+LRU hit.
+
+    python -m benchmarks.bench_whatif
+    python -m benchmarks.bench_whatif --cities 1000000 --years 10
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+
+from livability.indices import SUB_INDICES
+from livability.lookup import CityYearIndex
+from livability.synthetic import livability_chunks
+from livability.whatif import WeightedIndex
+
+
+def pandas_ranking(df, weights, first_year, last_year):
+    offsets = (np.asarray(weights) / np.sum(weights) - 0.25) * 100
+    scores = df['livability_index'] + (df[SUB_INDICES] * offsets).sum(axis=1)
+    in_window = df['year'].between(first_year, last_year)
+    means = scores[in_window].groupby(df.loc[in_window, 'city'], observed=True).mean()
+    return means.sort_values(ascending=False)
+
+
+def median_time(fn, positions):
+    times = []
+    for weights in positions:
+        start = time.perf_counter()
+        fn(weights)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cities', type=int, default=200000)
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--positions', type=int, default=10, help="slider positions visited")
+    args = parser.parse_args()
+
+    df = pd.concat(livability_chunks(args.cities, args.years), ignore_index=True)
+    first_year, last_year = int(df['year'].min()) + 1, int(df['year'].max())
+    rng = np.random.default_rng(0)
+    positions = [tuple(np.round(rng.uniform(0.05, 1, 4), 2)) for _ in range(args.positions)]
+
+    start = time.perf_counter()
+    engine = WeightedIndex(CityYearIndex(df), maxsize=4 * args.positions)
+    build = time.perf_counter() - start
+
+    def rank(weights):
+        return engine.ranking(weights, first_year, last_year)
+
+    pandas_s = median_time(lambda w: pandas_ranking(df, w, first_year, last_year), positions)
+    cold_s = median_time(rank, positions)
+    warm_s = median_time(rank, positions)
+
+    print(f"{len(df):,} rows ({args.cities:,} cities × {args.years} years), "
+          f"{args.positions} weight vectors, window {first_year}–{last_year}")
+    print(f"  engine build (once per dataset version)  {build:>8.3f} s")
+    print(f"  pandas re-score + groupby               {pandas_s * 1000:>8.1f} ms")
+    print(f"  engine, new weights                     {cold_s * 1000:>8.1f} ms")
+    print(f"  engine, revisited weights (LRU hit)     {warm_s * 1000:>8.3f} ms")
+    print(f"  LRU hits {engine.hits}, misses {engine.misses}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,9 @@
+"""Shared building blocks for the Urban Livability Index dashboards."""
+
+from livability.indices import (
+    INDEX_COLUMNS,
+    RAW_INDICATORS,
+    SUB_INDICES,
+    add_indices,
+    compute_indices,
+)
@@ -0,0 +1,1002 @@
+"""The Urban Livability Index dashboard, shared by every entry point.
+
+The entry points only choose a data source (see livability.sources). The
+loaded data follows its source (see livability.reload); the city×year index
+and the figures are cached per source and dataset version, so every entry
+point runs the same cached pipeline. With LIVABILITY_BACKEND=sql the pages
+query a database instead of loading the dataset (see livability.query), and
+with LIVABILITY_BACKEND=chunked they are answered from the file read in
+chunks (see livability.chunked).
+"""
+
+import os
+
+import pandas as pd
+import streamlit as st
+
+from livability import figures
+from livability.chunked import ChunkedQueries
+from livability.figure_cache import DEFAULT_MAX_BYTES, FigureCache
+from livability.forecast import DEFAULT_HORIZON, MAX_HORIZON, TrendForecast, city_forecast
+from livability.heatmap import MAX_ROWS, aggregate_rows, row_order
+from livability.indices import SUB_INDICES
+from livability.lookup import CityYearIndex
+from livability.profiling import Profiler, profiling_enabled, prometheus_text, tracked_cache
+from livability.quantiles import CityQuantiles
+from livability.query import SqlQueries, SqlTableView
+from livability.reload import CityStats, CityYearPivot, ReloadingDataset
+from livability.sources import EMBEDDED, resolve_source
+from livability.storage import DATASET_COLUMNS, DISPLAY_COLUMNS, prepare_rows
+from livability.tables import DEFAULT_PAGE_SIZE, PAGE_SIZES, TableView, page_count
+from livability.transforms import sub_indices_long, take_sub_indices
+from livability.whatif import EQUAL_WEIGHTS, WeightedIndex, normalize_weights, weighted_scores
+
+DEFAULT_SOURCE = 'urban_livability_data.csv'
+PAGES = ["🏠 Home", "📊 City Analysis", "🔄 City Comparison", "📈 Visualizations", "🏆 Leaderboard", "ℹ️ About"]
+# Leaderboards of more cities show only the top K, this many by default
+LEADERBOARD_TOP = 50
+# Cities of the published study; its findings are only shown for a dataset of exactly these
+STUDY_CITIES = ('Chennai', 'Bangalore', 'Mumbai', 'Delhi', 'Kolkata')
+
+CSS = """
+<style>
+.main-header {
+    color: #1f4e79;
+    font-size: 2.5rem;
+    font-weight: bold;
+    text-align: center;
+    margin-bottom: 1rem;
+}
+
+.sub-header {
+    color: #2c5aa0;
+    font-size: 1.5rem;
+    font-weight: bold;
+    margin-bottom: 1rem;
+}
+
+.metric-container {
+    background-color: #f0f2f6;
+    padding: 1rem;
+    border-radius: 10px;
+    margin: 0.5rem 0;
+}
+
+.info-box {
+    background-color: #e8f4ff;
+    padding: 1rem;
+    border-left: 4px solid #2c5aa0;
+    margin: 1rem 0;
+    border-radius: 5px;
+}
+
+.sidebar-content {
+    background-color: #f8f9fa;
+    padding: 1rem;
+    border-radius: 10px;
+    margin-bottom: 1rem;
+}
+
+.data-table {
+    font-size: 12px;
+}
+</style>
+"""
+
+
+@tracked_cache(st.cache_resource)
+def load_dataset(source):
+    """The urban livability data of `source`, shared across sessions and refreshed on every run"""
+    return ReloadingDataset(
+        resolve_source(source),
+        columns=DATASET_COLUMNS,
+        prepare=prepare_rows,
+        aggregates={
+            'leaderboard': CityStats('livability_index'),
+            'heatmap': CityYearPivot('livability_index'),
+            'box': CityQuantiles('livability_index'),
+        }
+    )
+
+# Caches keyed on the dataset version are handed that version's frame or table
+# (unhashed, `_`-prefixed), since the dataset may have moved on by the time they run
+
+@tracked_cache(st.cache_resource)
+def load_city_year_index(source, version, _frame):
+    """City×year lookup index over the dataset frame of `version`, shared read-only across sessions"""
+    return CityYearIndex(_frame)
+
+@tracked_cache(st.cache_resource)
+def load_weighted_index(source, version, _city_index):
+    """What-if engine over the city×year index of `version`, memoizing scores and rankings per weights"""
+    return WeightedIndex(_city_index)
+
+@tracked_cache(st.cache_resource)
+def load_figure_cache():
+    """Built figures shared by every session, bounded by LIVABILITY_FIGURE_CACHE_MB and spilled to LIVABILITY_FIGURE_SPILL"""
+    max_mb = os.environ.get('LIVABILITY_FIGURE_CACHE_MB')
+    return FigureCache(
+        max_bytes=int(float(max_mb) * 2**20) if max_mb else DEFAULT_MAX_BYTES,
+        spill_dir=os.environ.get('LIVABILITY_FIGURE_SPILL') or None
+    )
+
+# Visualizations: figures are built through the shared figure cache (see
+# Dashboard.cached_figure), keyed on the dataset version and their widget
+# values, so a rerun only rebuilds a figure whose inputs changed
+
+@tracked_cache(st.cache_data)
+def load_heatmap_order(source, version, order, _table):
+    """Row order of the city × year heatmap table of `version`, computed once per order"""
+    return row_order(_table, order)
+
+@tracked_cache(st.cache_data)
+def load_heatmap_table(source, version, order, max_rows, _table):
+    """Heatmap table of `version` in the given order, with rows averaged into groups above `max_rows`"""
+    return aggregate_rows(_table, load_heatmap_order(source, version, order, _table), max_rows)
+
+@tracked_cache(st.cache_resource)
+def load_trend_forecast(source, version, _table):
+    """Per-city trends fitted to the city × year table of `version` in one batch, for the City Analysis forecast"""
+    return TrendForecast(_table)
+
+@tracked_cache(st.cache_resource, max_entries=64)
+def load_table_view(source, version, section, key, _frame):
+    """Server-side pager over the table `section` shows for widget values `key` (`_frame` is not hashed)"""
+    return TableView(_frame)
+
+# SQL backend (LIVABILITY_BACKEND=sql): query results are memoized per
+# database stamp inside SqlQueries, which every session shares
+
+@tracked_cache(st.cache_resource)
+def load_queries(source):
+    """Page queries over the database `source` names, or the one built next to its CSV"""
+    return SqlQueries.open(source)
+
+@tracked_cache(st.cache_data)
+def load_sql_heatmap_table(source, version, order, max_rows):
+    """Heatmap table pivoted in SQL, in the given order, with rows averaged into groups above `max_rows`"""
+    table = load_queries(source).pivot()
+    return aggregate_rows(table, row_order(table, order), max_rows)
+
+@tracked_cache(st.cache_resource)
+def load_sql_trend_forecast(source, version):
+    """Per-city trends fitted in one batch to the table pivoted in SQL"""
+    return TrendForecast(load_queries(source).pivot())
+
+# Chunked backend (LIVABILITY_BACKEND=chunked): the file is folded into
+# aggregates once per change, and other results are memoized per file stamp
+# inside ChunkedQueries
+
+@tracked_cache(st.cache_resource)
+def load_chunked_queries(source):
+    """Page queries over the CSV or Parquet file `source`, read in chunks rather than loaded"""
+    return ChunkedQueries.open(source)
+
+@tracked_cache(st.cache_data)
+def load_chunked_heatmap_table(source, version, order, max_rows):
+    """Heatmap table of city-year means folded from the file's chunks, ordered and grouped like the others"""
+    table = load_chunked_queries(source).pivot()
+    return aggregate_rows(table, row_order(table, order), max_rows)
+
+@tracked_cache(st.cache_resource)
+def load_chunked_trend_forecast(source, version):
+    """Per-city trends fitted in one batch to the city-year means folded from the file"""
+    return TrendForecast(load_chunked_queries(source).pivot())
+
+def lazy_tabs(labels, key):
+    """Tabs that only report the selected one as open; all open on older Streamlit"""
+    try:
+        return st.tabs(labels, key=key, on_change="rerun")
+    except TypeError:
+        return st.tabs(labels)
+
+
+class Dashboard:
+    """One script run of the dashboard over the data source ``source``"""
+
+    def __init__(self, source):
+        self.source = source
+        # Profiling (LIVABILITY_PROFILE=1 or ?profile=1): section timings and cache hits in the sidebar
+        self.profiler = Profiler(profiling_enabled(st.query_params))
+        self.figure_cache = load_figure_cache()
+
+    def show_chart(self, fig, section):
+        """st.plotly_chart, timed as `<section>.render`"""
+        with self.profiler.section(f"{section}.render"):
+            st.plotly_chart(fig, use_container_width=True)
+
+    def cached_figure(self, section, key, build, rows=None):
+        """The figure of `section` for widget values `key` from the shared figure cache, made by `build()` on a miss; timed as `<section>.figure`"""
+        with self.profiler.section(f"{section}.figure", rows=rows):
+            return self.figure_cache.get_or_build((self.source, self.version, section, *key), build)
+
+    def show_table(self, data, section):
+        """st.dataframe, timed as `<section>.table`"""
+        with self.profiler.section(f"{section}.table", rows=len(data)):
+            st.dataframe(data, use_container_width=True, hide_index=True)
+
+    def paged_table(self, data, section, key=()):
+        """`data` one page at a time, sorted and filtered in the server; tables of one page are shown whole"""
+        if len(data) <= DEFAULT_PAGE_SIZE:
+            self.show_table(data, section)
+            return
+        self.paged_view(load_table_view(self.source, self.version, section, key, data), section)
+
+    def paged_view(self, view, section):
+        """Pages of a TableView, or of another pager with its count() and page(), such as a SqlTableView"""
+        if len(view) <= DEFAULT_PAGE_SIZE:
+            self.show_table(view.page(1, DEFAULT_PAGE_SIZE)[0], section)
+            return
+
+        col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+        with col1:
+            query = st.text_input("Filter", key=f"{section}_filter", placeholder="Text to match, e.g. a city name")
+        with col2:
+            sort_by = st.selectbox("Sort by", [None, *view.columns], key=f"{section}_sort",
+                                   format_func=lambda col: "(table order)" if col is None else col)
+        with col3:
+            descending = st.toggle("Descending", key=f"{section}_descending")
+        with col4:
+            page_size = st.selectbox("Rows per page", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE),
+                                     key=f"{section}_page_size")
+
+        with self.profiler.section(f"{section}.window") as timing:
+            n_rows = view.count(query, sort_by, not descending)
+            timing.rows = n_rows
+        n_pages = page_count(n_rows, page_size)
+        page = 1
+        if n_pages > 1:
+            page = st.number_input(f"Page (of {n_pages:,})", min_value=1, max_value=n_pages, value=1,
+                                   key=f"{section}_page")
+        window, _ = view.page(page, page_size, query, sort_by, not descending)
+        first = (page - 1) * page_size
+        st.caption(f"Rows {min(first + 1, n_rows):,}–{first + len(window):,} of {n_rows:,}"
+                   + (f" matching “{query.strip()}”" if query and query.strip() else ""))
+        self.show_table(window, section)
+
+    def run(self):
+        # Page configuration
+        st.set_page_config(
+            page_title="Urban Livability Index Dashboard",
+            page_icon="🏙️",
+            layout="wide",
+            initial_sidebar_state="expanded"
+        )
+
+        # Custom CSS styling
+        st.markdown(CSS, unsafe_allow_html=True)
+
+        # Initialize data: the first run loads the source, later runs only pick up appended rows
+        try:
+            loaded = self.load()
+        except FileNotFoundError:
+            st.error(f"Data file not found. Please ensure '{self.source}' is available.")
+            st.stop()
+        except ValueError as exc:
+            # e.g. indicator files that fail validation (see livability.ingest)
+            st.error(f"Could not load '{self.source}': {exc}")
+            st.stop()
+
+        if not loaded:
+            st.stop()
+
+        # Sidebar navigation
+        st.sidebar.title("Navigation")
+        selected_page = st.sidebar.selectbox("Select Page", PAGES)
+
+        self.weights, self.year_window = self.whatif_controls()
+
+        render_page = {
+            "🏠 Home": self.home_page,
+            "📊 City Analysis": self.city_analysis_page,
+            "🔄 City Comparison": self.comparison_page,
+            "📈 Visualizations": self.visualizations_page,
+            "🏆 Leaderboard": self.leaderboard_page,
+            "ℹ️ About": self.about_page,
+        }[selected_page]
+        render_page()
+
+        # Footer
+        st.markdown("---")
+        st.markdown(f"**Urban Livability Index Dashboard** | Built with ❤️ using Streamlit | Data period: {self.period()}")
+
+        if self.profiler.enabled:
+            self.profiling_panel(selected_page)
+
+    # Data access: the pages read the dataset only through these methods, which
+    # SqlDashboard overrides to run the same lookups as SQL
+
+    def load(self):
+        """Refresh the dataset and its city×year index; False when it has no rows"""
+        with self.profiler.section("load_data") as section:
+            self.dataset = load_dataset(self.source)
+            section.rows = self.dataset.refresh()
+            self.df, self.version, self.heatmap = self.dataset.read(
+                lambda dataset: (dataset.frame, dataset.version, dataset.aggregates['heatmap'].table))
+
+        if self.df.empty:
+            return False
+
+        with self.profiler.section("city_index") as section:
+            self.city_index = load_city_year_index(self.source, self.version, self.df)
+            section.rows = len(self.city_index)
+        self.cities, self.years = self.city_index.cities, self.city_index.years
+        return True
+
+    def period(self):
+        """First to last year of the loaded data, for titles and text"""
+        return figures.year_span(self.years)
+
+    def city_names(self):
+        """The loaded cities in words: named when there are a few, counted otherwise"""
+        n_cities = len(self.cities)
+        if n_cities > len(STUDY_CITIES):
+            return f"{n_cities:,} cities"
+        names = [str(city) for city in self.cities]
+        listed = names[0] if n_cities == 1 else f"{', '.join(names[:-1])} and {names[-1]}"
+        return f"{n_cities} {'city' if n_cities == 1 else 'cities'} {listed}"
+
+    def is_study_data(self):
+        """Whether the loaded cities are those of the published study"""
+        return sorted(map(str, self.cities)) == sorted(STUDY_CITIES)
+
+    def overview(self):
+        """Row, city and year counts and the mean livability index of the whole dataset"""
+        df = self.df
+        return {'rows': len(df), 'cities': len(df['city'].unique()), 'first_year': df['year'].min(),
+                'last_year': df['year'].max(), 'mean_livability': df['livability_index'].mean()}
+
+    def dataset_view(self):
+        """Pager over the whole dataset, for the Home table"""
+        return load_table_view(self.source, self.version, "home", (), self.df)
+
+    def all_rows(self):
+        """City, year and livability index of every row, for the figures of the whole dataset"""
+        return self.df
+
+    def city_rows(self, city, first_year, last_year):
+        """Rows of one city over an inclusive year range, with the what-if index when weights are set"""
+        # A city's rows are contiguous, so the slice is a view of the frame and of the scores
+        rows = self.city_index.city_slice(city, first_year, last_year)
+        data = self.city_index.take(rows)
+        if self.weights is not None:
+            scores = pd.Series(self.whatif_scores(rows), index=data.index, copy=False)
+            data = data.assign(livability_index=scores)
+        return data
+
+    def city_sub_indices(self, city, first_year, last_year):
+        """Long sub-index rows of one city over an inclusive year range"""
+        return take_sub_indices(self.city_index.sub_indices, self.city_index.city_slice(city, first_year, last_year))
+
+    def comparison_rows(self, cities, year):
+        """Rows of several cities in one year, with the what-if index when weights are set"""
+        rows = self.city_index.cities_positions(cities, year=year)
+        data = self.city_index.take(rows)
+        if self.weights is not None:
+            data = data.assign(livability_index=self.whatif_scores(rows))
+        return data
+
+    def comparison_sub_indices(self, cities, year):
+        """Long sub-index rows of several cities in one year"""
+        return take_sub_indices(self.city_index.sub_indices, self.city_index.cities_positions(cities, year=year))
+
+    def year_sub_indices(self, year):
+        """Long sub-index rows of every city in one year"""
+        return take_sub_indices(self.city_index.sub_indices, self.city_index.year_positions(year))
+
+    def radar_row(self, city, year):
+        """The dataset row of one city-year, or None"""
+        rows = self.city_index.city(city, year, year)
+        return None if rows.empty else rows.iloc[0]
+
+    def heatmap_table(self, order, max_rows):
+        return load_heatmap_table(self.source, self.version, order, max_rows, self.heatmap)
+
+    def box_stats(self):
+        """Quartiles and whiskers of the livability index per city, for the box plot"""
+        return self.dataset.aggregates['box'].stats()
+
+    def trend_forecast(self):
+        return load_trend_forecast(self.source, self.version, self.heatmap)
+
+    def city_forecast(self, city, horizon):
+        """Projected livability of one city over the next ``horizon`` years, refitted to its what-if index if weights are set"""
+        if self.weights is not None:
+            return city_forecast(self.city_rows(city, self.years[0], self.years[-1]), self.years, horizon)
+        return self.trend_forecast().city(city, horizon)
+
+    def leaderboard_rows(self, top_k):
+        """The top ``top_k`` cities by average livability, under the what-if weights and window if set"""
+        if self.weights is None and self.year_window is None:
+            return self.dataset.aggregates['leaderboard'].top(top_k)
+        return self.whatif_leaderboard().head(top_k)
+
+    def whatif_controls(self):
+        """Sidebar what-if weights and leaderboard year window.
+
+        Weights are None while the published equal-weight index applies, and
+        the window is None while it spans every year.
+        """
+        years = self.years.tolist()
+        with st.sidebar.expander("⚖️ What-if weights", expanded=False):
+            enabled = st.toggle("What-if mode", key="whatif")
+            weights = [
+                st.slider(label, 0.0, 1.0, 0.25, 0.05, key=f"weight_{column}", disabled=not enabled)
+                for label, column in zip(figures.SUB_INDEX_LABELS, SUB_INDICES)
+            ]
+            window = (years[0], years[-1])
+            if len(years) > 1:
+                window = st.select_slider("Leaderboard years", options=years, value=window,
+                                          key="whatif_years", disabled=not enabled)
+
+        if not enabled:
+            return None, None
+        key = normalize_weights(weights)
+        if key is None:
+            st.sidebar.warning("All weights are zero; using the published equal weights.")
+        elif key == normalize_weights(EQUAL_WEIGHTS):
+            key = None
+        return key, None if window == (years[0], years[-1]) else window
+
+    def weighted_index(self):
+        return load_weighted_index(self.source, self.version, self.city_index)
+
+    def whatif_scores(self, positions):
+        """What-if livability index of the city×year index rows at ``positions`` (a view for a slice)"""
+        with self.profiler.section("whatif.scores") as section:
+            scores = self.weighted_index().scores(self.weights)[positions]
+            section.rows = len(scores)
+            return scores
+
+    def home_page(self):
+        overview = self.overview()
+        st.markdown("<h1 class='main-header'>🏙️ Urban Livability Index — Interactive Dashboard</h1>", unsafe_allow_html=True)
+
+        st.markdown(f"""
+        <div class='info-box'>
+        This dashboard presents an interactive analysis of urban livability ({self.period()}) for selected Indian cities.
+        It computes a composite Livability Index from sub-indices: <strong>Air Quality (AQI)</strong>,
+        <strong>Population Density (PDI)</strong>, <strong>Health Index (HI)</strong> and <strong>Poverty Index (BPL)</strong>.
+        Use the pages in the sidebar to explore city-level trends, comparisons, visualizations, and the leaderboard.
+        </div>
+        """, unsafe_allow_html=True)
+
+        st.markdown("### Dataset:")
+
+        # Dataset table, paged in the server
+        self.paged_view(self.dataset_view(), "home")
+
+        # Quick overview metrics
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            st.metric("Cities Analyzed", overview['cities'])
+
+        with col2:
+            st.metric("Years Covered", f"{overview['first_year']}-{overview['last_year']}")
+
+        with col3:
+            st.metric("Total Records", overview['rows'])
+
+        with col4:
+            avg_livability = overview['mean_livability']
+            st.metric("Avg Livability Index", f"{avg_livability:.1f}")
+
+    def city_analysis_page(self):
+        profiler = self.profiler
+        st.markdown("<h1 class='main-header'>📊 City-wise Analysis</h1>", unsafe_allow_html=True)
+
+        # City and year selection
+        col1, col2 = st.columns([2, 1])
+
+        with col1:
+            selected_city = st.selectbox("Select City", self.cities, key="city_analysis")
+
+        with col2:
+            years = self.years.tolist()
+            years_range = st.select_slider(
+                "Year Range",
+                options=years,
+                value=(years[0], years[-1]),
+                key="year_range"
+            ) if len(years) > 1 else (years[0], years[0])
+
+        # Filter data
+        with profiler.section("city_analysis.filter") as section:
+            city_data = self.city_rows(selected_city, years_range[0], years_range[1])
+            section.rows = len(city_data)
+
+        if city_data.empty:
+            return
+
+        latest_data = city_data.iloc[-1]
+
+        # Overview section
+        st.markdown(f"### Overview — {selected_city} ({years_range[0]} to {years_range[1]})")
+
+        # Current metrics
+        metrics = [
+            ("Livability Index (latest)", 'livability_index', '#2c5aa0'),
+            ("AQI", 'aqi', '#e74c3c'),
+            ("PDI", 'pdi', '#f39c12'),
+            ("HI", 'hi', '#27ae60'),
+            ("BPL Index", 'bpl_index', '#8e44ad'),
+        ]
+        for col, (label, column, color) in zip(st.columns(5), metrics):
+            with col:
+                st.markdown(f"""
+                <div class='metric-container'>
+                    <h4>{label}</h4>
+                    <h2 style='color: {color};'>{latest_data[column]:.2f}</h2>
+                </div>
+                """, unsafe_allow_html=True)
+
+        st.markdown("### Trends")
+
+        # Charts
+        col1, col2 = st.columns(2)
+
+        with col1:
+            # Livability trend, with the projection past the last year when the range reaches it
+            horizon = st.slider("Forecast years", 0, MAX_HORIZON, DEFAULT_HORIZON, key="forecast_years")
+            if years_range[1] != years[-1]:
+                horizon = 0
+
+            def build_trend():
+                forecast = None
+                if horizon:
+                    with profiler.section("city_analysis.forecast") as section:
+                        forecast = self.city_forecast(selected_city, horizon)
+                        section.rows = len(forecast)
+                return figures.city_trend_figure(city_data, selected_city, forecast)
+
+            fig1 = self.cached_figure("city_analysis.trend", (selected_city, years_range, self.weights, horizon),
+                                      build_trend, rows=len(city_data))
+            self.show_chart(fig1, "city_analysis.trend")
+            if horizon:
+                st.caption("Dashed: the straight-line trend of every year of the city's data, "
+                           "with its 95% prediction band.")
+
+        with col2:
+            # Sub-indices comparison
+            def build_sub_indices():
+                with profiler.section("city_analysis.sub_indices.reshape", rows=len(city_data)):
+                    sub_df = self.city_sub_indices(selected_city, years_range[0], years_range[1])
+                return figures.city_sub_indices_figure(sub_df, selected_city)
+
+            fig2 = self.cached_figure("city_analysis.sub_indices", (selected_city, years_range), build_sub_indices,
+                                      rows=len(city_data))
+            self.show_chart(fig2, "city_analysis.sub_indices")
+
+        # Data table
+        st.markdown("### Data table (filtered)")
+        self.paged_table(city_data[DISPLAY_COLUMNS], "city_analysis", (selected_city, years_range, self.weights))
+
+    def comparison_page(self):
+        profiler = self.profiler
+        st.markdown("<h1 class='main-header'>🔄 City Comparison</h1>", unsafe_allow_html=True)
+
+        # Controls
+        col1, col2 = st.columns([3, 1])
+
+        with col1:
+            selected_cities = st.multiselect(
+                "Select Cities to Compare",
+                self.cities,
+                default=list(self.cities[:2]),
+                key="comparison_cities"
+            )
+
+            if st.button("Clear all"):
+                st.rerun()
+
+        with col2:
+            comparison_year = st.selectbox("Select Year", self.years, index=0)
+
+        if not selected_cities:
+            return
+
+        # Filter data
+        with profiler.section("city_comparison.filter") as section:
+            comparison_data = self.comparison_rows(selected_cities, comparison_year)
+            section.rows = len(comparison_data)
+
+        if comparison_data.empty:
+            return
+
+        st.markdown(f"### Livability Index Comparison — {comparison_year}")
+
+        # Main comparison chart
+        fig1 = self.cached_figure("city_comparison.livability", (tuple(selected_cities), comparison_year, self.weights),
+                                  lambda: figures.comparison_figure(comparison_data, comparison_year),
+                                  rows=len(comparison_data))
+        self.show_chart(fig1, "city_comparison.livability")
+
+        st.markdown("### Sub-indices comparison (AQI, PDI, HI, BPL)")
+
+        # Sub-indices comparison
+        def build_sub_indices():
+            with profiler.section("city_comparison.sub_indices.reshape", rows=len(comparison_data)):
+                sub_comp_df = self.comparison_sub_indices(selected_cities, comparison_year)
+            return figures.sub_indices_bar_figure(sub_comp_df, comparison_year)
+
+        fig2 = self.cached_figure("city_comparison.sub_indices", (tuple(selected_cities), comparison_year),
+                                  build_sub_indices, rows=len(comparison_data))
+        self.show_chart(fig2, "city_comparison.sub_indices")
+
+        # Comparison table
+        st.markdown("### Table")
+        self.paged_table(comparison_data[DISPLAY_COLUMNS], "city_comparison",
+                         (tuple(selected_cities), comparison_year, self.weights))
+
+    def visualizations_page(self):
+        st.markdown("<h1 class='main-header'>📈 Visualization Dashboard (6 Figures)</h1>", unsafe_allow_html=True)
+
+        sections = [
+            ("1. Trends", self.trends_section),
+            ("2. Heatmap", self.heatmap_section),
+            ("3. Radar", self.radar_section),
+            ("4. Grouped Bar", self.grouped_bar_section),
+            ("5. Boxplot", self.box_section),
+            ("6. Sub-indices", self.sub_indices_section),
+        ]
+        layout = st.radio("Layout", ["Tabs", "All figures"], horizontal=True, key="viz_layout")
+
+        if layout == "Tabs":
+            # Only the selected tab's figure is built
+            tabs = lazy_tabs([label for label, _ in sections], key="viz_tab")
+            for tab, (_, render_section) in zip(tabs, sections):
+                if getattr(tab, 'open', None) is not False:
+                    with tab:
+                        render_section()
+        else:
+            for _, render_section in sections:
+                render_section()
+
+    def top_cities_caption(self):
+        n_cities = len(self.cities)
+        if n_cities > figures.MAX_CITY_TRACES:
+            st.caption(f"The {figures.MAX_CITY_TRACES} cities with the best mean index are drawn on their own, "
+                       f"the other {n_cities - figures.MAX_CITY_TRACES:,} as their mean.")
+
+    def trends_section(self):
+        st.markdown(f"## 1. Livability Index Trends ({self.period()})")
+        fig1 = self.cached_figure("visualizations.trends", (), lambda: figures.trends_figure(self.all_rows()))
+        self.top_cities_caption()
+        self.show_chart(fig1, "visualizations.trends")
+
+        shown = (f"all {len(self.cities):,} cities" if len(self.cities) <= figures.MAX_CITY_TRACES
+                 else f"the {figures.MAX_CITY_TRACES} best cities and the mean of the others")
+        st.markdown(f"""
+        **Result:** The line plot presents the temporal variation of the livability index for {shown}.
+        """)
+        if self.is_study_data():
+            st.markdown("""
+            **Discussion:** Chennai shows high and stable scores; Bangalore and Mumbai are mid-range;
+            Delhi and Kolkata show lower scores historically, with Kolkata improving recently.
+            """)
+
+    @st.fragment
+    def heatmap_section(self):
+        st.markdown("## 2. Livability Heatmap")
+        orders = {"City name": 'city', "Mean (best first)": 'mean', "Clustered (similar trends together)": 'cluster'}
+        order = orders[st.selectbox("Order cities by", list(orders), key="heatmap_order")]
+
+        fig2 = self.cached_figure("visualizations.heatmap", (order, MAX_ROWS),
+                                  lambda: figures.heatmap_figure(self.heatmap_table(order, MAX_ROWS)))
+        n_cities = len(self.cities)
+        if n_cities > MAX_ROWS:
+            st.caption(f"{n_cities:,} cities are averaged into {MAX_ROWS} rows of consecutive cities in this order.")
+        self.show_chart(fig2, "visualizations.heatmap")
+
+        st.markdown("""
+        **Result:** The heatmap displays comparative livability values across cities and years.
+
+        **Discussion:** Highlights inter-city disparities and temporal improvements (e.g., Kolkata).
+        """)
+
+    @st.fragment
+    def radar_section(self):
+        st.markdown("## 3. Radar Chart — Sub-indices (AQI, PDI, HI, BPL)")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            radar_city = st.selectbox("Select City", self.cities, key="radar_city")
+        with col2:
+            radar_year = st.selectbox("Select Year", self.years, key="radar_year")
+
+        def build_radar():
+            row = self.radar_row(radar_city, radar_year)
+            return None if row is None else figures.radar_figure(row, radar_city, radar_year)
+
+        fig3 = self.cached_figure("visualizations.radar", (radar_city, radar_year), build_radar)
+        if fig3 is not None:
+            self.show_chart(fig3, "visualizations.radar")
+
+            st.markdown("""
+            **Result:** Radar shows relative strengths/weaknesses across sub-indices.
+
+            **Discussion:** Use this to interpret the drivers of a city's overall score.
+            """)
+
+    def grouped_bar_section(self):
+        st.markdown("## 4. City-wise Livability by Year (Grouped Bar)")
+        fig4 = self.cached_figure("visualizations.grouped_bar", (),
+                                  lambda: figures.grouped_bar_figure(self.all_rows()))
+        self.top_cities_caption()
+        self.show_chart(fig4, "visualizations.grouped_bar")
+
+        st.markdown("""
+        **Result:** Grouped bars show inter-city rank per year.
+
+        **Discussion:** Useful to compare yearly ranking and see changes across time.
+        """)
+
+    def box_section(self):
+        st.markdown("## 5. Distribution of Livability (Boxplot)")
+        fig5 = self.cached_figure("visualizations.box", (), lambda: figures.box_figure(self.box_stats(), self.period()))
+        self.show_chart(fig5, "visualizations.box")
+
+        st.markdown("""
+        **Result:** Boxplot summarizes distribution of scores for each city.
+
+        **Discussion:** Highlights stability/variability across years for each city.
+        """)
+
+    @st.fragment
+    def sub_indices_section(self):
+        st.markdown("## 6. Sub-Indices Comparison (Choose Year)")
+
+        comparison_year = st.selectbox("Select Year", self.years, key="sub_indices_year")
+        fig6 = self.cached_figure("visualizations.sub_indices", (comparison_year,),
+                                  lambda: figures.sub_indices_bar_figure(self.year_sub_indices(comparison_year),
+                                                                         comparison_year))
+        self.show_chart(fig6, "visualizations.sub_indices")
+
+        st.markdown("""
+        **Result:** Bar chart compares the four sub-indices across cities for the selected year.
+
+        **Discussion:** Identifies which sub-index drives differences in overall livability.
+        """)
+
+    def leaderboard_page(self):
+        profiler = self.profiler
+        period = self.period() if self.year_window is None else figures.year_span(self.year_window)
+        st.markdown(f"<h1 class='main-header'>🏆 Leaderboard — Average Livability ({period})</h1>",
+                    unsafe_allow_html=True)
+
+        # Average livability by city, ranked once per data update from running per-city aggregates
+        n_cities = len(self.cities)
+        top_k = n_cities
+        if n_cities > LEADERBOARD_TOP:
+            top_k = st.number_input("Cities shown (top K)", min_value=1, max_value=n_cities,
+                                    value=LEADERBOARD_TOP, key="leaderboard_top")
+
+        with profiler.section("leaderboard.rank") as section:
+            leaderboard = self.leaderboard_rows(top_k)
+            section.rows = len(leaderboard)
+
+        st.markdown("### City ranking (average Livability Index)")
+        if self.weights is not None or self.year_window is not None:
+            self.whatif_caption()
+
+        # Display leaderboard table
+        self.paged_table(leaderboard, "leaderboard", (top_k, self.weights, self.year_window))
+
+        # Leaderboard chart
+        fig = self.cached_figure("leaderboard", (top_k, self.weights, self.year_window),
+                                 lambda: figures.leaderboard_figure(leaderboard, period), rows=len(leaderboard))
+        self.show_chart(fig, "leaderboard")
+
+        st.markdown("""
+        **Result:** Ranked list of cities by average livability across the study period.
+
+        **Discussion:** The leaderboard helps summarize which cities consistently perform well
+        and which require targeted policy interventions.
+        """)
+
+    def whatif_leaderboard(self):
+        """Ranking under the what-if weights and year window, with each city's move against the published ranks"""
+        weighted = self.weighted_index()
+        leaderboard = weighted.ranking(self.weights, *(self.year_window or (None, None)))
+        published = self.dataset.aggregates['leaderboard'].table().set_index('city')['rank']
+        return leaderboard.assign(rank_change=published.reindex(leaderboard['city']).to_numpy() - leaderboard['rank'])
+
+    def whatif_caption(self):
+        weights = self.weights or EQUAL_WEIGHTS
+        shares = ", ".join(f"{label} {weight:.0%}" for label, weight in zip(figures.SUB_INDEX_LABELS, weights))
+        window = f"{self.year_window[0]}–{self.year_window[1]}" if self.year_window else "all years"
+        st.caption(f"What-if: {shares}; {window}. rank_change is the move against the published ranking.")
+
+    def about_page(self):
+        overview = self.overview()
+        st.markdown("<h1 class='main-header'>ℹ️ About this Project</h1>", unsafe_allow_html=True)
+
+        first, last = self.years[0], self.years[-1]
+        years = f"the year {first}" if first == last else f"the years {first} to {last}"
+        st.markdown(f"""
+        **Project Title:** Data analysis of livable conditions in selected Indian cities based on Sustainable Development Goals
+
+        **Team:** Urban Analytics Research Group
+
+        **SDGs addressed:**
+
+        • **SDG 1** — No poverty  
+        • **SDG 3** — Good health and well-being  
+        • **SDG 11** — Sustainable cities & communities
+
+        **Methodology:**
+
+        • Data were compiled for {self.city_names()} for {years}.  
+        • **Indicators:** PM2.5, PM10, NO2, SO2, Population, Area, Below Poverty Line %, Infant Mortality Rate, Life Expectancy.  
+        • **Sub-indices computed:** Air Quality Index, Population Density Index, Health Index, Below Poverty Line Index.  
+        • **Composite livability index** = mean(AQI, PDI, HI, BPL_index) scaled 0–100.
+
+        **Usage:**
+
+        Use the **City Analysis** page to inspect a single city, **Comparison** to compare multiple cities, 
+        **Visualizations** for figures used in the journal paper, and **Leaderboard** for ranking of cities 
+        based on urban livability index.
+
+        ---
+
+        ### Technical Details
+
+        **Data Sources:**
+        - Air quality data: Central Pollution Control Board (CPCB)
+        - Population data: Census of India
+        - Socio-economic indicators: Ministry of Statistics and Programme Implementation
+
+        **Index Calculation:**
+
+        1. **Air Quality Index (AQI)**: Normalized inverse pollution levels (0-1 scale)
+        2. **Population Density Index (PDI)**: Inverse population density metric (0-1 scale)  
+        3. **Health Index (HI)**: Healthcare infrastructure and outcomes (0-1 scale)
+        4. **BPL Index**: Inverse below poverty line percentage (0-1 scale)
+
+        Final Livability Index = (AQI + PDI + HI + BPL_index) ÷ 4 × 100
+
+        **Framework:** Built with Streamlit, Pandas, and Plotly for interactive data visualization.
+        """)
+
+        # Additional metrics
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.metric("Data Points", overview['rows'])
+
+        with col2:
+            st.metric("Years Analyzed", f"{overview['last_year'] - overview['first_year'] + 1}")
+
+        with col3:
+            st.metric("Cities Covered", overview['cities'])
+
+    def profiling_panel(self, page):
+        """Sidebar panel with this run's section timings and cache hits, plus metric downloads"""
+        profiler = self.profiler
+        with st.sidebar.expander("⏱️ Profiling", expanded=False):
+            timings = pd.DataFrame(
+                [(r.name, r.seconds * 1000, r.rows) for r in profiler.records],
+                columns=['section', 'ms', 'rows']
+            )
+            st.caption(f"Profiled sections: {timings['ms'].sum():.1f} ms")
+            st.dataframe(timings, use_container_width=True, hide_index=True)
+
+            caches = pd.DataFrame(
+                [(name, counts['hits'], counts['misses']) for name, counts in profiler.cache_activity().items()],
+                columns=['cache', 'hits', 'misses']
+            )
+            st.dataframe(caches, use_container_width=True, hide_index=True)
+
+            figure_stats = self.figure_cache.stats()
+            st.caption(
+                f"Figure cache: {figure_stats['entries']} figures, {figure_stats['bytes'] / 2**20:.1f} of "
+                f"{figure_stats['max_bytes'] / 2**20:.0f} MB, hit rate {figure_stats['hit_rate']:.0%} "
+                f"({figure_stats['hits']} hits, {figure_stats['disk_hits']} from disk, {figure_stats['misses']} misses), "
+                f"{figure_stats['evictions']} evicted"
+            )
+
+            st.download_button("Prometheus metrics", prometheus_text() + self.figure_cache.prometheus_text(), "livability_metrics.prom", mime="text/plain")
+            st.download_button("This run (JSONL)", profiler.to_jsonl(page=page), "livability_profile.jsonl",
+                               mime="application/jsonl")
+
+        log_path = os.environ.get('LIVABILITY_PROFILE_LOG')
+        if log_path:
+            profiler.append_log(log_path, page=page)
+
+
+class SqlDashboard(Dashboard):
+    """The dashboard over a SQLite or DuckDB database: each page queries its rows rather than loading the dataset"""
+
+    def open_queries(self):
+        return load_queries(self.source)
+
+    def load(self):
+        with self.profiler.section("load_data") as section:
+            self.queries = self.open_queries()
+            # A CSV source is (re)loaded into its database when that is missing or older
+            section.rows = self.queries.refresh()
+            self.version = self.queries.stamp()
+            self.cities, self.years = self.queries.cities(), self.queries.years()
+        return len(self.cities) > 0
+
+    def overview(self):
+        return self.queries.overview()
+
+    def dataset_view(self):
+        return SqlTableView(self.queries)
+
+    def all_rows(self):
+        return self.queries.all_rows(['city', 'year', 'livability_index'])
+
+    def whatif_rows(self, rows):
+        """``rows`` with the what-if index when weights are set"""
+        if self.weights is None:
+            return rows
+        with self.profiler.section("whatif.scores", rows=len(rows)):
+            return rows.assign(livability_index=weighted_scores(rows, self.weights))
+
+    def city_rows(self, city, first_year, last_year):
+        return self.whatif_rows(self.queries.city(city, first_year, last_year))
+
+    def city_sub_indices(self, city, first_year, last_year):
+        return sub_indices_long(self.queries.city(city, first_year, last_year))
+
+    def comparison_rows(self, cities, year):
+        return self.whatif_rows(self.queries.cities_year(cities, year))
+
+    def comparison_sub_indices(self, cities, year):
+        return sub_indices_long(self.queries.cities_year(cities, year))
+
+    def year_sub_indices(self, year):
+        return sub_indices_long(self.queries.year(year))
+
+    def radar_row(self, city, year):
+        rows = self.queries.city(city, year, year)
+        return None if rows.empty else rows.iloc[0]
+
+    def heatmap_table(self, order, max_rows):
+        return load_sql_heatmap_table(self.source, self.version, order, max_rows)
+
+    def box_stats(self):
+        return self.queries.box_stats()
+
+    def trend_forecast(self):
+        return load_sql_trend_forecast(self.source, self.version)
+
+    def leaderboard_rows(self, top_k):
+        if self.weights is None and self.year_window is None:
+            return self.queries.leaderboard(top_k)
+        return self.whatif_leaderboard().head(top_k)
+
+    def whatif_leaderboard(self):
+        first_year, last_year = self.year_window or (None, None)
+        leaderboard = self.queries.leaderboard(None, self.weights, first_year, last_year)
+        published = self.queries.ranks(leaderboard['city'].astype(str).tolist())
+        return leaderboard.assign(rank_change=published - leaderboard['rank'])
+
+
+class ChunkedDashboard(SqlDashboard):
+    """The dashboard over a file too large to load: the SQL pages' queries answered by ChunkedQueries"""
+
+    def open_queries(self):
+        # The first run folds the whole file, later runs only a changed one
+        return load_chunked_queries(self.source)
+
+    def heatmap_table(self, order, max_rows):
+        return load_chunked_heatmap_table(self.source, self.version, order, max_rows)
+
+    def trend_forecast(self):
+        return load_chunked_trend_forecast(self.source, self.version)
+
+
+BACKENDS = {'sql': SqlDashboard, 'chunked': ChunkedDashboard}
+
+
+def main(source=None):
+    """Run the dashboard over ``source``, by default LIVABILITY_DATA or urban_livability_data.csv"""
+    source = source or os.environ.get('LIVABILITY_DATA', DEFAULT_SOURCE)
+    # The embedded sample has no file to query or stream, so it always runs in memory
+    backend = os.environ.get('LIVABILITY_BACKEND', '').lower()
+    dashboard = BACKENDS.get(backend, Dashboard) if source != EMBEDDED else Dashboard
+    dashboard(source).run()
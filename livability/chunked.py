@@ -0,0 +1,574 @@
+"""Out-of-core mode: the dashboard's pages from a CSV read in chunks, never loaded whole.
+
+With LIVABILITY_BACKEND=chunked the dataset is streamed through a generator
+of fixed-size chunks (read_csv's ``chunksize``, or Parquet row batches). Each
+chunk is folded into running aggregates and dropped:
+
+- per city: row count, min and max of livability_index, and the sums of the
+  four sub-indices; these serve the leaderboard, and what-if rankings over
+  all years
+- per city and year: count and sum of livability_index, whose means are the
+  heatmap's city × year table and the rows of the trend and grouped bar
+  figures
+- per city: the box plot's quartiles and whiskers of livability_index
+  (quantiles.CityQuantiles), from each city's values up to the size of a
+  quantile sketch and from the sketch beyond
+
+Memory follows the number of cities and years, not the number of rows; the
+quantiles keep a few hundred values per city at most. A city-year that
+occurs more than once is averaged, as in the in-memory pivot.
+
+Everything else is answered by another pass over the file: a city's rows,
+a comparison, one year, a what-if ranking over a year window, and the Home
+table's filtered and sorted pages. Only the selected rows are kept. A sorted
+page keeps at most SORT_WINDOW_ROWS rows before it: a deeper page first skips
+whole windows, one pass over the sort column per window, so memory stays
+bounded however deep the page. Results are memoized per file stamp.
+A Parquet file, or a fresh Parquet copy of the CSV, is read in row batches,
+and row selections read only the row groups that can match.
+
+ChunkedQueries answers the same page queries as livability.query.SqlQueries,
+so the SQL backend's dashboard pages run on it unchanged.
+"""
+
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+from livability.indices import INDEX_COLUMNS, SUB_INDICES
+from livability.lookup import city_ids
+from livability.memo import LRUCache
+from livability.quantiles import DEFAULT_K, CityQuantiles
+from livability.sources import FileSource, file_stamp, resolve_source
+from livability.storage import (DATASET_COLUMNS, SCHEMA, apply_schema, columnar_path, has_fresh_columnar,
+                                prepare_rows)
+from livability.whatif import normalize_weights, weight_offsets, weighted_scores
+
+DEFAULT_CHUNK_ROWS = 250_000
+# Rows of a sorted page's sort order held at once; deeper pages take one more pass per window
+SORT_WINDOW_ROWS = 100_000
+# Columns the running aggregates are folded from
+FOLD_COLUMNS = ['city', 'year', 'livability_index', *SUB_INDICES]
+
+
+def _empty_rows(columns):
+    return apply_schema(pd.DataFrame({col: pd.Series(dtype=SCHEMA.get(col)) for col in columns}))
+
+
+def _after(chunk, sort_by, ascending, boundary):
+    """Rows of ``chunk`` that sort after ``boundary``, a (value, row number); missing values sort last."""
+    if boundary is None:
+        return chunk
+    value, row = boundary
+    values, later = chunk[sort_by], chunk['_row'].to_numpy() > row
+    if pd.isna(value):
+        return chunk[values.isna().to_numpy() & later]
+    beyond = values > value if ascending else values < value
+    return chunk[(beyond | values.isna()).to_numpy() | ((values == value).to_numpy() & later)]
+
+
+class ChunkAggregates:
+    """Per-city and per city-year aggregates of ``column``, folded one chunk of rows at a time.
+
+    Has reset(frame) and update(rows) like the aggregates of
+    livability.reload.ReloadingDataset. Cities get ids in order of first
+    appearance; outputs are ordered by city name.
+    """
+
+    def __init__(self, column='livability_index'):
+        self.column = column
+        self.reset(None)
+
+    def reset(self, frame):
+        self.rows = 0
+        self._city_ids = {}
+        self._year_columns = {}
+        self.counts = np.zeros((0, 0), dtype=np.int32)
+        self.sums = np.zeros((0, 0))
+        self.min = np.zeros(0)
+        self.max = np.zeros(0)
+        self.sub_sums = np.zeros((0, len(SUB_INDICES)))
+        self._derived = {}
+        if frame is not None:
+            self.update(frame)
+
+    def _reserve(self, n_cities, n_years):
+        """Grow the arrays to hold ``n_cities`` × ``n_years``, doubling the city capacity."""
+        capacity, width = self.counts.shape
+        if n_cities <= capacity and n_years <= width:
+            return
+        if n_cities > capacity:
+            capacity = max(n_cities, 2 * capacity, 1024)
+
+        def grown(array, shape, fill=0):
+            out = np.full(shape, fill, dtype=array.dtype)
+            out[tuple(slice(0, n) for n in array.shape)] = array
+            return out
+
+        self.counts = grown(self.counts, (capacity, n_years))
+        self.sums = grown(self.sums, (capacity, n_years))
+        self.sub_sums = grown(self.sub_sums, (capacity, len(SUB_INDICES)))
+        self.min = grown(self.min, capacity, np.nan)
+        self.max = grown(self.max, capacity, np.nan)
+
+    def city_ids(self, city, add=False):
+        """Ids of the cities of a column of rows (-1 for cities never folded, unless ``add``)."""
+        return city_ids(city, self._city_ids, add)
+
+    def update(self, rows):
+        self.rows += len(rows)
+        self._derived = {}
+        values = rows[self.column].to_numpy(dtype=np.float64)
+        ids = self.city_ids(rows['city'], add=True)
+        years = rows['year'].to_numpy()
+        for year in np.unique(years).tolist():
+            self._year_columns.setdefault(year, len(self._year_columns))
+        self._reserve(len(self._city_ids), len(self._year_columns))
+
+        keep = ~np.isnan(values) & (ids >= 0)
+        ids, values = ids[keep], values[keep]
+        lookup = self._year_columns
+        year_values, year_inverse = np.unique(years[keep], return_inverse=True)
+        columns = np.array([lookup[year] for year in year_values.tolist()], dtype=np.int64)[year_inverse]
+
+        # Per city-year, unbuffered so repeated cells all count
+        cells = ids * self.counts.shape[1] + columns
+        np.add.at(self.counts.reshape(-1), cells, 1)
+        np.add.at(self.sums.reshape(-1), cells, values)
+
+        # Per city
+        np.fmin.at(self.min, ids, values)
+        np.fmax.at(self.max, ids, values)
+        cities, inverse = np.unique(ids, return_inverse=True)
+        sub = rows[SUB_INDICES].to_numpy(dtype=np.float64)[keep]
+        for j in range(len(SUB_INDICES)):
+            self.sub_sums[cities, j] += np.bincount(inverse, weights=sub[:, j], minlength=len(cities))
+
+    def _cached(self, key, compute):
+        # Derived outputs are cleared by every update
+        if key not in self._derived:
+            self._derived[key] = compute()
+        return self._derived[key]
+
+    def _city_order(self):
+        """(city names sorted, their ids)."""
+        def compute():
+            names = np.array(list(self._city_ids), dtype=object)
+            order = np.argsort(names, kind='stable')
+            return names[order], order
+        return self._cached('cities', compute)
+
+    def _year_order(self):
+        """(years sorted, their columns)."""
+        def compute():
+            years = np.array(list(self._year_columns), dtype=np.int64)
+            order = np.argsort(years)
+            return years[order], np.array(list(self._year_columns.values()), dtype=np.int64)[order]
+        return self._cached('years', compute)
+
+    def cities(self):
+        """Names of the cities with rows, sorted."""
+        names, ids = self._city_order()
+        return names[self.counts[ids].sum(axis=1) > 0] if len(ids) else names
+
+    def years(self):
+        return self._year_order()[0]
+
+    def overview(self):
+        """Row count, city count, first and last year, and mean livability index."""
+        years = self.years()
+        counts = int(self.counts.sum())
+        return {'rows': self.rows, 'cities': len(self.cities()),
+                'first_year': int(years[0]) if len(years) else None,
+                'last_year': int(years[-1]) if len(years) else None,
+                'mean_livability': float(self.sums.sum() / counts) if counts else float('nan')}
+
+    def table(self):
+        """City × year table of the mean of ``column`` per city-year; NaN where a city has no row that year."""
+        def compute():
+            names, ids = self._city_order()
+            years, columns = self._year_order()
+            counts = self.counts[np.ix_(ids, columns)]
+            present = counts.sum(axis=1) > 0
+            with np.errstate(invalid='ignore', divide='ignore'):
+                means = (self.sums[np.ix_(ids, columns)] / counts)[present]
+            return pd.DataFrame(means.astype(np.float32), index=pd.Index(names[present], name='city'),
+                                columns=pd.Index(years, name='year'))
+        return self._cached('table', compute)
+
+    def _ranked(self, means, ids, extra=None):
+        """Cities ranked by ``means`` (aligned with the ids sorted by name), best first; ties keep name order."""
+        names, _ = self._city_order()
+        counts = self.counts[ids]
+        present = np.flatnonzero(counts.sum(axis=1))
+        order = present[np.argsort(-means[present], kind='stable')]
+        columns = {'city': names[order], self.column: means[order]}
+        for name, values in (extra or {}).items():
+            columns[name] = values[order]
+        # Distinct years: a city-year given more than once counts once
+        columns['years'] = (counts > 0).sum(axis=1)[order]
+        columns['rank'] = np.arange(1, len(order) + 1)
+        return pd.DataFrame(columns)
+
+    def leaderboard(self):
+        """Cities ranked by mean ``column`` over all rows, with min, max and years, as CityStats.table()."""
+        def compute():
+            _, ids = self._city_order()
+            counts = self.counts[ids].sum(axis=1)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                means = self.sums[ids].sum(axis=1) / counts
+            return self._ranked(means, ids, {'min': self.min[ids], 'max': self.max[ids]})
+        return self._cached('leaderboard', compute)
+
+    def ranking(self, weights):
+        """Cities ranked by their mean index under ``weights`` over all rows, from the sub-index sums."""
+        key = normalize_weights(weights)
+        if key is None:
+            return self.leaderboard().drop(columns=['min', 'max'])
+
+        def compute():
+            _, ids = self._city_order()
+            with np.errstate(invalid='ignore', divide='ignore'):
+                means = ((self.sums[ids].sum(axis=1) + self.sub_sums[ids] @ weight_offsets(key))
+                         / self.counts[ids].sum(axis=1))
+            return self._ranked(means, ids)
+        return self._cached(('ranking', key), compute)
+
+    def rank_table(self, counts, sums, years):
+        """Cities ranked by ``sums / counts``, with their distinct ``years``, all indexed by city id.
+
+        For rankings scanned from the file.
+        """
+        names, ids = self._city_order()
+        counts = counts[ids]
+        present = np.flatnonzero(counts)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums[ids] / counts
+        order = present[np.argsort(-means[present], kind='stable')]
+        return pd.DataFrame({'city': names[order], self.column: means[order], 'years': years[ids][order],
+                             'rank': np.arange(1, len(order) + 1)})
+
+    def nbytes(self):
+        """Bytes held by the aggregates, city names included."""
+        arrays = (self.counts, self.sums, self.min, self.max, self.sub_sums)
+        names = sys.getsizeof(self._city_ids) + sum(sys.getsizeof(name) for name in self._city_ids)
+        return sum(array.nbytes for array in arrays) + names
+
+
+class ChunkedQueries:
+    """The dashboard's page queries over the CSV or Parquet file at ``path``, read in chunks.
+
+    refresh() folds the file into ChunkAggregates and CityQuantiles, again
+    whenever it changes; rows appended to a CSV are folded on their own.
+    """
+
+    def __init__(self, path, chunk_rows=DEFAULT_CHUNK_ROWS, maxsize=128):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.aggregates = ChunkAggregates()
+        self.quantiles = self._new_quantiles()
+        self.scans = 0
+        self.memo = LRUCache(maxsize)
+        self._source = None if path.endswith('.parquet') else FileSource(path)
+        self._stamp = None
+        self._cursor = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    @classmethod
+    def open(cls, spec, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Queries over the CSV or Parquet file a data source spec names."""
+        if spec.endswith('.parquet'):
+            return cls(spec, chunk_rows)
+        source = resolve_source(spec)
+        if not isinstance(source, FileSource):
+            raise ValueError(f"The chunked backend needs a CSV or Parquet source, not {spec!r}")
+        return cls(source.path, chunk_rows)
+
+    def stamp(self):
+        """Change token of the file."""
+        return file_stamp(self.path) if self._source is None else self._source.stamp()
+
+    def _parquet_path(self):
+        """The Parquet file to read: the source itself, or its fresh copy; None to read the CSV."""
+        if self._source is None:
+            return self.path
+        return columnar_path(self.path) if has_fresh_columnar(self.path) else None
+
+    def _file_columns(self, parquet):
+        if parquet is not None:
+            import pyarrow.parquet as pq
+
+            return pq.read_schema(parquet).names
+        return list(pd.read_csv(self.path, nrows=0).columns)
+
+    def chunks(self, columns=None, prepare=True):
+        """Schema-typed chunks of ``columns`` of the file (all dataset columns by default).
+
+        With ``prepare``, index columns the file lacks, and the blank cells of
+        those it has, are computed, reading the raw indicators they need.
+        """
+        columns = DATASET_COLUMNS if columns is None else columns
+        parquet = self._parquet_path()
+        stored = self._file_columns(parquet)
+        wanted = DATASET_COLUMNS if prepare and set(columns) & set(INDEX_COLUMNS) else columns
+        wanted = [col for col in wanted if col in stored]
+
+        if parquet is not None:
+            import pyarrow.parquet as pq
+
+            batches = (batch.to_pandas() for batch in
+                       pq.ParquetFile(parquet).iter_batches(batch_size=self.chunk_rows, columns=wanted))
+        else:
+            batches = pd.read_csv(self.path, dtype={col: SCHEMA[col] for col in wanted if col in SCHEMA},
+                                  usecols=wanted, chunksize=self.chunk_rows)
+        with self._lock:
+            self.scans += 1
+        for chunk in batches:
+            chunk = apply_schema(chunk)
+            yield (prepare_rows(chunk) if prepare else chunk)[columns]
+
+    def refresh(self):
+        """Fold the file into the aggregates if it changed; the number of rows folded (0 if current)."""
+        with self._refresh_lock:
+            stamp = self.stamp()
+            if self._stamp is not None and stamp == self._stamp:
+                return 0
+
+            if self._cursor is not None and self._parquet_path() is None:
+                appended = self._source.read_appended(self._cursor, columns=DATASET_COLUMNS)
+                if appended is not None:
+                    rows, self._cursor = appended
+                    self._stamp = stamp
+                    if not rows.empty:
+                        rows = prepare_rows(rows)
+                        self.aggregates.update(rows)
+                        self.quantiles.update(rows)
+                    return len(rows)
+
+            aggregates, quantiles = ChunkAggregates(), self._new_quantiles()
+            for chunk in self.chunks(FOLD_COLUMNS):
+                aggregates.update(chunk)
+                quantiles.update(chunk)
+            self.aggregates, self.quantiles, self._stamp = aggregates, quantiles, stamp
+            # Appends can only be followed from a pass over the CSV as stamped
+            self._cursor = None
+            if self._source is not None and self._parquet_path() is None and self.stamp() == stamp:
+                self._cursor = self._source.cursor(stamp)
+            return aggregates.rows
+
+    @staticmethod
+    def _new_quantiles():
+        # Past a sketch's size, exact values would only cost memory; this bounds it per city
+        return CityQuantiles('livability_index', exact_max=DEFAULT_K)
+
+    @property
+    def hits(self):
+        return self.memo.hits
+
+    def _memoized(self, key, compute):
+        """``compute()``, memoized per file stamp in an LRU; treat the result as read-only."""
+        return self.memo.memoize((self._stamp, *key), compute)
+
+    def select(self, cities=None, first_year=None, last_year=None, columns=None):
+        """Rows of ``cities`` (all if None) over an inclusive year range, from one pass over the file."""
+        columns = DATASET_COLUMNS if columns is None else columns
+        parquet = self._parquet_path()
+        if parquet is not None and set(DATASET_COLUMNS) <= set(self._file_columns(parquet)):
+            # Row groups whose statistics rule the selection out are skipped
+            filters = []
+            if cities is not None:
+                filters.append(('city', 'in', list(cities)))
+            if first_year is not None:
+                filters.append(('year', '>=', int(first_year)))
+            if last_year is not None:
+                filters.append(('year', '<=', int(last_year)))
+            with self._lock:
+                self.scans += 1
+            rows = pd.read_parquet(parquet, columns=columns, filters=filters or None, engine='pyarrow')
+            return apply_schema(rows).reset_index(drop=True)
+
+        parts = []
+        for chunk in self.chunks(columns):
+            mask = np.ones(len(chunk), dtype=bool)
+            if cities is not None:
+                mask &= chunk['city'].isin(cities).to_numpy()
+            if first_year is not None:
+                mask &= chunk['year'].to_numpy() >= first_year
+            if last_year is not None:
+                mask &= chunk['year'].to_numpy() <= last_year
+            if mask.any():
+                parts.append(chunk[mask])
+        if not parts:
+            return _empty_rows(columns)
+        return apply_schema(pd.concat(parts, ignore_index=True))
+
+    # The page queries of livability.query.SqlQueries
+
+    def cities(self):
+        return self.aggregates.cities()
+
+    def years(self):
+        return self.aggregates.years()
+
+    def overview(self):
+        return self.aggregates.overview()
+
+    def city(self, city, first_year=None, last_year=None, columns=None):
+        """Rows of one city over an inclusive year range, by year."""
+        return self._memoized(('city', city, first_year, last_year, columns), lambda: self.select(
+            [city], first_year, last_year, columns).sort_values('year', kind='stable', ignore_index=True))
+
+    def cities_year(self, cities, year, columns=None):
+        """Rows of several cities in one year, by city."""
+        return self._memoized(('cities_year', tuple(cities), year, columns), lambda: self.select(
+            cities, year, year, columns).sort_values('city', kind='stable', ignore_index=True))
+
+    def year(self, year, columns=None):
+        """Rows of every city in one year, by city."""
+        return self._memoized(('year', year, columns), lambda: self.select(
+            None, year, year, columns).sort_values('city', kind='stable', ignore_index=True))
+
+    def all_rows(self, columns):
+        """City, year and the mean livability index of every city-year, by city and year.
+
+        Built from the aggregates, so only those columns are available.
+        """
+        unknown = set(columns) - {'city', 'year', 'livability_index'}
+        if unknown:
+            raise ValueError(f"the chunked backend keeps no per-row {', '.join(sorted(unknown))}")
+        long = self.pivot().stack().dropna().rename('livability_index').reset_index()
+        return apply_schema(long)[columns]
+
+    def leaderboard(self, top_k=None, weights=None, first_year=None, last_year=None):
+        """Cities ranked by mean (weighted) index over a year window, best first.
+
+        Rankings over all years come from the aggregates; a year window
+        takes a pass over the file.
+        """
+        if first_year is None and last_year is None:
+            ranked = self.aggregates.leaderboard() if weights is None else self.aggregates.ranking(weights)
+        else:
+            ranked = self._memoized(('ranking', normalize_weights(weights), first_year, last_year),
+                                    lambda: self._scan_ranking(weights, first_year, last_year))
+        return ranked if top_k is None else ranked.head(top_k)
+
+    def _scan_ranking(self, weights, first_year, last_year):
+        aggregates = self.aggregates
+        n_ids = len(aggregates.min)
+        counts, sums = np.zeros(n_ids, dtype=np.int64), np.zeros(n_ids)
+        # Distinct (city id, year) pairs scored so far, as id << 16 | year
+        city_years = np.zeros(0, dtype=np.int64)
+        for chunk in self.chunks(FOLD_COLUMNS):
+            year = chunk['year'].to_numpy()
+            low = -np.inf if first_year is None else first_year
+            high = np.inf if last_year is None else last_year
+            chunk = chunk[(year >= low) & (year <= high)]
+            ids = aggregates.city_ids(chunk['city'])
+            scores = weighted_scores(chunk, weights).astype(np.float64)
+            keep = (ids >= 0) & ~np.isnan(scores)
+            counts += np.bincount(ids[keep], minlength=n_ids)
+            sums += np.bincount(ids[keep], weights=scores[keep], minlength=n_ids)
+            pairs = (ids[keep].astype(np.int64) << 16) | (chunk['year'].to_numpy()[keep].astype(np.int64) & 0xFFFF)
+            city_years = np.union1d(city_years, pairs)
+        years = np.bincount(city_years >> 16, minlength=n_ids)
+        return aggregates.rank_table(counts, sums, years)
+
+    def ranks(self, cities):
+        """Published rank of each of ``cities``, aligned with them (NaN if absent)."""
+        ranked = self.aggregates.leaderboard()
+        return ranked.set_index('city')['rank'].reindex(list(cities)).to_numpy()
+
+    def pivot(self, column='livability_index'):
+        """City × year table of the mean of ``column`` per city-year."""
+        if column != self.aggregates.column:
+            raise ValueError(f"the chunked backend aggregates {self.aggregates.column}, not {column}")
+        return self.aggregates.table()
+
+    def box_stats(self):
+        """Box-plot statistics of livability_index per city, from the folded quantiles."""
+        return self.quantiles.stats()
+
+    def _matches(self, chunk, text):
+        city = chunk['city']
+        if not isinstance(city.dtype, pd.CategoricalDtype):
+            city = city.astype('category')
+        hits = city.cat.categories.astype(str).str.contains(text, case=False, regex=False)
+        return np.isin(city.cat.codes.to_numpy(), np.flatnonzero(hits))
+
+    def count(self, text=None):
+        """Rows whose city contains ``text``, case-insensitively; all rows without one."""
+        text = (text or '').strip()
+        if not text:
+            return self.aggregates.rows
+        return self._memoized(('count', text), lambda: sum(
+            int(self._matches(chunk, text).sum()) for chunk in self.chunks(['city'], prepare=False)))
+
+    def page(self, offset, limit, text=None, sort_by=None, ascending=True, columns=None):
+        """Rows ``offset`` to ``offset + limit`` after a city filter and sort; ties keep file order.
+
+        Unsorted pages stop reading at the page. Sorted pages scan the whole
+        file, keeping the best rows after the skipped windows (see
+        _sorted_window), so they hold at most SORT_WINDOW_ROWS + ``limit`` rows.
+        """
+        text = (text or '').strip()
+        columns = DATASET_COLUMNS if columns is None else columns
+        key = ('page', offset, limit, text, sort_by, ascending, tuple(columns))
+        return self._memoized(key, lambda: self._scan_page(offset, limit, text, sort_by, ascending, columns))
+
+    def _scan_page(self, offset, limit, text, sort_by, ascending, columns):
+        if sort_by is not None:
+            return self._scan_sorted_page(offset, limit, text, sort_by, ascending, columns)
+        parts, seen, taken = [], 0, 0
+        for chunk in self.chunks(columns):
+            if text:
+                chunk = chunk[self._matches(chunk, text)]
+            start = max(0, offset - seen)
+            if start < len(chunk):
+                parts.append(chunk.iloc[start:start + limit - taken])
+                taken += len(parts[-1])
+            seen += len(chunk)
+            if taken >= limit:
+                break
+        if not parts:
+            return _empty_rows(columns)
+        return apply_schema(pd.concat(parts, ignore_index=True))
+
+    def _sorted_window(self, columns, text, sort_by, ascending, boundary, size, prepare=True):
+        """The first ``size`` rows after ``boundary`` in sort order, with their row number in ``_row``.
+
+        Ties keep file order: rows are ordered by (``sort_by``, row number).
+        """
+        kept, row = None, 0
+        for chunk in self.chunks(columns, prepare):
+            chunk = chunk.assign(_row=np.arange(row, row + len(chunk)))
+            row += len(chunk)
+            if text:
+                chunk = chunk[self._matches(chunk, text)]
+            if sort_by == 'city':
+                # Categories differ from chunk to chunk; compare the names
+                chunk = chunk.assign(city=chunk['city'].astype(str))
+            chunk = _after(chunk, sort_by, ascending, boundary)
+            kept = chunk if kept is None else pd.concat([kept, chunk], ignore_index=True)
+            kept = kept.sort_values([sort_by, '_row'], ascending=[ascending, True], na_position='last',
+                                    ignore_index=True).head(size)
+        return kept
+
+    def _scan_sorted_page(self, offset, limit, text, sort_by, ascending, columns):
+        # Skip whole windows of the order, keeping just the sort column (and the city to filter on);
+        # an index column may have blank cells to compute
+        keys = list(dict.fromkeys(['city', sort_by] if text else [sort_by]))
+        prepare = sort_by in INDEX_COLUMNS
+        boundary, skip = None, offset
+        while skip >= SORT_WINDOW_ROWS:
+            window = self._sorted_window(keys, text, sort_by, ascending, boundary, SORT_WINDOW_ROWS, prepare)
+            if window is None or len(window) < SORT_WINDOW_ROWS:
+                return _empty_rows(columns)
+            boundary = (window[sort_by].iat[-1], window['_row'].iat[-1])
+            skip -= SORT_WINDOW_ROWS
+        kept = self._sorted_window(columns, text, sort_by, ascending, boundary, skip + limit)
+        if kept is None or len(kept) <= skip:
+            return _empty_rows(columns)
+        return apply_schema(kept.iloc[skip:].drop(columns='_row').reset_index(drop=True))
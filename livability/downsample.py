@@ -0,0 +1,181 @@
+"""Bounded-size line charts: WebGL traces and server-side downsampling.
+
+SVG scatter traces get slow in the browser beyond a few thousand points, and
+every point is serialized into the page. optimize_line_figure() switches a
+figure's line traces to Scattergl once it holds more than ``gl_threshold``
+points, and cuts every trace longer than ``max_points`` down to about that
+many points, roughly two per horizontal pixel of a wide chart:
+
+- ``lttb``: Largest-Triangle-Three-Buckets, which keeps the visual shape of
+  smooth series
+- ``minmax``: the minimum and maximum of each bucket, which keeps every spike
+  of noisy sensor series
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+
+# Plotly Express switches to WebGL above 1000 points as well
+GL_THRESHOLD = 1000
+MAX_POINTS = 2000
+# LTTB picks all buckets at once while they hold at most LTTB_BATCH_WIDTH points (wider ones are
+# cheap to walk one by one), spending at most LTTB_PASSES passes of work before going bucket by bucket
+LTTB_BATCH_WIDTH = 32
+LTTB_PASSES = 3
+
+# Per-point trace attributes that must be subset along with x and y
+_POINT_ATTRIBUTES = ('x', 'y', 'customdata', 'text', 'hovertext')
+
+
+def _numeric(values):
+    values = np.asarray(values)
+    if values.dtype.kind == 'M':
+        return values.astype('datetime64[ns]').view(np.int64).astype(np.float64)
+    if values.dtype.kind in 'biuf':
+        return values.astype(np.float64)
+    # Categorical axis: points are evenly spaced
+    return np.arange(len(values), dtype=np.float64)
+
+
+def _bucket_means(values, starts, stops):
+    """Mean of ``values[start:stop]`` for each bucket, ignoring NaN, from one cumulative sum."""
+    finite = ~np.isnan(values)
+    sums = np.concatenate([[0.0], np.cumsum(np.where(finite, values, 0.0))])
+    counts = np.concatenate([[0], np.cumsum(finite)])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (sums[stops] - sums[starts]) / (counts[stops] - counts[starts])
+
+
+def _lttb_batched(x, y, starts, stops, next_x, next_y, width, picked):
+    """LTTB picks of every bucket at once into ``picked``; returns the first bucket left to pick in order.
+
+    Each round picks every bucket from the current guess of its
+    predecessor's point, then re-picks only the buckets whose predecessor
+    changed. The first k buckets are final after k rounds; when changes keep
+    rippling past LTTB_PASSES passes of work, the rest is left to the caller.
+    """
+    # Every bucket padded to ``width`` with its own first point, which never beats the original
+    offsets = starts[:, None] + np.arange(width)
+    offsets = np.where(offsets < stops[:, None], offsets, starts[:, None])
+
+    def pick(buckets, anchors):
+        ax, ay = x[anchors][:, None], y[anchors][:, None]
+        points = offsets[buckets]
+        # Twice the triangle area is |(C - A) × (P - A)|; NaN areas never win
+        areas = np.abs((next_x[buckets, None] - ax) * (y[points] - ay)
+                       - (next_y[buckets, None] - ay) * (x[points] - ax))
+        return starts[buckets] + np.argmax(np.nan_to_num(areas, nan=-1.0), axis=1)
+
+    # First guess: each bucket's predecessor is the first point of the previous bucket
+    anchors = np.append(0, starts[:-1])
+    picked[:] = pick(np.arange(len(starts)), anchors)
+    budget = LTTB_PASSES * len(starts)
+    while True:
+        actual = np.append(0, picked[:-1])
+        changed = np.flatnonzero(actual != anchors)
+        if not len(changed):
+            return len(starts)
+        budget -= len(changed)
+        if budget < 0:
+            return changed[0]
+        anchors = actual
+        picked[changed] = pick(changed, anchors[changed])
+
+
+def lttb_indices(x, y, n_out):
+    """Positions of the ``n_out`` points of (x, y) kept by Largest-Triangle-Three-Buckets.
+
+    Bucket means come from cumulative sums. Narrow buckets, where a walk
+    would be all per-bucket overhead, are picked together by _lttb_batched();
+    the result is the same as the sequential algorithm's, except that a NaN
+    in the next bucket no longer blanks out its mean.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = _numeric(x)
+    # Areas only depend on differences, and small offsets keep the cumulative sums exact
+    x = x - x[0]
+    y = np.asarray(y, dtype=np.float64)
+    # Bucket edges over the interior points; the first and last points are always kept
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    starts, stops = edges[:-1], edges[1:]
+    # Average of the next bucket (or the last point) is the third triangle corner
+    next_stops = np.append(edges[2:], n)
+    next_x = _bucket_means(x, stops, next_stops)
+    next_y = _bucket_means(y, stops, next_stops)
+
+    picked = np.empty(len(starts), dtype=np.int64)
+    width = int(np.diff(edges).max())
+    first = 0
+    if width <= LTTB_BATCH_WIDTH:
+        first = _lttb_batched(x, y, starts, stops, next_x, next_y, width, picked)
+
+    # Buckets before ``first`` are final
+    previous = picked[first - 1] if first else 0
+    for i in range(first, len(starts)):
+        start, stop = starts[i], stops[i]
+        ax, ay = x[previous], y[previous]
+        areas = np.abs((next_x[i] - ax) * (y[start:stop] - ay) - (next_y[i] - ay) * (x[start:stop] - ax))
+        previous = picked[i] = start + np.argmax(np.nan_to_num(areas, nan=-1.0))
+    return np.concatenate([[0], picked, [n - 1]])
+
+
+def minmax_indices(y, n_out):
+    """Positions of the minimum and maximum of ``n_out // 2`` equal-width buckets, in order."""
+    n = len(y)
+    n_buckets = n_out // 2
+    if n_out >= n or n_buckets < 1:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+    width = int(np.diff(edges).max())
+    # Pad every bucket to the same width so the reduction is one 2-D argmin/argmax
+    offsets = edges[:-1, None] + np.arange(width)
+    valid = offsets < edges[1:, None]
+    values = y[np.minimum(offsets, n - 1)]
+    lows = np.where(valid, values, np.inf)
+    highs = np.where(valid, values, -np.inf)
+    low = edges[:-1] + np.argmin(np.nan_to_num(lows, nan=np.inf), axis=1)
+    high = edges[:-1] + np.argmax(np.nan_to_num(highs, nan=-np.inf), axis=1)
+    return np.unique(np.concatenate([low, high, [0, n - 1]]))
+
+
+def downsample_indices(x, y, n_out, method='lttb'):
+    if method == 'minmax':
+        return minmax_indices(y, n_out)
+    return lttb_indices(x, y, n_out)
+
+
+def _point_count(trace):
+    return 0 if trace.y is None else len(trace.y)
+
+
+def optimize_line_figure(fig, max_points=MAX_POINTS, gl_threshold=GL_THRESHOLD, method='lttb'):
+    """Switch ``fig``'s scatter traces to WebGL and downsample long ones, in place.
+
+    Figures with at most ``gl_threshold`` points in total are returned
+    untouched. Returns ``fig``.
+    """
+    scatter = [i for i, trace in enumerate(fig.data) if trace.type in ('scatter', 'scattergl')]
+    if sum(_point_count(fig.data[i]) for i in scatter) <= gl_threshold:
+        return fig
+
+    traces = list(fig.data)
+    for i in scatter:
+        spec = traces[i].to_plotly_json()
+        spec.pop('type', None)
+        n = _point_count(traces[i])
+        if n > max_points and spec.get('x') is not None:
+            keep = downsample_indices(spec['x'], spec['y'], max_points, method)
+            for name in _POINT_ATTRIBUTES:
+                values = spec.get(name)
+                if values is not None and not isinstance(values, str) and len(values) == n:
+                    spec[name] = np.asarray(values)[keep]
+        traces[i] = go.Scattergl(spec)
+    # Traces keep their xaxis/yaxis references, so subplots survive the swap
+    fig.data = ()
+    fig.add_traces(traces)
+    return fig
@@ -0,0 +1,32 @@
+"""The 5-city × 5-year sample dataset, embedded so the standalone dashboard needs no data file.
+
+Values are rounded to 4 decimals (3 for the livability index), unlike
+urban_livability_data.csv.
+"""
+
+EMBEDDED_CSV = """year,city,pm2.5,pm10,no2,so2,population,area,bpl_population,aqi,pdi,hi,bpl_index,livability_index
+2019,Bangalore,33.31,66.0,31.88,4.12,11883000,800.0,57.58,0.7089,0.0000,0.7469,0.4242,46.999
+2020,Bangalore,30.39,66.07,30.51,5.53,12033000,800.0,57.58,0.7115,0.0000,0.7626,0.4242,47.459
+2021,Bangalore,27.99,88.73,45.14,2.96,12183000,800.0,57.58,0.6596,0.0000,0.7749,0.4242,46.465
+2022,Bangalore,37.65,78.59,27.6,3.55,12333000,800.0,55.67,0.6992,0.0000,0.7266,0.4433,46.728
+2023,Bangalore,32.23,104.11,34.9,5.79,12483000,800.0,55.67,0.6440,0.0000,0.7786,0.4433,46.648
+2019,Chennai,41.09,56.83,24.12,9.34,10711000,1189.2,41.43,0.6925,0.0993,0.6714,0.5857,51.222
+2020,Chennai,39.67,69.77,29.85,8.15,10831000,1189.2,41.43,0.6694,0.0892,0.7101,0.5857,51.360
+2021,Chennai,30.62,84.28,21.57,10.73,10951000,1189.2,41.43,0.6836,0.0791,0.6959,0.5857,51.108
+2022,Chennai,43.75,85.76,23.9,5.61,11071000,590.41,41.43,0.6737,0.0000,0.7479,0.5857,50.182
+2023,Chennai,44.86,67.52,40.94,10.83,11191000,590.41,41.43,0.6078,0.0000,0.8285,0.5857,50.551
+2019,Delhi,101.55,189.89,60.32,22.7,29399000,1483.3,33.43,0.3694,0.0000,0.7078,0.6657,43.068
+2020,Delhi,95.14,188.41,51.75,17.17,29599000,1483.3,33.43,0.3994,0.0000,0.7342,0.6657,44.984
+2021,Delhi,105.95,168.67,52.02,15.33,29799000,1483.3,33.43,0.3335,0.0000,0.7017,0.6657,42.527
+2022,Delhi,101.98,209.93,49.52,18.94,29999000,1483.3,33.43,0.3439,0.0000,0.7754,0.6657,44.555
+2023,Delhi,94.38,167.78,57.29,13.42,30199000,1483.3,33.43,0.4167,0.0000,0.7248,0.6657,44.546
+2019,Kolkata,46.78,96.61,35.84,9.57,14850000,1886.67,56.78,0.6018,0.5812,0.7305,0.4322,58.589
+2020,Kolkata,55.24,95.77,38.35,14.29,14950000,1886.67,56.78,0.5634,0.5797,0.7310,0.4322,57.617
+2021,Kolkata,52.68,116.03,44.75,12.55,15050000,1886.67,56.78,0.5450,0.5782,0.7419,0.4322,57.361
+2022,Kolkata,49.07,127.48,39.83,10.0,15150000,1886.67,56.78,0.5913,0.5766,0.7463,0.4322,58.640
+2023,Kolkata,57.51,108.06,42.71,15.42,15250000,1886.67,56.78,0.5497,0.5751,0.7796,0.4322,58.434
+2019,Mumbai,35.78,75.85,37.4,6.59,20411000,603.4,45.23,0.7026,0.0000,0.7239,0.5477,49.331
+2020,Mumbai,47.31,75.76,45.19,13.83,20591000,603.4,45.23,0.6305,0.0000,0.7413,0.5477,48.782
+2021,Mumbai,38.35,107.39,35.77,10.81,20771000,603.4,45.23,0.6455,0.0000,0.7459,0.5477,48.453
+2022,Mumbai,45.36,99.96,49.24,8.12,20951000,603.4,45.23,0.6349,0.0000,0.7539,0.5477,48.440
+2023,Mumbai,52.1,104.93,34.37,11.84,21131000,603.4,45.23,0.6052,0.0000,0.7847,0.5477,48.424"""
@@ -0,0 +1,258 @@
+"""Batch export of the dashboard's figures, built across a process pool.
+
+Every figure the dashboard can show is written as Plotly JSON or standalone
+HTML, using the same builders as the app (livability.figures):
+
+- paper/: the six Visualizations figures (sub-indices once per year)
+- radar/: one radar per city and year the city has a row for
+- city/: the City Analysis trend and sub-index charts of every city
+- comparison/: with --comparison-size, the City Comparison charts of every
+  combination of that many cities present in a year, per year. Their
+  number grows combinatorially with the city count, so they are opt-in and
+  refused above --max-comparisons
+- leaderboard.*: the leaderboard chart
+
+The source is loaded and scored once, in the calling process. Workers each
+read that prepared dataset once, from a file named by its version, so they
+see the same data even if the source changes mid-run. Jobs are fanned out in
+chunks and the run reports throughput in figures/sec. A manifest.json in
+the output directory lists every file written.
+
+    python -m livability.export --output figures --format html
+    python -m livability.export --source synthetic_livability.csv --workers 8 --comparison-size 2
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from livability import figures
+from livability.heatmap import aggregate_rows, pivot_table, row_order
+from livability.lookup import CityYearIndex
+from livability.quantiles import box_stats
+from livability.reload import CityStats
+from livability.sources import resolve_source
+from livability.storage import DATASET_COLUMNS, dataset_fingerprint, prepare_rows
+from livability.transforms import take_sub_indices
+
+FORMATS = ('json', 'html')
+PAPER_FIGURES = ('trends', 'heatmap', 'grouped_bar', 'box')
+# Comparison groups (over all years) an export may produce; each is two figures
+MAX_COMPARISONS = 10_000
+
+# Per-process state, set up by _init_worker()
+_worker = {}
+
+
+def slug(value):
+    """File-name-safe form of a city name or year."""
+    return re.sub(r'[^0-9A-Za-z._-]+', '_', str(value)).strip('_') or '_'
+
+
+def city_slugs(cities):
+    """{city: file name} for ``cities``, unique even where their slugs collide.
+
+    Names that slug alike, ignoring case (for case-insensitive file systems),
+    get a numeric suffix in the order given: 'New Delhi', 'New/Delhi' and
+    'new delhi' become New_Delhi, New_Delhi_2 and new_delhi_3.
+    """
+    names, taken = {}, set()
+    for city in map(str, cities):
+        base = name = slug(city)
+        suffix = 1
+        while name.casefold() in taken:
+            suffix += 1
+            name = f'{base}_{suffix}'
+        taken.add(name.casefold())
+        names[city] = name
+    return names
+
+
+def load_city_index(source):
+    """City×year index over the dataset of the source spec ``source``."""
+    return CityYearIndex(prepare_rows(resolve_source(source).load(columns=DATASET_COLUMNS)))
+
+
+def data_version(city_index):
+    """Hex fingerprint of the loaded dataset."""
+    return f"{dataset_fingerprint(city_index.frame) & (2**64 - 1):016x}"
+
+
+def year_cities(city_index):
+    """Cities with rows in each year, as {year: sorted list of cities}."""
+    return {year: sorted(map(str, city_index.year(year)['city'].unique())) for year in city_index.years.tolist()}
+
+
+def comparison_count(city_index, comparison_size):
+    """Number of comparison groups figure_jobs() yields, over all years."""
+    if not comparison_size:
+        return 0
+    return sum(math.comb(len(cities), comparison_size) for cities in year_cities(city_index).values())
+
+
+def figure_jobs(city_index, comparison_size=0):
+    """Yield (kind, *args) for every exported figure; radars and comparisons only for existing city-years."""
+    for name in PAPER_FIGURES:
+        yield ('paper', name)
+    for year in city_index.years.tolist():
+        yield ('sub_indices', year)
+    for city in city_index.cities.tolist():
+        years = city_index.city(city)['year'].unique().tolist()
+        if not years:
+            continue
+        yield ('city_trend', city)
+        yield ('city_sub_indices', city)
+        for year in years:
+            yield ('radar', city, year)
+    if comparison_size:
+        for year, cities in year_cities(city_index).items():
+            for group in itertools.combinations(cities, comparison_size):
+                yield ('comparison', group, year)
+                yield ('comparison_sub_indices', group, year)
+    yield ('leaderboard',)
+
+
+def build_figure(city_index, job, names):
+    """Relative output path (without extension) and figure of one job; ``names`` is city_slugs() of its cities."""
+    kind, *args = job
+    df = city_index.frame
+
+    if kind == 'paper':
+        name, = args
+        if name == 'heatmap':
+            table = pivot_table(df)
+            return 'paper/heatmap', figures.heatmap_figure(aggregate_rows(table, row_order(table)))
+        builder = {
+            'trends': figures.trends_figure,
+            'grouped_bar': figures.grouped_bar_figure,
+            'box': lambda frame: figures.box_figure(box_stats(frame), figures.year_span(frame['year'])),
+        }[name]
+        return f'paper/{name}', builder(df)
+
+    if kind == 'sub_indices':
+        year, = args
+        sub_df = take_sub_indices(city_index.sub_indices, city_index.year_positions(year))
+        return f'paper/sub_indices_{year}', figures.sub_indices_bar_figure(sub_df, year)
+
+    if kind == 'radar':
+        city, year = args
+        row = city_index.city(city, year, year).iloc[0]
+        return f'radar/{names[city]}_{year}', figures.radar_figure(row, city, year)
+
+    if kind == 'city_trend':
+        city, = args
+        return f'city/{names[city]}_trend', figures.city_trend_figure(city_index.city(city), city)
+
+    if kind == 'city_sub_indices':
+        city, = args
+        sub_df = take_sub_indices(city_index.sub_indices, city_index.city_positions(city))
+        return f'city/{names[city]}_sub_indices', figures.city_sub_indices_figure(sub_df, city)
+
+    if kind in ('comparison', 'comparison_sub_indices'):
+        group, year = args
+        rows = city_index.cities_positions(group, year=year)
+        name = f"comparison/{year}/{'+'.join(names[city] for city in group)}"
+        if kind == 'comparison':
+            return name, figures.comparison_figure(city_index.take(rows), year)
+        sub_df = take_sub_indices(city_index.sub_indices, rows)
+        return f'{name}_sub_indices', figures.sub_indices_bar_figure(sub_df, year)
+
+    if kind == 'leaderboard':
+        stats = CityStats('livability_index')
+        stats.reset(df)
+        return 'leaderboard', figures.leaderboard_figure(stats.table(), figures.year_span(df['year']))
+
+    raise ValueError(f"unknown figure kind {kind!r}")
+
+
+def write_figure(fig, path, fmt):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if fmt == 'html':
+        fig.write_html(path, include_plotlyjs='cdn', validate=False)
+    else:
+        with open(path, 'w') as out:
+            out.write(fig.to_json(validate=False))
+    return os.path.getsize(path)
+
+
+def _init_worker(data_path, version, output, fmt):
+    """Load the prepared dataset of ``version`` once for this worker process."""
+    city_index = CityYearIndex(pd.read_pickle(data_path))
+    _worker.update(city_index=city_index, names=city_slugs(city_index.cities), version=version, output=output,
+                   fmt=fmt)
+
+
+def _export_job(job):
+    name, fig = build_figure(_worker['city_index'], job, _worker['names'])
+    path = os.path.join(_worker['output'], f"{name}.{_worker['fmt']}")
+    return job, path, write_figure(fig, path, _worker['fmt'])
+
+
+def export_figures(source, output, fmt='json', workers=None, comparison_size=0,
+                   max_comparisons=MAX_COMPARISONS, city_index=None):
+    """Write every figure of ``source`` under ``output``; returns (figures, bytes, seconds).
+
+    ``city_index`` is the already loaded dataset of ``source``, if the caller has it.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {FORMATS}, not {fmt!r}")
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    city_index = city_index if city_index is not None else load_city_index(source)
+    groups = comparison_count(city_index, comparison_size)
+    if groups > max_comparisons:
+        raise ValueError(f"{comparison_size}-city comparisons would be {groups:,} groups (limit {max_comparisons:,}); "
+                         f"lower comparison_size or raise max_comparisons")
+    os.makedirs(output, exist_ok=True)
+    jobs = list(figure_jobs(city_index, comparison_size))
+
+    if workers == 1:
+        _worker.update(city_index=city_index, names=city_slugs(city_index.cities), output=output, fmt=fmt)
+        written = list(map(_export_job, jobs))
+    else:
+        version = data_version(city_index)
+        with tempfile.TemporaryDirectory() as tmp:
+            data_path = os.path.join(tmp, f'{version}.pkl')
+            city_index.frame.to_pickle(data_path)
+            # Several chunks per worker keep the pool balanced without per-figure IPC
+            chunksize = max(1, len(jobs) // (workers * 8))
+            with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                     initargs=(data_path, version, output, fmt)) as pool:
+                written = list(pool.map(_export_job, jobs, chunksize=chunksize))
+
+    manifest = [{'figure': list(job), 'path': os.path.relpath(path, output), 'bytes': size}
+                for job, path, size in written]
+    with open(os.path.join(output, 'manifest.json'), 'w') as out:
+        json.dump(manifest, out, indent=1, default=str)
+    return len(written), sum(size for _, _, size in written), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export every dashboard figure as Plotly JSON or HTML.")
+    parser.add_argument('--source', default=os.environ.get('LIVABILITY_DATA', 'urban_livability_data.csv'),
+                        help="data source spec, as for LIVABILITY_DATA")
+    parser.add_argument('--output', default='figures')
+    parser.add_argument('--format', choices=FORMATS, default='json')
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per core)")
+    parser.add_argument('--comparison-size', type=int, default=0,
+                        help="cities per comparison; 0 (the default) skips comparisons")
+    parser.add_argument('--max-comparisons', type=int, default=MAX_COMPARISONS,
+                        help="refuse to export more comparison groups than this")
+    args = parser.parse_args()
+
+    count, size, elapsed = export_figures(args.source, args.output, args.format, args.workers,
+                                          args.comparison_size, args.max_comparisons)
+    print(f"Wrote {count:,} figures ({size / 2**20:.1f} MB) to {args.output} in {elapsed:.1f} s "
+          f"({count / elapsed:,.1f} figures/sec)")
+
+
+if __name__ == '__main__':
+    main()
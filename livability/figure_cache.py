@@ -0,0 +1,182 @@
+"""Process-wide cache of built Plotly figures, shared by every session.
+
+Figures are keyed on whatever determines them: the data source, dataset
+version, page section and widget values. Entries are held as Figure
+objects, so a hit costs a dict lookup rather than the unpickling that
+st.cache_data does on each hit. Memory is bounded by the figures'
+serialized JSON size (what each render sends to the browser), evicting
+least recently used entries first. With a spill directory, evicted figures
+are written there as JSON, and later misses are read back from disk instead
+of rebuilt. Because keys include the dataset version, other processes over
+the same data can reuse the spilled figures.
+
+Concurrent misses on one key build the figure once; the other callers wait
+for it.
+"""
+
+import hashlib
+import os
+import threading
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from livability.memo import LRUCache
+
+DEFAULT_MAX_BYTES = 64 * 2**20
+
+
+def figure_bytes(fig):
+    """Serialized JSON size of ``fig``."""
+    return len(fig.to_json(validate=False).encode())
+
+
+class FigureCache:
+    """LRU of figures bounded by ``max_bytes`` of serialized size, optionally spilling to ``spill_dir``."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, spill_dir=None, spill_max_bytes=None):
+        self.spill_dir = spill_dir
+        self.spill_max_bytes = spill_max_bytes
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.spills = 0
+        self._entries = LRUCache(max_bytes)  # weighed by serialized size
+        # Spilled file name -> path, weighed by size
+        self._spilled = LRUCache(float('inf') if spill_max_bytes is None else spill_max_bytes)
+        self._building = {}  # key -> Event set once the figure is cached
+        self._lock = threading.Lock()
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def max_bytes(self):
+        return self._entries.maxsize
+
+    @property
+    def bytes(self):
+        return self._entries.weight
+
+    @property
+    def spill_bytes(self):
+        return self._spilled.weight
+
+    def get_or_build(self, key, build):
+        """The cached figure for ``key``, built with ``build()`` on a miss; None results are not cached."""
+        while True:
+            with self._lock:
+                fig = self._entries.get(key)
+                if fig is not None:
+                    self.hits += 1
+                    return fig
+                pending = self._building.get(key)
+                if pending is None:
+                    self._building[key] = threading.Event()
+                    break
+            pending.wait()
+            with self._lock:
+                retry = key not in self._entries
+                if retry:
+                    self.misses += 1
+            if retry:
+                # The other build failed, built None or was too large to keep
+                return build()
+
+        try:
+            fig = self._read_spilled(key)
+            if fig is None:
+                fig = build()
+                with self._lock:
+                    self.misses += 1
+            if fig is not None:
+                self._put(key, fig)
+            return fig
+        finally:
+            with self._lock:
+                self._building.pop(key).set()
+
+    def _put(self, key, fig):
+        size = figure_bytes(fig)
+        if size > self.max_bytes:
+            return
+        evicted = self._entries.put(key, fig, size)
+        with self._lock:
+            self.evictions += len(evicted)
+        if self.spill_dir:
+            for old_key, old_fig in evicted:
+                self._spill(old_key, old_fig)
+
+    def _path(self, key):
+        name = hashlib.sha1(repr(key).encode()).hexdigest() + '.json'
+        return name, os.path.join(self.spill_dir, name)
+
+    def _spill(self, key, fig):
+        name, path = self._path(key)
+        data = fig.to_json(validate=False).encode()
+        tmp = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+        expired = self._spilled.put(name, path, len(data))
+        with self._lock:
+            self.spills += 1
+        for _, old_path in expired:
+            try:
+                os.remove(old_path)
+            except FileNotFoundError:
+                pass
+
+    def _read_spilled(self, key):
+        if not self.spill_dir:
+            return None
+        _, path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        # Spilled JSON was written from a valid figure, so skip re-validation
+        fig = go.Figure(pio.json.from_json_plotly(data), skip_invalid=True)
+        with self._lock:
+            self.disk_hits += 1
+        return fig
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        """Counters and memory use; hit_rate counts disk hits as hits."""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'spills': self.spills,
+                'spill_bytes': self.spill_bytes,
+            }
+
+    def prometheus_text(self):
+        """The counters in the Prometheus text exposition format."""
+        stats = self.stats()
+        lines = []
+        for name, kind, help_text in [
+            ('hits', 'counter', "Figure cache hits in memory"),
+            ('disk_hits', 'counter', "Figure cache hits read back from the spill directory"),
+            ('misses', 'counter', "Figures built on a cache miss"),
+            ('evictions', 'counter', "Figures evicted from memory"),
+            ('bytes', 'gauge', "Serialized bytes of the figures held in memory"),
+            ('entries', 'gauge', "Figures held in memory"),
+        ]:
+            metric = f"livability_figure_cache_{name}" + ('_total' if kind == 'counter' else '')
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}", f"{metric} {stats[name]}"]
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,224 @@
+"""Plotly figures of the livability dashboard, built from already filtered frames."""
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+from livability.downsample import optimize_line_figure
+
+SUB_INDEX_LABELS = ['AQI', 'PDI', 'HI', 'BPL_index']
+# Cities drawn as their own trace in the figures of the whole dataset; the others are drawn as their mean
+MAX_CITY_TRACES = 20
+OTHERS_COLOR = '#7f7f7f'
+
+
+def year_span(years):
+    """Period covered by ``years`` for titles, e.g. "2019–2023", or "2021" for a single year"""
+    first, last = int(np.min(years)), int(np.max(years))
+    return str(first) if first == last else f"{first}–{last}"
+
+
+def _titled(title, period):
+    return f"{title} ({period})" if period else title
+
+
+def top_cities(df, limit=MAX_CITY_TRACES):
+    """Rows of the ``limit`` best cities of a city/year/livability_index frame, and a summary of the rest.
+
+    Returns (rows, order, others): ``order`` lists those cities best mean
+    first, and ``others`` is the by-year mean index of the remaining cities,
+    a Series named after them. With at most ``limit`` cities, returns
+    (df, None, None). A trace per city grows the figure with the city count;
+    this bounds it at ``limit`` + 1 traces.
+    """
+    means = df.groupby('city', observed=True)['livability_index'].mean()
+    if len(means) <= limit:
+        return df, None, None
+    order = list(means.nlargest(limit).index.astype(str))
+    names = df['city'].astype(str)
+    in_top = names.isin(order).to_numpy()
+    rows = df[in_top].assign(city=names[in_top])
+    others = df[~in_top].groupby('year')['livability_index'].mean()
+    others.name = f"Mean of the other {len(means) - limit:,} cities"
+    return rows, order, others
+
+
+def trends_figure(df):
+    """Livability per city and year; past MAX_CITY_TRACES cities, the best ones and the mean of the rest"""
+    rows, order, others = top_cities(df)
+    fig = px.line(
+        rows,
+        x='year',
+        y='livability_index',
+        color='city',
+        category_orders={'city': order} if order else None,
+        title=f"Livability Index Trends ({year_span(df['year'])})",
+        markers=True
+    )
+    if others is not None:
+        fig.add_trace(go.Scatter(x=others.index, y=others.to_numpy(), mode='lines+markers', name=others.name,
+                                 line=dict(color=OTHERS_COLOR, dash='dash')))
+    return optimize_line_figure(fig)
+
+
+def heatmap_figure(heatmap_data):
+    """Heatmap of a city × year table of livability index values, tall enough for a pixel per row"""
+    fig = px.imshow(
+        heatmap_data,
+        title=f"Livability Index Heatmap ({year_span(heatmap_data.columns)})",
+        aspect="auto",
+        color_continuous_scale="RdYlBu_r"
+    )
+    if len(heatmap_data) > 250:
+        fig.update_layout(height=len(heatmap_data) + 200)
+    return fig
+
+
+def radar_figure(row, city, year):
+    """Radar of one city-year's sub-indices, from its dataset row"""
+    values = [row['aqi'], row['pdi'], row['hi'], row['bpl_index']]
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatterpolar(
+        r=values + [values[0]],  # Close the polygon
+        theta=SUB_INDEX_LABELS + [SUB_INDEX_LABELS[0]],
+        fill='toself',
+        name=f"{city} {year}"
+    ))
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 1]
+            )),
+        showlegend=True,
+        title=f"Sub-indices Radar – {city} ({year})"
+    )
+    return fig
+
+
+def grouped_bar_figure(df):
+    """Bars per city and year; past MAX_CITY_TRACES cities, the best ones and the mean of the rest"""
+    rows, order, others = top_cities(df)
+    fig = px.bar(
+        rows,
+        x='year',
+        y='livability_index',
+        color='city',
+        category_orders={'city': order} if order else None,
+        title="City-wise Livability Index by Year",
+        barmode='group'
+    )
+    if others is not None:
+        fig.add_trace(go.Bar(x=others.index, y=others.to_numpy(), name=others.name,
+                             marker_color=OTHERS_COLOR))
+    return fig
+
+
+def box_figure(stats, period=None):
+    """Box per city from precomputed statistics (quantiles.box_stats), so no row is sent to the browser;
+    ``period`` (see year_span) goes in the title"""
+    fig = go.Figure(go.Box(
+        x=stats.index.astype(str).tolist(),
+        q1=stats['q1'],
+        median=stats['median'],
+        q3=stats['q3'],
+        lowerfence=stats['lowerfence'],
+        upperfence=stats['upperfence'],
+        boxpoints=False
+    ))
+    fig.update_layout(
+        title=_titled("Distribution of Livability Index", period),
+        xaxis_title='city',
+        yaxis_title='livability_index'
+    )
+    return fig
+
+
+def sub_indices_bar_figure(sub_df, year):
+    """Grouped bars of the long sub-index frame of several cities in one year"""
+    return px.bar(
+        sub_df,
+        x='city',
+        y='value',
+        color='subindex',
+        title=f"Sub-indices Comparison ({year})",
+        barmode='group'
+    )
+
+
+def city_trend_figure(city_data, city, forecast=None):
+    """Trend of one city's livability index, with the projection and band of a forecast frame if given"""
+    fig = px.line(
+        city_data,
+        x='year',
+        y='livability_index',
+        title=f"{city} — Livability Index Trend",
+        markers=True
+    )
+    fig.update_layout(height=400)
+    fig = optimize_line_figure(fig)
+    if forecast is not None and not forecast.empty:
+        years = forecast['year'].tolist()
+        if forecast['lower'].notna().any():
+            # One closed polygon: along the upper bound and back along the lower
+            fig.add_trace(go.Scatter(
+                x=years + years[::-1],
+                y=forecast['upper'].tolist() + forecast['lower'].tolist()[::-1],
+                fill='toself', fillcolor='rgba(44, 90, 160, 0.15)', line=dict(width=0),
+                hoverinfo='skip', name="Prediction band"
+            ))
+        fig.add_trace(go.Scatter(
+            x=years, y=forecast['forecast'], mode='lines+markers',
+            line=dict(dash='dash', color='#2c5aa0'), name="Forecast"
+        ))
+    return fig
+
+
+def city_sub_indices_figure(sub_df, city):
+    fig = px.line(
+        sub_df,
+        x='year',
+        y='value',
+        color='subindex',
+        title=f"{city} — Sub-indices",
+        markers=True
+    )
+    fig.update_layout(height=400)
+    return optimize_line_figure(fig)
+
+
+def comparison_figure(comparison_data, year):
+    return px.bar(
+        comparison_data,
+        x='city',
+        y='livability_index',
+        title=f"Livability Index ({year}) - Comparison",
+        color='livability_index',
+        color_continuous_scale='viridis'
+    )
+
+
+def leaderboard_figure(leaderboard, period=None):
+    """Bar per ranked city with its rank above it; ``period`` (see year_span) goes in the title"""
+    fig = px.bar(
+        leaderboard,
+        x='city',
+        y='livability_index',
+        title=_titled("Average Livability Index", period),
+        color='livability_index',
+        color_continuous_scale='viridis'
+    )
+
+    # Rank labels above the bars, as one text trace rather than an annotation per city
+    fig.add_trace(go.Scatter(
+        x=leaderboard['city'],
+        y=leaderboard['livability_index'] + 1,
+        text=[f"#{rank}" for rank in leaderboard['rank']],
+        mode='text',
+        textfont=dict(size=14, color="black"),
+        hoverinfo='skip',
+        showlegend=False
+    ))
+    return fig
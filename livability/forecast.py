@@ -0,0 +1,124 @@
+"""Per-city livability trends projected past the last year, fitted for every city in one batch.
+
+TrendForecast fits a polynomial in the year (a straight line by default)
+to each row of a city × year table: the heatmap's pivot, which every backend
+already keeps. A loop would call a least-squares solver once per city.
+Instead, every city's normal equations are stacked into one (cities, p, p)
+array from two einsums and solved with a single batched np.linalg.solve.
+Years a city has no value for get zero weight, so cities with gaps need no
+special case.
+
+Projections come with a prediction band: the fitted mean ± Student's t
+(scipy) times the standard error of a new observation. The error combines
+the residual variance with the coefficients' covariance, so the band widens
+with the distance from the observed years. A city with no more observed
+years than coefficients gets a trend but no band; one with fewer gets
+neither.
+
+The dashboard builds one TrendForecast per dataset version and overlays
+its projection on the City Analysis trend chart.
+"""
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_DEGREE = 1
+DEFAULT_HORIZON = 3
+MAX_HORIZON = 10
+DEFAULT_LEVEL = 0.95
+FORECAST_COLUMNS = ['year', 'forecast', 'lower', 'upper']
+
+
+class TrendForecast:
+    """Polynomial trends of degree ``degree`` fitted to every row of a city × year ``table`` at once."""
+
+    def __init__(self, table, degree=DEFAULT_DEGREE):
+        self.degree = degree
+        self.cities = pd.Index(table.index.astype(str), name='city')
+        self.years = table.columns.to_numpy(dtype=np.int64)
+        self._positions = pd.Series(np.arange(len(self.cities)), index=self.cities)
+        # Centered years keep the normal equations well conditioned
+        self.center = self.years.mean() if len(self.years) else 0.0
+
+        values = table.to_numpy(dtype=np.float64)
+        observed = ~np.isnan(values)
+        weights = observed.astype(np.float64)
+        design = self._design(self.years)
+        gram = np.einsum('cy,yi,yj->cij', weights, design, design)
+        moments = np.einsum('cy,yi->ci', np.where(observed, values, 0.0), design)
+
+        p = degree + 1
+        self.observed = observed.sum(axis=1)
+        fitted = self.observed >= p
+        self.coef = np.full((len(values), p), np.nan)
+        self.cov = np.full((len(values), p, p), np.nan)
+        if fitted.any():
+            self.coef[fitted] = np.linalg.solve(gram[fitted], moments[fitted][..., None])[..., 0]
+            self.cov[fitted] = np.linalg.inv(gram[fitted])
+
+        residuals = np.where(observed, values - self.coef @ design.T, 0.0)
+        self.dof = self.observed - p
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.variance = np.where(self.dof > 0, (residuals ** 2).sum(axis=1) / self.dof, np.nan)
+
+    def __len__(self):
+        return len(self.cities)
+
+    def _design(self, years):
+        """Powers 0..degree of the centered ``years``, one row per year."""
+        return np.vander(np.asarray(years, dtype=np.float64) - self.center, self.degree + 1, increasing=True)
+
+    def future_years(self, horizon=DEFAULT_HORIZON):
+        """The ``horizon`` years after the table's last year."""
+        last = self.years.max() if len(self.years) else 0
+        return np.arange(last + 1, last + 1 + horizon)
+
+    def predict(self, years, level=DEFAULT_LEVEL, rows=None):
+        """(forecast, lower, upper), each rows × years, for the cities at positions ``rows`` (all if None).
+
+        lower and upper bound a new observation with probability ``level``.
+        """
+        # scipy is only needed here, so the dashboard does not import it at startup
+        from scipy.stats import t
+
+        rows = slice(None) if rows is None else rows
+        design = self._design(years)
+        coef, cov, dof = self.coef[rows], self.cov[rows], self.dof[rows]
+        forecast = coef @ design.T
+        spread = np.einsum('yi,cij,yj->cy', design, cov, design)
+        with np.errstate(invalid='ignore'):
+            quantile = np.where(dof > 0, t.ppf((1 + level) / 2, np.maximum(dof, 1)), np.nan)
+            half = quantile[:, None] * np.sqrt(self.variance[rows][:, None] * (1 + spread))
+        return forecast, forecast - half, forecast + half
+
+    def city(self, city, horizon=DEFAULT_HORIZON, level=DEFAULT_LEVEL):
+        """FORECAST_COLUMNS of one city over the next ``horizon`` years; empty for an unknown city."""
+        position = self._positions.get(city)
+        if position is None:
+            return pd.DataFrame(columns=FORECAST_COLUMNS)
+        years = self.future_years(horizon)
+        forecast, lower, upper = self.predict(years, level, rows=[position])
+        return pd.DataFrame({'year': years, 'forecast': forecast[0], 'lower': lower[0], 'upper': upper[0]})
+
+    def frame(self, horizon=DEFAULT_HORIZON, level=DEFAULT_LEVEL):
+        """City and FORECAST_COLUMNS of every city over the next ``horizon`` years, by city and year."""
+        years = self.future_years(horizon)
+        forecast, lower, upper = self.predict(years, level)
+        return pd.DataFrame({
+            'city': np.repeat(self.cities.to_numpy(dtype=object), len(years)),
+            'year': np.tile(years, len(self.cities)),
+            'forecast': forecast.ravel(), 'lower': lower.ravel(), 'upper': upper.ravel(),
+        })
+
+
+def city_forecast(rows, years=None, horizon=DEFAULT_HORIZON, level=DEFAULT_LEVEL, degree=DEFAULT_DEGREE):
+    """FORECAST_COLUMNS of one city from its rows' year and livability_index, e.g. under what-if weights.
+
+    With the dataset's ``years``, the projection starts after the last of
+    them, as TrendForecast's does.
+    """
+    values = rows.groupby('year')['livability_index'].mean()
+    if years is not None:
+        values = values.reindex(years)
+    table = pd.DataFrame([values.to_numpy(dtype=np.float64)], index=['city'], columns=values.index)
+    return TrendForecast(table, degree).city('city', horizon, level)
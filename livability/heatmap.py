@@ -0,0 +1,110 @@
+"""City × year heatmap tables that stay readable and small at thousands of cities.
+
+The heatmap is built in three steps, each cheap to cache on its own:
+
+1. pivot: a city × year table, averaging duplicate city-years (CityYearPivot
+   in livability.reload keeps it up to date as rows are appended)
+2. order: row positions sorted by city name, by mean (best first), or by
+   hierarchical clustering of the year profiles (scipy)
+3. aggregate: once there are more rows than the plot has pixels, runs of
+   consecutive ordered rows are averaged into one row per group
+
+Re-ordering reuses the pivot, and changing the row budget reuses the order.
+"""
+
+import numpy as np
+import pandas as pd
+
+ORDERS = ('city', 'mean', 'cluster')
+# Rows drawn at most: a heatmap with more rows than plot pixels hides some of them
+MAX_ROWS = 400
+# Above this many rows, clustering runs on groups of rows of similar mean,
+# since linkage needs memory quadratic in the row count
+CLUSTER_MAX = 2000
+
+
+def cell_totals(frame, column='livability_index'):
+    """(sums, counts): city × year tables of the sum and count of the present values of ``column``."""
+    grouped = frame.groupby(['city', 'year'], observed=True)[column].agg(['sum', 'count'])
+    sums = grouped['sum'].unstack('year')
+    counts = grouped['count'].unstack('year', fill_value=0)
+    sums.index = counts.index = sums.index.astype(str)
+    return sums, counts
+
+
+def cell_means(sums, counts):
+    """City × year table of ``sums / counts``; cells without a value are missing."""
+    return sums.where(counts > 0) / counts.where(counts > 0)
+
+
+def pivot_table(frame, column='livability_index'):
+    """City × year table of ``column``; duplicate city-years are averaged."""
+    return cell_means(*cell_totals(frame, column))
+
+
+def _filled(values):
+    """``values`` with missing cells replaced by their year's mean, for distances."""
+    column_means = np.nanmean(values, axis=0) if len(values) else np.zeros(values.shape[1])
+    column_means = np.where(np.isnan(column_means), 0.0, column_means)
+    return np.where(np.isnan(values), column_means, values)
+
+
+def _mean_order(values):
+    means = np.nanmean(np.where(np.isnan(values).all(axis=1)[:, None], -np.inf, values), axis=1)
+    return np.argsort(-means, kind='stable')
+
+
+def _cluster_order(values):
+    # scipy is only needed here, so the dashboard does not import it at startup
+    from scipy.cluster.hierarchy import leaves_list, linkage
+
+    if len(values) < 3:
+        return np.arange(len(values))
+    return leaves_list(linkage(_filled(values), method='average', metric='euclidean'))
+
+
+def row_order(table, order='city'):
+    """Row positions of ``table`` in the requested order (one of ORDERS)."""
+    if order not in ORDERS:
+        raise ValueError(f"order must be one of {ORDERS}, not {order!r}")
+    values = table.to_numpy(dtype=np.float64)
+    if order == 'city':
+        return np.argsort(table.index.to_numpy(), kind='stable')
+    if order == 'mean' or len(values) < 2:
+        return _mean_order(values)
+    if len(values) <= CLUSTER_MAX:
+        return _cluster_order(values)
+
+    # Cluster the means of CLUSTER_MAX groups of rows with similar means,
+    # then lay each group's rows out in mean order
+    by_mean = _mean_order(values)
+    groups = np.array_split(by_mean, CLUSTER_MAX)
+    filled = _filled(values)
+    centroids = np.vstack([np.nanmean(filled[group], axis=0) for group in groups])
+    return np.concatenate([groups[i] for i in _cluster_order(centroids)])
+
+
+def aggregate_rows(table, positions, max_rows=MAX_ROWS):
+    """``table`` in the row order ``positions``; above ``max_rows`` rows, runs of rows are averaged into groups.
+
+    Group rows are labelled with their first and last city and the group size.
+    """
+    ordered = table.iloc[positions]
+    if len(ordered) <= max_rows:
+        return ordered
+
+    bounds = np.linspace(0, len(ordered), max_rows + 1).astype(np.int64)
+    starts = bounds[:-1]
+    values = ordered.to_numpy(dtype=np.float64)
+    # Per-group sums and counts of the non-missing cells
+    present = ~np.isnan(values)
+    sums = np.add.reduceat(np.where(present, values, 0.0), starts, axis=0)
+    counts = np.add.reduceat(present.astype(np.int64), starts, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.where(counts > 0, sums / counts, np.nan)
+
+    cities = ordered.index.to_numpy()
+    sizes = np.diff(bounds)
+    labels = [f"{cities[start]} … {cities[start + size - 1]} ({size})" if size > 1 else cities[start]
+              for start, size in zip(starts, sizes)]
+    return pd.DataFrame(means, index=pd.Index(labels, name=ordered.index.name), columns=ordered.columns)
@@ -0,0 +1,252 @@
+"""Concurrent loading of per-city indicator files, joined into the livability dataset.
+
+Pollution (CPCB), census, poverty and health data arrive as separate CSV
+files per city and per source, laid out under one directory:
+
+    <root>/pollution/<city>.csv     year, pm2.5, pm10, no2, so2
+    <root>/census/<city>.csv        year, population, area
+    <root>/poverty/<city>.csv       year, bpl_population
+    <root>/health/<city>.csv        year, hi (the published health index)
+    <root>/indices/<city>.csv       year, aqi, pdi, bpl_index, livability_index
+                                    (optional: the published indices)
+
+A file may carry its own ``city`` column; otherwise its name is the city.
+Files are read on a thread pool, so ingest time follows the storage's I/O
+parallelism (a network share, object storage mount) rather than the number
+of files. The threads only parse. Values are then validated in one
+vectorized pass per source, and every problem is reported together, naming
+its file. The sources are joined on (city, year) into the dataset's input
+columns. City-years missing from any required source are left out, with a
+warning naming them. The published indices are joined where given; the
+loader's caller computes the rest, as for any other source
+(storage.prepare_rows), so a dataset written out with write_indicator_files
+loads back with the same scores.
+
+A directory given as LIVABILITY_DATA is loaded this way
+(sources.IndicatorFilesSource), and the dashboard caches the joined frame
+until a file changes. To write the joined dataset as a CSV instead:
+
+    python -m livability.ingest data/indicators -o urban_livability_data.csv
+"""
+
+import argparse
+import os
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+from livability.storage import SCHEMA, apply_schema, prepare_rows
+
+# Indicator columns each source's files must provide
+INDICATOR_SOURCES = {
+    'pollution': ['pm2.5', 'pm10', 'no2', 'so2'],
+    'census': ['population', 'area'],
+    'poverty': ['bpl_population'],
+    'health': ['hi'],
+}
+# Sources a directory may leave out; their blank cells are allowed and computed (indices.add_indices)
+OPTIONAL_SOURCES = {
+    'indices': ['aqi', 'pdi', 'bpl_index', 'livability_index'],
+}
+SOURCE_COLUMNS = {**INDICATOR_SOURCES, **OPTIONAL_SOURCES}
+KEY_COLUMNS = ['city', 'year']
+# City-years named in the warning about rows left out of the join
+MAX_REPORTED_KEYS = 10
+# Threads mostly wait on storage, so more of them than cores pays off
+DEFAULT_WORKERS = 16
+
+
+def indicator_files(root):
+    """(source, city, path) of every indicator file under ``root``, in a stable order."""
+    files = []
+    for source in SOURCE_COLUMNS:
+        folder = os.path.join(root, source)
+        if not os.path.isdir(folder):
+            continue
+        for entry in sorted(os.scandir(folder), key=lambda entry: entry.name):
+            if entry.is_file() and entry.name.endswith('.csv'):
+                files.append((source, entry.name[:-len('.csv')], entry.path))
+    return files
+
+
+def read_indicator_file(source, city, path):
+    """The key and indicator columns of one file as read; raises ValueError if any is missing.
+
+    Values are validated later, for all files of a source at once (see validate_source).
+    """
+    wanted = {'city', 'year', *SOURCE_COLUMNS[source]}
+    frame = pd.read_csv(path, usecols=lambda col: col in wanted)
+    missing = [col for col in ['year', *SOURCE_COLUMNS[source]] if col not in frame.columns]
+    if missing:
+        raise ValueError(f"{path}: missing column(s) {', '.join(missing)}")
+    return frame
+
+
+def _read_or_error(args, read):
+    """(frame, None) or (None, the error message starting with the file's path)."""
+    path = args[2]
+    try:
+        return read(*args), None
+    except (OSError, ValueError) as exc:
+        message = str(exc)
+        return None, message if message.startswith(path) else f"{path}: {message}"
+
+
+def validate_source(source, files, frames):
+    """Concatenate the frames read from ``files`` of one source and check their values.
+
+    Returns (rows, errors). Each error names a file: missing (except in an
+    optional source), non-numeric or negative values, fractional years, or a
+    city-year given twice.
+    """
+    columns = SOURCE_COLUMNS[source]
+    lengths = np.array([len(frame) for frame in frames])
+    file_of_row = np.repeat(np.arange(len(files)), lengths)
+    rows = pd.concat(frames, ignore_index=True)
+
+    # Files without a city column are named after their city
+    named = np.repeat([city for _, city, _ in files], lengths)
+    has_city = np.repeat(['city' in frame.columns for frame in frames], lengths)
+    city = rows['city'].astype(object).to_numpy() if 'city' in rows.columns else named
+    city = pd.Series(np.where(has_city, city, named), dtype=object)
+
+    errors = []
+
+    def report(mask, message):
+        for i in np.unique(file_of_row[np.asarray(mask)]):
+            errors.append(f"{files[i][2]}: {message}")
+
+    report(city.isna(), "missing values in city")
+    year = pd.to_numeric(rows['year'], errors='coerce')
+    report(year.isna() | (year % 1 != 0), "year must be a whole number in every row")
+    values = rows[columns].apply(pd.to_numeric, errors='coerce')
+    for col in columns:
+        if source not in OPTIONAL_SOURCES:
+            report(rows[col].isna(), f"missing values in {col}")
+        report(rows[col].notna() & values[col].isna(), f"non-numeric values in {col}")
+        report(values[col] < 0, f"negative values in {col}")
+    if errors:
+        return None, errors
+
+    rows = values.assign(city=city.astype(str).to_numpy(), year=year.astype('int64').to_numpy())
+    duplicated = rows.duplicated(KEY_COLUMNS, keep=False).to_numpy()
+    if duplicated.any():
+        # Within one file, or the same city-year in two files
+        repeats = pd.DataFrame({'file': file_of_row, 'city': rows['city'], 'year': rows['year']})[duplicated]
+        for (city_name, year_value), group in repeats.groupby(['city', 'year'], sort=True):
+            paths = sorted({files[i][2] for i in group['file']})
+            errors.append(f"{', '.join(paths)}: {city_name} {year_value} given more than once")
+    return rows, errors
+
+
+def dropped_keys(frames):
+    """City-years of some required source that others lack, as {(city, year): [missing sources]}."""
+    required = {source: rows for source, rows in frames.items() if source in INDICATOR_SOURCES}
+    keys = pd.concat([rows[KEY_COLUMNS].assign(source=source) for source, rows in required.items()],
+                     ignore_index=True)
+    counts = keys.groupby(KEY_COLUMNS, sort=True).size()
+    dropped = counts.index[counts.to_numpy() < len(required)]
+    if dropped.empty:
+        return {}
+    present = set(keys.itertuples(index=False, name=None))
+    return {key: [source for source in required if (*key, source) not in present] for key in dropped}
+
+
+def join_indicators(frames):
+    """Join per-source frames, {source: rows}, on (city, year) into the dataset's columns, in SCHEMA dtypes.
+
+    City-years missing from a required source are left out, with a warning;
+    optional sources only fill the city-years the others have.
+    """
+    dropped = dropped_keys(frames)
+    if dropped:
+        shown = [f"{city} {year} (no {', '.join(sources)})"
+                 for (city, year), sources in list(dropped.items())[:MAX_REPORTED_KEYS]]
+        more = f" and {len(dropped) - len(shown):,} more" if len(dropped) > len(shown) else ""
+        warnings.warn(f"{len(dropped):,} city-year(s) missing from some indicator source were left out: "
+                      f"{', '.join(shown)}{more}", stacklevel=3)
+    joined = reduce(lambda left, right: left.merge(right, on=KEY_COLUMNS, how='inner', validate='1:1'),
+                    [rows for source, rows in frames.items() if source in INDICATOR_SOURCES])
+    for source in OPTIONAL_SOURCES:
+        if source in frames:
+            joined = joined.merge(frames[source], on=KEY_COLUMNS, how='left', validate='1:1')
+    columns = [col for col in SCHEMA if col in joined.columns]
+    return apply_schema(joined[columns].sort_values(KEY_COLUMNS, kind='stable', ignore_index=True))
+
+
+def load_indicator_files(root, workers=DEFAULT_WORKERS, read=read_indicator_file):
+    """Read every indicator file under ``root`` concurrently, validate them and join them.
+
+    Raises FileNotFoundError when no indicator file is found, and ValueError
+    listing every invalid file, or sources that are missing altogether.
+    """
+    files = indicator_files(root)
+    if not files:
+        raise FileNotFoundError(f"no indicator files under {root}")
+    missing = [source for source in INDICATOR_SOURCES if not any(f[0] == source for f in files)]
+    if missing:
+        raise ValueError(f"{root}: no files for source(s) {', '.join(missing)}")
+
+    with ThreadPoolExecutor(max(1, min(workers, len(files)))) as pool:
+        results = list(pool.map(lambda args: _read_or_error(args, read), files))
+    errors = [error for _, error in results if error is not None]
+
+    frames = {}
+    for source in SOURCE_COLUMNS:
+        read_ok = [(f, frame) for f, (frame, _) in zip(files, results) if f[0] == source and frame is not None]
+        if not read_ok:
+            continue
+        rows, source_errors = validate_source(source, *map(list, zip(*read_ok)))
+        errors += source_errors
+        frames[source] = rows
+    if errors:
+        raise ValueError(f"{len(errors)} problem(s) in indicator files:\n" + "\n".join(errors))
+    return join_indicators(frames)
+
+
+def write_indicator_files(frame, root):
+    """Split dataset rows into per-city files of each source under ``root``; returns the number written.
+
+    The published indices are written too when ``frame`` has them all.
+    """
+    count = 0
+    for source, columns in SOURCE_COLUMNS.items():
+        if source in OPTIONAL_SOURCES and not set(columns) <= set(frame.columns):
+            continue
+        folder = os.path.join(root, source)
+        os.makedirs(folder, exist_ok=True)
+        for city, rows in frame.groupby('city', observed=True, sort=False):
+            rows[['year', *columns]].to_csv(os.path.join(folder, f'{city}.csv'), index=False)
+            count += 1
+    return count
+
+
+def directory_stamp(root):
+    """Change token of every indicator file under ``root``: their names, mtimes and sizes."""
+    stamps = []
+    for _, _, path in indicator_files(root):
+        stat = os.stat(path)
+        stamps.append((path, stat.st_mtime_ns, stat.st_size))
+    return hash(tuple(stamps))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Join per-city indicator files into the livability CSV.")
+    parser.add_argument('root', help="directory with pollution/, census/, poverty/ and health/ subdirectories")
+    parser.add_argument('-o', '--output', default='urban_livability_data.csv')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="reader threads")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    frame = prepare_rows(load_indicator_files(args.root, args.workers))
+    frame[list(SCHEMA)].to_csv(args.output, index=False)
+    print(f"Joined {len(frame):,} city-years of {frame['city'].nunique():,} cities into {args.output} "
+          f"in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == '__main__':
+    main()
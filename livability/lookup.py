@@ -0,0 +1,112 @@
+"""City×year lookup index over the livability dataset.
+
+The frame is sorted once by (city, year); a frame that already is, such as
+the city-major CSV, is shared rather than copied. Each city then owns a
+contiguous block of rows, found in O(1) from its code, and a year range
+inside that block is a binary search, so city lookups return slices of the
+frame rather than copies. A secondary ordering by year serves whole-year
+lookups the same way.
+"""
+
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from livability.transforms import sub_indices_long
+
+
+def city_ids(city, lookup, add=False):
+    """Ids of the values of the column ``city`` in ``lookup`` (name -> id), -1 where missing or unknown.
+
+    With ``add``, unseen names get the next free ids, so ids number cities in
+    order of first appearance. Names are looked up once per distinct value,
+    not per row.
+    """
+    if not isinstance(city.dtype, pd.CategoricalDtype):
+        city = city.astype('category')
+    # A plain list: iterating an Arrow-backed string index is several times slower
+    names = city.cat.categories.to_numpy(dtype=object).astype(str).tolist()
+    if add:
+        ids = [lookup.setdefault(name, len(lookup)) for name in names]
+    else:
+        ids = [lookup.get(name, -1) for name in names]
+    # Code -1 (a missing city) picks the trailing -1
+    return np.append(np.asarray(ids, dtype=np.int64), -1)[city.cat.codes.to_numpy()]
+
+
+class CityYearIndex:
+    """The dataset sorted by (city, year) with row offsets for slice lookups."""
+
+    def __init__(self, df):
+        city = pd.Categorical(df['city'])
+        codes = city.codes
+        order = np.lexsort((df['year'].to_numpy(), codes))
+
+        if np.array_equal(order, np.arange(len(order))):
+            self.frame = df.reset_index(drop=True)
+        else:
+            self.frame = df.iloc[order].reset_index(drop=True)
+        self.cities = np.asarray(city.categories)
+        self.city_codes = codes[order]
+        self._years = self.frame['year'].to_numpy()
+        self._city_offsets = np.searchsorted(self.city_codes, np.arange(len(self.cities) + 1))
+        self._city_lookup = {name: code for code, name in enumerate(self.cities)}
+
+        self._year_order = np.argsort(self._years, kind='stable')
+        sorted_years = self._years[self._year_order]
+        self.years = np.unique(sorted_years)
+        self._year_offsets = np.append(np.searchsorted(sorted_years, self.years), len(sorted_years))
+        self._year_lookup = {year: i for i, year in enumerate(self.years.tolist())}
+
+    def __len__(self):
+        return len(self.frame)
+
+    @cached_property
+    def sub_indices(self):
+        """Long-format sub-index table built from ``frame``, for take_sub_indices()."""
+        return sub_indices_long(self.frame)
+
+    def city_slice(self, city, first_year=None, last_year=None):
+        """Row slice of one city, optionally limited to an inclusive year range."""
+        code = self._city_lookup.get(city)
+        if code is None:
+            return slice(0, 0)
+        start, stop = self._city_offsets[code], self._city_offsets[code + 1]
+        if first_year is not None:
+            start += np.searchsorted(self._years[start:stop], first_year, side='left')
+        if last_year is not None:
+            stop = start + np.searchsorted(self._years[start:stop], last_year, side='right')
+        return slice(int(start), int(stop))
+
+    def city_positions(self, city, first_year=None, last_year=None):
+        """Row positions of one city, optionally limited to an inclusive year range."""
+        rows = self.city_slice(city, first_year, last_year)
+        return np.arange(rows.start, rows.stop)
+
+    def year_positions(self, year):
+        """Row positions of every city in one year, in city order."""
+        i = self._year_lookup.get(year)
+        if i is None:
+            return np.arange(0)
+        return self._year_order[self._year_offsets[i]:self._year_offsets[i + 1]]
+
+    def cities_positions(self, cities, year=None):
+        """Row positions of several cities, all years or a single year, in frame order."""
+        if year is None:
+            blocks = [self.city_positions(city) for city in cities]
+        else:
+            blocks = [self.city_positions(city, year, year) for city in cities]
+        return np.sort(np.concatenate(blocks)) if blocks else np.arange(0)
+
+    def take(self, positions):
+        """Rows of ``frame`` at the given positions, or a view of them for a slice."""
+        return self.frame.iloc[positions]
+
+    def city(self, city, first_year=None, last_year=None):
+        """Rows of one city, sorted by year; a view of ``frame``."""
+        return self.take(self.city_slice(city, first_year, last_year))
+
+    def year(self, year):
+        """Rows of every city in one year."""
+        return self.take(self.year_positions(year))
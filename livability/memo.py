@@ -0,0 +1,77 @@
+"""Least-recently-used memo shared by the dashboard's in-process caches.
+
+The what-if engine, the SQL and chunked query layers, the table pagers and
+the figure cache each keep their recent results in an LRUCache. Entries
+weigh one by default, so ``maxsize`` counts them; the figure cache weighs
+each figure by its serialized size, so ``maxsize`` is a byte budget. put()
+returns what it evicted, for a caller that keeps evicted entries elsewhere.
+
+memoize() computes a missing value outside the lock, so a slow computation
+does not hold up lookups of other keys; two threads missing on the same key
+may both compute it, and the last one to finish is kept.
+"""
+
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Entries of total weight at most ``maxsize``, evicting the least recently used first."""
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.weight = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (value, weight)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """The value under ``key``, now the most recently used, or ``default``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, weight=1):
+        """Store ``value`` under ``key``; the (key, value) pairs evicted to stay within ``maxsize``."""
+        evicted = []
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.weight -= old[1]
+            self._entries[key] = (value, weight)
+            self.weight += weight
+            while self.weight > self.maxsize:
+                old_key, (old_value, old_weight) = self._entries.popitem(last=False)
+                self.weight -= old_weight
+                evicted.append((old_key, old_value))
+        return evicted
+
+    def memoize(self, key, compute):
+        """The value under ``key``, computed with ``compute()`` and stored on a miss; treat it as read-only."""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            with self._lock:
+                self.hits += 1
+            return value
+        value = compute()
+        with self._lock:
+            self.misses += 1
+        self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.weight = 0
@@ -0,0 +1,169 @@
+"""Lightweight hot-path instrumentation for the dashboards.
+
+A Profiler records the wall time (and optionally the row count) of named
+sections during one script run. Process-wide totals are kept alongside so
+they can be scraped as Prometheus text or appended to a JSONL log.
+tracked_cache() wraps st.cache_data / st.cache_resource to count hits and
+misses per cached function, both process-wide and for the Profiler of the
+calling thread: Streamlit runs each session's script in its own thread, so a
+run's counts leave out other sessions' lookups.
+
+Profiling is off unless LIVABILITY_PROFILE=1 or the page URL carries
+?profile=1; when off, sections cost one object allocation.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+_TRUE = {'1', 'true', 'yes', 'on'}
+_lock = threading.Lock()
+# section -> [calls, seconds, rows]
+_section_totals = defaultdict(lambda: [0, 0.0, 0])
+# cached function -> [calls, misses]
+_cache_totals = defaultdict(lambda: [0, 0])
+# The Profiler of the script run on this thread
+_current = threading.local()
+
+
+def profiling_enabled(query_params=None):
+    """Whether profiling was requested through the environment or a ?profile= query param."""
+    if os.environ.get('LIVABILITY_PROFILE', '').lower() in _TRUE:
+        return True
+    return query_params is not None and str(query_params.get('profile', '')).lower() in _TRUE
+
+
+class Section:
+    """Timing record of one section; set ``rows`` inside the block to report rows processed."""
+
+    __slots__ = ('name', 'rows', 'seconds')
+
+    def __init__(self, name, rows=None):
+        self.name = name
+        self.rows = rows
+        self.seconds = 0.0
+
+
+class Profiler:
+    """Section timings of one script run, plus cache hit/miss counts during that run."""
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.records = []
+        self._started = time.time()
+        # cached function -> [calls, misses], only touched from this run's thread
+        self._cache_counts = defaultdict(lambda: [0, 0])
+        _current.profiler = self
+
+    @contextmanager
+    def section(self, name, rows=None):
+        record = Section(name, rows)
+        if not self.enabled:
+            yield record
+            return
+
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - start
+            self.records.append(record)
+            with _lock:
+                totals = _section_totals[name]
+                totals[0] += 1
+                totals[1] += record.seconds
+                totals[2] += record.rows or 0
+
+    def cache_activity(self):
+        """Hits and misses per cached function in this run, not counting other sessions'."""
+        return {name: {'hits': calls - misses, 'misses': misses}
+                for name, (calls, misses) in self._cache_counts.items() if calls}
+
+    def to_jsonl(self, **labels):
+        """One JSON line per section recorded in this run, tagged with ``labels``."""
+        lines = []
+        for record in self.records:
+            entry = {'ts': self._started, 'section': record.name, 'seconds': record.seconds,
+                     'rows': record.rows, **labels}
+            lines.append(json.dumps(entry))
+        for name, counts in self.cache_activity().items():
+            lines.append(json.dumps({'ts': self._started, 'cache': name, **counts, **labels}))
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def append_log(self, path, **labels):
+        """Append this run's JSONL records to ``path``."""
+        text = self.to_jsonl(**labels)
+        if text:
+            with _lock, open(path, 'a') as log:
+                log.write(text)
+
+
+def cache_totals():
+    with _lock:
+        return {name: tuple(counts) for name, counts in _cache_totals.items()}
+
+
+def _count(name, field):
+    """Count a call (field 0) or miss (field 1) of cached function ``name``."""
+    with _lock:
+        _cache_totals[name][field] += 1
+    profiler = getattr(_current, 'profiler', None)
+    if profiler is not None:
+        profiler._cache_counts[name][field] += 1
+
+
+def tracked_cache(cache_decorator, **cache_kwargs):
+    """Like ``cache_decorator(fn)`` but counting calls and misses (executions) of ``fn``."""
+    def decorate(fn):
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        def compute(*args, **kwargs):
+            _count(name, 1)
+            return fn(*args, **kwargs)
+
+        cached = cache_decorator(compute, **cache_kwargs)
+
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            _count(name, 0)
+            return cached(*args, **kwargs)
+
+        call.clear = cached.clear
+        return call
+    return decorate
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_text():
+    """Process-wide section and cache counters in the Prometheus text exposition format."""
+    with _lock:
+        sections = {name: list(totals) for name, totals in _section_totals.items()}
+        caches = {name: list(counts) for name, counts in _cache_totals.items()}
+
+    lines = []
+    metrics = [
+        ('livability_section_calls_total', "Profiled executions of each dashboard section", sections, 0),
+        ('livability_section_seconds_total', "Wall time spent in each dashboard section", sections, 1),
+        ('livability_section_rows_total', "Rows processed by each dashboard section", sections, 2),
+    ]
+    for metric, help_text, values, field in metrics:
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+        lines += [f'{metric}{{section="{_escape(name)}"}} {totals[field]}' for name, totals in sorted(values.items())]
+
+    lines += ["# HELP livability_cache_hits_total Cache hits per cached function",
+              "# TYPE livability_cache_hits_total counter"]
+    lines += [f'livability_cache_hits_total{{function="{_escape(name)}"}} {calls - misses}'
+              for name, (calls, misses) in sorted(caches.items())]
+    lines += ["# HELP livability_cache_misses_total Cache misses per cached function",
+              "# TYPE livability_cache_misses_total counter"]
+    lines += [f'livability_cache_misses_total{{function="{_escape(name)}"}} {misses}'
+              for name, (calls, misses) in sorted(caches.items())]
+    return '\n'.join(lines) + '\n'
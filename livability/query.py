@@ -0,0 +1,478 @@
+"""SQL query layer for the dashboard pages, over an embedded SQLite (or DuckDB) database.
+
+With the SQL backend (LIVABILITY_BACKEND=sql) the dashboard never holds the
+whole dataset. Each page's filter, the leaderboard's group-by and the
+heatmap's pivot run as SQL, so only their result sets are materialized:
+
+- a city's years and a comparison's cities come from the (city, year) and
+  (year, city) indexes
+- the leaderboard ranks per-city averages in SQL, with what-if weights and
+  year windows as bound parameters
+- the heatmap reads one value per city and year; duplicate city-years are
+  averaged, as in the in-memory pivot
+- the box plot's per-city quartiles are folded from the table streamed in
+  chunks, so its rows are never held at once
+- the Home table is paged with LIMIT/OFFSET, sorting only row ids
+
+Databases built here also hold the per-city aggregates of the in-memory
+leaderboard (a ``<table>_cities`` table with each city's published rank),
+so the published ranking is an index lookup and a what-if ranking over all
+years reads one row per city. Other databases are aggregated per query.
+
+Results are memoized per database stamp, so a changed file is re-queried.
+Build the database once from the CSV; DuckDB is used for *.duckdb files
+when the duckdb package is installed:
+
+    python -m livability.query urban_livability_data.csv             # -> urban_livability_data.db
+    python -m livability.query data.csv --output data.duckdb
+"""
+
+import argparse
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from livability.indices import SUB_INDICES
+from livability.memo import LRUCache
+from livability.quantiles import CityQuantiles
+from livability.sources import (DEFAULT_TABLE, DatabaseSource, FileSource, file_stamp, quote_identifier,
+                                resolve_source)
+from livability.storage import DATASET_COLUMNS, SCHEMA, apply_schema, prepare_rows
+from livability.whatif import weight_offsets
+
+DUCKDB_EXTENSIONS = ('.duckdb',)
+SQL_TYPES = {'int16': 'INTEGER', 'Int32': 'INTEGER', 'float32': 'REAL', 'category': 'TEXT'}
+INDEXES = {'city_year': ('city', 'year'), 'year_city': ('year', 'city'),
+           # Serves the Home table sorted by index without sorting the table
+           'livability_index': ('livability_index',)}
+CITIES_SUFFIX = '_cities'
+CHUNK_ROWS = 500_000
+
+
+def duckdb_available():
+    """Whether the optional duckdb package is installed."""
+    try:
+        import duckdb  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def is_duckdb(path):
+    return path.endswith(DUCKDB_EXTENSIONS)
+
+
+def database_path(csv_path):
+    """Path of the SQLite database that shadows ``csv_path``."""
+    return os.path.splitext(csv_path)[0] + '.db'
+
+
+def resolve_database(spec):
+    """(database path, table, CSV it is built from or None) for a data source spec."""
+    if spec.split('#')[0].endswith(DUCKDB_EXTENSIONS):
+        path, _, table = spec.partition('#')
+        return path, table or DEFAULT_TABLE, None
+    source = resolve_source(spec)
+    if isinstance(source, DatabaseSource):
+        return source.path, source.table, None
+    if isinstance(source, FileSource):
+        return database_path(source.path), DEFAULT_TABLE, source.path
+    raise ValueError(f"The SQL backend needs a CSV or database source, not {spec!r}")
+
+
+def _connect_for_build(path, duckdb):
+    if duckdb:
+        import duckdb
+
+        return duckdb.connect(path)
+    con = sqlite3.connect(path)
+    # A throwaway build: no rollback journal or fsyncs
+    con.execute('PRAGMA journal_mode=OFF')
+    con.execute('PRAGMA synchronous=OFF')
+    return con
+
+
+def build_database(csv_path, db_path=None, table=DEFAULT_TABLE, chunk_rows=CHUNK_ROWS):
+    """Load ``csv_path`` into ``table`` of a new database, indexed on (city, year); returns (path, rows).
+
+    The CSV is streamed in chunks, so the dataset is never fully in memory.
+    """
+    chunks = pd.read_csv(csv_path, dtype=SCHEMA, chunksize=chunk_rows)
+    return write_database(chunks, db_path or database_path(csv_path), table)
+
+
+def write_database(chunks, db_path, table=DEFAULT_TABLE):
+    """Write frames of dataset rows to ``table`` of a new database at ``db_path``; returns (path, rows).
+
+    The file is built next to ``db_path`` and moved into place when complete.
+    """
+    tmp_path = db_path + '.partial'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    name = quote_identifier(table)
+    columns = ', '.join(f'{quote_identifier(col)} {SQL_TYPES[dtype]}' for col, dtype in SCHEMA.items())
+    placeholders = ', '.join('?' * len(SCHEMA))
+    duckdb = is_duckdb(db_path)
+    con = _connect_for_build(tmp_path, duckdb)
+    rows = 0
+    try:
+        con.execute(f'CREATE TABLE {name} ({columns})')
+        for chunk in chunks:
+            chunk = prepare_rows(chunk)[DATASET_COLUMNS]
+            chunk = chunk.assign(city=chunk['city'].astype(str))
+            if duckdb:
+                # DuckDB scans the frame itself
+                con.register('chunk', chunk)
+                con.execute(f'INSERT INTO {name} SELECT * FROM chunk')
+                con.unregister('chunk')
+            else:
+                # Blank cells (NaN, or pd.NA in a nullable column) are stored as NULL
+                values = chunk.astype(object).where(chunk.notna(), None)
+                con.executemany(f'INSERT INTO {name} VALUES ({placeholders})',
+                                values.itertuples(index=False, name=None))
+            rows += len(chunk)
+        for index, index_columns in INDEXES.items():
+            con.execute(f'CREATE INDEX {quote_identifier(f"{table}_{index}")} ON {name} '
+                        f'({", ".join(map(quote_identifier, index_columns))})')
+        _write_city_stats(con, table)
+        if not duckdb:
+            con.execute('ANALYZE')
+        con.commit()
+    finally:
+        con.close()
+    os.replace(tmp_path, db_path)
+    return db_path, rows
+
+
+def _write_city_stats(con, table):
+    """Per-city distinct years, mean, min and max of the index, sub-index means and published rank."""
+    name, cities = quote_identifier(table), quote_identifier(table + CITIES_SUFFIX)
+    means = ', '.join(f'AVG({quote_identifier(col)}) AS {quote_identifier(col)}' for col in SUB_INDICES)
+    con.execute(
+        f'CREATE TABLE {cities} AS SELECT city, AVG(livability_index) AS livability_index, '
+        f'MIN(livability_index) AS min, MAX(livability_index) AS max, COUNT(DISTINCT year) AS years, '
+        f'ROW_NUMBER() OVER (ORDER BY AVG(livability_index) DESC, city) AS rank, {means} '
+        f'FROM {name} WHERE livability_index IS NOT NULL GROUP BY city'
+    )
+    for column in ('rank', 'city'):
+        con.execute(f'CREATE INDEX {quote_identifier(f"{table}{CITIES_SUFFIX}_{column}")} ON {cities} ({column})')
+
+
+def _scored_condition(weights):
+    """SQL condition for rows that have a score under normalized ``weights``: every column it reads is set."""
+    columns = ['livability_index'] + ([] if weights is None else SUB_INDICES)
+    return ' AND '.join(f'{quote_identifier(col)} IS NOT NULL' for col in columns)
+
+
+def _weighted_expression(weights):
+    """SQL for the livability index under normalized ``weights`` (None: the stored index), and its parameters.
+
+    As whatif.weighted_scores: the stored index plus the sub-indices times weight_offsets().
+    """
+    if weights is None:
+        return quote_identifier('livability_index'), []
+    terms = ' + '.join(f'{quote_identifier(col)} * ?' for col in SUB_INDICES)
+    return f'(livability_index + {terms})', weight_offsets(weights).tolist()
+
+
+class SqlQueries:
+    """The dashboard's page queries against ``table`` of the database at ``path``.
+
+    With ``csv``, the database is (re)built from it by refresh() whenever it
+    is missing or older than the CSV.
+    """
+
+    def __init__(self, path, table=DEFAULT_TABLE, csv=None, maxsize=128):
+        self.path = path
+        self.table = table
+        self.csv = csv
+        self.name = quote_identifier(table)
+        self.cities_name = quote_identifier(table + CITIES_SUFFIX)
+        self.duckdb = is_duckdb(path)
+        self.queries = 0
+        self.memo = LRUCache(maxsize)
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._local = threading.local()
+
+    @classmethod
+    def open(cls, spec):
+        """Queries over the database a data source spec names or shadows."""
+        path, table, csv = resolve_database(spec)
+        return cls(path, table, csv)
+
+    def refresh(self):
+        """Rebuild the database from the CSV if it is stale; the number of rows loaded (0 if current)."""
+        if self.csv is None:
+            return 0
+        with self._build_lock:
+            csv_mtime = file_stamp(self.csv)[0]
+            if os.path.exists(self.path) and file_stamp(self.path)[0] >= csv_mtime:
+                return 0
+            return build_database(self.csv, self.path, self.table)[1]
+
+    def stamp(self):
+        """Change token of the database file(s)."""
+        if self.duckdb:
+            return file_stamp(self.path)
+        return DatabaseSource(self.path, self.table).stamp()
+
+    def _connection(self, stamp):
+        # Connections are not shared across threads; each session thread gets its own,
+        # reopened when the file changes, as a rebuild replaces it
+        con = getattr(self._local, 'con', None)
+        if con is None or self._local.stamp != stamp:
+            if con is not None:
+                con.close()
+            if not os.path.exists(self.path):
+                raise FileNotFoundError(self.path)
+            if self.duckdb:
+                import duckdb
+
+                con = duckdb.connect(self.path, read_only=True)
+            else:
+                con = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True, check_same_thread=False)
+            self._local.con, self._local.stamp = con, stamp
+        return con
+
+    @property
+    def hits(self):
+        return self.memo.hits
+
+    def _memoized(self, key, compute):
+        """``compute()``, memoized under ``key`` in an LRU; treat the result as read-only."""
+        return self.memo.memoize(key, compute)
+
+    def query(self, sql, params=(), memo=True):
+        """Result of ``sql`` as a schema-typed frame, memoized per database stamp; treat it as read-only."""
+        stamp = self.stamp()
+
+        def run():
+            con = self._connection(stamp)
+            if self.duckdb:
+                result = con.execute(sql, list(params)).df()
+            else:
+                result = pd.read_sql_query(sql, con, params=list(params))
+            with self._lock:
+                self.queries += 1
+            return apply_schema(result)
+
+        if not memo:
+            return run()
+        return self._memoized((stamp, sql, tuple(params)), run)
+
+    def _stream(self, sql, stamp, chunk_rows=CHUNK_ROWS):
+        """The result of ``sql`` as frames of up to ``chunk_rows`` rows, fetched as they are consumed."""
+        con = self._connection(stamp)
+        with self._lock:
+            self.queries += 1
+        if self.duckdb:
+            result = con.execute(sql)
+            reader = getattr(result, 'to_arrow_reader', None) or result.fetch_record_batch
+            for batch in reader(chunk_rows):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_sql_query(sql, con, chunksize=chunk_rows)
+
+    def _select(self, columns=None):
+        columns = DATASET_COLUMNS if columns is None else columns
+        return f"SELECT {', '.join(map(quote_identifier, columns))} FROM {self.name}"
+
+    def cities(self):
+        return self.query(f'SELECT DISTINCT city FROM {self.name} ORDER BY city')['city'].astype(str).to_numpy()
+
+    def years(self):
+        return self.query(f'SELECT DISTINCT year FROM {self.name} ORDER BY year')['year'].to_numpy()
+
+    def has_city_stats(self):
+        """Whether the database holds the per-city aggregates written by write_database()."""
+        found = self.query("SELECT COUNT(*) AS n FROM sqlite_master WHERE type = 'table' AND name = ?",
+                           (self.table + CITIES_SUFFIX,))
+        return bool(found['n'].iat[0])
+
+    def overview(self):
+        """Row count, city count, first and last year, and mean livability index."""
+        if self.has_city_stats():
+            counts = (f'SELECT CAST(SUM(years) AS BIGINT) AS rows, COUNT(*) AS cities, '
+                      f'SUM(livability_index * years) / SUM(years) AS mean_livability FROM {self.cities_name}')
+        else:
+            counts = (f'SELECT COUNT(*) AS rows, COUNT(DISTINCT city) AS cities, '
+                      f'AVG(livability_index) AS mean_livability FROM {self.name}')
+        result = pd.concat([
+            self.query(counts),
+            self.query(f'SELECT MIN(year) AS first_year, MAX(year) AS last_year FROM {self.name}'),
+        ], axis=1)
+        return {key: result[key].iat[0].item() for key in result.columns}
+
+    def city(self, city, first_year=None, last_year=None, columns=None):
+        """Rows of one city over an inclusive year range, by year."""
+        first_year = -2**31 if first_year is None else int(first_year)
+        last_year = 2**31 - 1 if last_year is None else int(last_year)
+        return self.query(f'{self._select(columns)} WHERE city = ? AND year BETWEEN ? AND ? ORDER BY year',
+                          (city, first_year, last_year))
+
+    def cities_year(self, cities, year, columns=None):
+        """Rows of several cities in one year, by city."""
+        marks = ', '.join('?' * len(cities))
+        return self.query(f'{self._select(columns)} WHERE year = ? AND city IN ({marks}) ORDER BY city',
+                          (int(year), *cities))
+
+    def year(self, year, columns=None):
+        """Rows of every city in one year, by city."""
+        return self.query(f'{self._select(columns)} WHERE year = ? ORDER BY city', (int(year),))
+
+    def all_rows(self, columns):
+        """``columns`` of every row, by city and year; not memoized, as it is as large as the table."""
+        return self.query(f'{self._select(columns)} ORDER BY city, year', memo=False)
+
+    def leaderboard(self, top_k=None, weights=None, first_year=None, last_year=None):
+        """Cities ranked by mean (weighted) index over a year window, best first.
+
+        As in the in-memory leaderboard, the published ranking over all years
+        also carries each city's min and max; what-if rankings carry only the
+        mean, years and rank. Ties keep city order.
+        """
+        window = first_year is not None or last_year is not None
+        published = weights is None and not window
+        expression, weight_params = _weighted_expression(weights)
+        if self.has_city_stats() and published:
+            where, params = ('', ()) if top_k is None else ('WHERE rank <= ?', (int(top_k),))
+            return self.query(f'SELECT city, livability_index, min, max, years, rank FROM {self.cities_name} '
+                              f'{where} ORDER BY rank', params)
+
+        if self.has_city_stats() and not window:
+            # A city's weighted mean is the weighted sum of its stored sub-index means
+            source, mean, years, group = self.cities_name, expression, 'years', ''
+        else:
+            source, mean, years, group = self.name, f'AVG({expression})', 'COUNT(DISTINCT year)', 'GROUP BY city'
+        columns = [f'{mean} AS livability_index']
+        if published:
+            columns += [f'MIN({expression}) AS min', f'MAX({expression}) AS max']
+        # Each use of the expression binds the weights again
+        params = weight_params * len(columns)
+        columns.append(f'{years} AS years')
+
+        where = f'WHERE {_scored_condition(weights)}'
+        if window:
+            where += ' AND year BETWEEN ? AND ?'
+            params += [-2**31 if first_year is None else int(first_year),
+                       2**31 - 1 if last_year is None else int(last_year)]
+        params += weight_params
+        limit = ''
+        if top_k is not None:
+            limit = 'LIMIT ?'
+            params.append(int(top_k))
+        # Ordering with a LIMIT keeps only the top K while scanning, where a rank window would sort every city
+        ranked = self.query(f'SELECT city, {", ".join(columns)} FROM {source} {where} {group} '
+                            f'ORDER BY {mean} DESC, city {limit}', params)
+        return ranked.assign(rank=np.arange(1, len(ranked) + 1))
+
+    def ranks(self, cities):
+        """Published rank of each of ``cities``, aligned with them (NaN if absent)."""
+        marks = ', '.join('?' * len(cities))
+        if self.has_city_stats():
+            ranked = self.query(f'SELECT city, rank FROM {self.cities_name} WHERE city IN ({marks})', tuple(cities))
+        else:
+            ranked = self.query(
+                f'SELECT city, rank FROM (SELECT city, ROW_NUMBER() OVER (ORDER BY AVG(livability_index) DESC, '
+                f'city) AS rank FROM {self.name} WHERE livability_index IS NOT NULL GROUP BY city) '
+                f'WHERE city IN ({marks})', tuple(cities))
+        return ranked.set_index(ranked['city'].astype(str))['rank'].reindex(list(cities)).to_numpy()
+
+    def pivot(self, column='livability_index'):
+        """City × year table of ``column``, averaging any duplicate city-year."""
+        cells = self.query(
+            f'SELECT city, year, AVG({quote_identifier(column)}) AS {quote_identifier(column)} '
+            f'FROM {self.name} GROUP BY city, year'
+        )
+        table = cells.pivot(index='city', columns='year', values=column)
+        table.index = table.index.astype(str)
+        return table
+
+    def box_stats(self, column='livability_index'):
+        """Box-plot statistics of ``column`` per city (quantiles.CityQuantiles), folded from the table in chunks."""
+        stamp = self.stamp()
+
+        def compute():
+            quantiles = CityQuantiles(column)
+            for chunk in self._stream(f'SELECT city, {quote_identifier(column)} FROM {self.name}', stamp):
+                quantiles.update(chunk)
+            return quantiles.stats()
+
+        return self._memoized((stamp, 'box_stats', column), compute)
+
+    def count(self, text=None):
+        where, params = self._text_filter(text)
+        return int(self.query(f'SELECT COUNT(*) AS n FROM {self.name} {where}', params)['n'].iat[0])
+
+    def _text_filter(self, text):
+        text = (text or '').strip()
+        if not text:
+            return '', ()
+        escaped = text.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return "WHERE lower(city) LIKE ? ESCAPE '\\'", (f'%{escaped}%',)
+
+    def page(self, offset, limit, text=None, sort_by=None, ascending=True, columns=None):
+        """Rows ``offset`` to ``offset + limit`` after a city filter and sort; ties keep table order."""
+        where, params = self._text_filter(text)
+
+        def order(table):
+            if sort_by is None:
+                return f'{table}.rowid'
+            # Missing values last in both directions, as in the in-memory tables
+            return (f"{table}.{quote_identifier(sort_by)} {'ASC' if ascending else 'DESC'} NULLS LAST, "
+                    f"{table}.rowid")
+
+        # Sort and skip row ids only, then read the rows of the page
+        columns = DATASET_COLUMNS if columns is None else columns
+        return self.query(
+            f"SELECT {', '.join(f'rows.{quote_identifier(col)}' for col in columns)} FROM {self.name} AS rows "
+            f"JOIN (SELECT rowid AS position FROM {self.name} AS ids {where} ORDER BY {order('ids')} "
+            f"LIMIT ? OFFSET ?) AS page ON rows.rowid = page.position ORDER BY {order('rows')}",
+            (*params, int(limit), int(offset)))
+
+
+class SqlTableView:
+    """A TableView (livability.tables) whose filtering, sorting and paging run as SQL.
+
+    Also pages a livability.chunked.ChunkedQueries, which has the same count() and page().
+    """
+
+    def __init__(self, queries, columns=None):
+        self.queries = queries
+        self.columns = DATASET_COLUMNS if columns is None else columns
+
+    def __len__(self):
+        return self.queries.count()
+
+    def count(self, query=None, sort_by=None, ascending=True):
+        return self.queries.count(query)
+
+    def page(self, page=1, page_size=25, query=None, sort_by=None, ascending=True):
+        offset = (max(page, 1) - 1) * page_size
+        window = self.queries.page(offset, page_size, query, sort_by, ascending, self.columns)
+        return window, self.count(query)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the SQL backend's database from the livability CSV.")
+    parser.add_argument('csv', nargs='?', default='urban_livability_data.csv')
+    parser.add_argument('--output', help="database path (default: the CSV's name with .db; .duckdb for DuckDB)")
+    parser.add_argument('--table', default=DEFAULT_TABLE)
+    args = parser.parse_args()
+
+    output = args.output or database_path(args.csv)
+    if is_duckdb(output) and not duckdb_available():
+        parser.error("DuckDB databases need the duckdb package: pip install duckdb")
+    start = time.perf_counter()
+    path, rows = build_database(args.csv, output, args.table)
+    print(f"Loaded {rows:,} rows into {path}#{args.table} in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""A loaded dataset that follows its source, merging appended rows in place of a full reload.
+
+refresh() compares the source's change stamp with the one seen at the last
+load. When a CSV source only grew, just the appended rows are parsed, scored
+and concatenated onto the frame, and each registered aggregate is updated
+from those rows alone; any other change reloads the source in full. An
+"append" is trusted when the file grew and its first and last 4 KB before
+the old end are unchanged (see livability.sources.FileSource), so an edit
+elsewhere in the file that lands together with an append goes unnoticed
+until the next full reload.
+
+The dataset version is chained from the previous version and the appended
+rows, so derived caches keyed on it are invalidated without re-hashing the
+whole frame.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from livability.heatmap import cell_means, cell_totals
+from livability.storage import dataset_fingerprint
+
+
+def append_rows(frame, rows):
+    """``frame`` followed by ``rows``, keeping categorical columns categorical."""
+    rows = rows[frame.columns]
+    for col in frame.columns:
+        if isinstance(frame[col].dtype, pd.CategoricalDtype):
+            categories = frame[col].cat.categories
+            new = rows[col].astype('category').cat.categories.difference(categories)
+            if len(new):
+                frame = frame.assign(**{col: frame[col].cat.add_categories(new)})
+                categories = frame[col].cat.categories
+            rows = rows.assign(**{col: rows[col].astype('category').cat.set_categories(categories)})
+    return pd.concat([frame, rows], ignore_index=True)
+
+
+class CityStats:
+    """Running per-city count, sum, min and max of ``column`` and its distinct years, ranked by mean.
+
+    ``count`` counts rows, so the mean weighs every row. ``years`` counts each
+    city-year once, even when it was given more than once.
+    """
+
+    def __init__(self, column):
+        self.column = column
+        self.reset(None)
+
+    def reset(self, frame):
+        self.stats = pd.DataFrame(columns=['count', 'sum', 'min', 'max', 'years'])
+        self._city_years = pd.MultiIndex.from_arrays([[], []], names=['city', 'year'])
+        self._ranked = None
+        if frame is not None:
+            self.update(frame)
+
+    def update(self, rows):
+        grouped = rows.groupby('city', observed=True)[self.column].agg(['count', 'sum', 'min', 'max'])
+        grouped.index = grouped.index.astype(str)
+        scored = rows[rows[self.column].notna()]
+        pairs = pd.MultiIndex.from_arrays([scored['city'], scored['year']], names=['city', 'year']).unique()
+        pairs = pairs.set_levels([pairs.levels[0].astype(str), pairs.levels[1].astype('int64')])
+        new_pairs = pairs.difference(self._city_years, sort=False).remove_unused_levels()
+        self._city_years = self._city_years.append(new_pairs)
+        years = pd.Series(np.bincount(new_pairs.codes[0], minlength=len(new_pairs.levels[0])),
+                          index=new_pairs.levels[0])
+        grouped['years'] = years.reindex(grouped.index, fill_value=0)
+        grouped = grouped.astype({'count': 'int64', 'sum': 'float64', 'min': 'float64', 'max': 'float64',
+                                  'years': 'int64'})
+        if self.stats.empty:
+            stats = grouped
+        else:
+            cities = self.stats.index.union(grouped.index, sort=False)
+            old = self.stats.reindex(cities)
+            new = grouped.reindex(cities)
+            stats = pd.DataFrame({
+                'count': old['count'].add(new['count'], fill_value=0).astype('int64'),
+                'sum': old['sum'].add(new['sum'], fill_value=0),
+                'min': np.fmin(old['min'], new['min']),
+                'max': np.fmax(old['max'], new['max']),
+                'years': old['years'].add(new['years'], fill_value=0).astype('int64'),
+            })
+        self.stats, self._ranked = stats, None
+
+    def table(self):
+        """Cities ranked by their mean, best first; computed once per update.
+
+        Cities with no value of ``column`` have no mean and are left out.
+        """
+        ranked = self._ranked
+        if ranked is None:
+            stats = self.stats[self.stats['count'] > 0]
+            ranked = pd.DataFrame({
+                'city': stats.index,
+                self.column: (stats['sum'] / stats['count']).to_numpy(),
+                'min': stats['min'].to_numpy(),
+                'max': stats['max'].to_numpy(),
+                'years': stats['years'].to_numpy(),
+            })
+            ranked = ranked.sort_values(self.column, ascending=False, kind='stable', ignore_index=True)
+            ranked['rank'] = np.arange(1, len(ranked) + 1)
+            self._ranked = ranked
+        return ranked
+
+    def top(self, k):
+        """The ``k`` best-ranked cities."""
+        return self.table().head(k)
+
+    def rank(self, city):
+        """Rank of ``city`` (1 is best), or None if it has no rows."""
+        ranks = self.table()
+        match = np.flatnonzero(ranks['city'].to_numpy() == city)
+        return int(ranks['rank'].iat[match[0]]) if len(match) else None
+
+
+class CityYearPivot:
+    """City × year table of the mean of ``column``, from running per-cell sums and counts.
+
+    A city-year appended again is averaged with its earlier rows, as a full
+    reload's pivot would.
+    """
+
+    def __init__(self, column):
+        self.column = column
+        self.sums = pd.DataFrame()
+        self.counts = pd.DataFrame()
+        self.table = pd.DataFrame()
+
+    def reset(self, frame):
+        self.sums, self.counts = cell_totals(frame, self.column)
+        self.table = cell_means(self.sums, self.counts)
+
+    def update(self, rows):
+        sums, counts = cell_totals(rows, self.column)
+        self.sums = self.sums.add(sums, fill_value=0)
+        self.counts = self.counts.add(counts, fill_value=0).fillna(0).astype('int64')
+        self.table = cell_means(self.sums, self.counts)
+
+
+class ReloadingDataset:
+    """The frame of ``source``, kept in step with it by refresh().
+
+    ``prepare`` is applied to every loaded batch of rows (e.g. storage.prepare_rows).
+    ``aggregates`` maps names to objects with reset(frame) and update(rows).
+    """
+
+    def __init__(self, source, columns=None, prepare=None, aggregates=None):
+        self.source = source
+        self.columns = columns
+        self.prepare = prepare or (lambda df: df)
+        self.aggregates = aggregates or {}
+        self.frame = None
+        self.version = None
+        self.reloads = 0
+        self.appends = 0
+        self._stamp = None
+        self._cursor = None
+        self._lock = threading.Lock()
+
+    def read(self, fn):
+        """``fn(self)``, evaluated while no refresh runs, so the frame, version and aggregates it reads agree."""
+        with self._lock:
+            return fn(self)
+
+    def refresh(self):
+        """Pick up changes to the source; returns the number of rows loaded (0 if unchanged)."""
+        with self._lock:
+            stamp = self.source.stamp()
+            if self.frame is not None and stamp == self._stamp:
+                return 0
+
+            appended = None
+            if self.frame is not None and hasattr(self.source, 'read_appended'):
+                appended = self.source.read_appended(self._cursor, columns=self.columns)
+            if appended is None:
+                return self._reload(stamp)
+
+            rows, self._cursor = appended
+            self._stamp = stamp
+            if rows.empty:
+                return 0
+            rows = self.prepare(rows)
+            self.frame = append_rows(self.frame, rows)
+            for aggregate in self.aggregates.values():
+                aggregate.update(rows)
+            self.version = hash((self.version, dataset_fingerprint(rows)))
+            self.appends += 1
+            return len(rows)
+
+    def _reload(self, stamp):
+        frame = self.prepare(self.source.load(columns=self.columns))
+        for aggregate in self.aggregates.values():
+            aggregate.reset(frame)
+        self.frame = frame
+        self.version = dataset_fingerprint(frame)
+        self._stamp = stamp
+        # Appends can only be followed from a load that saw the file as stamped
+        self._cursor = None
+        if hasattr(self.source, 'cursor') and self.source.stamp() == stamp:
+            self._cursor = self.source.cursor(stamp)
+        self.reloads += 1
+        return len(frame)
@@ -0,0 +1,242 @@
+"""Live ingestion of the Arduino sensor stream (see sample.py).
+
+A source is tailed incrementally: each poll reads only the bytes appended
+since the previous one, parses the complete lines in one vectorized pass and
+pushes them into a fixed-capacity ring buffer. Memory stays bounded by the
+buffer size however long the stream runs.
+
+Sources can be a growing CSV file, a named pipe, or a character device such
+as a serial port (or a pty standing in for one).
+"""
+
+import io
+import os
+import stat
+import threading
+
+import numpy as np
+import pandas as pd
+
+SENSOR_COLUMNS = ['timestamp', 'light_intensity', 'temperature', 'humidity']
+SENSOR_HEADER = ','.join(SENSOR_COLUMNS)
+
+# Upper bound on bytes consumed per poll; a larger backlog is skipped, since
+# the ring buffer would evict those rows anyway
+DEFAULT_MAX_BYTES = 1 << 20
+
+
+class RingBuffer:
+    """Fixed-capacity columnar float buffer keeping the most recent rows."""
+
+    def __init__(self, capacity, columns):
+        self.capacity = capacity
+        self.columns = list(columns)
+        self.total = 0  # rows ever appended
+        self._data = np.zeros((len(self.columns), capacity), dtype=np.float64)
+        self._next = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def extend(self, block):
+        """Append a (len(columns), n) block of rows, evicting the oldest ones."""
+        n = block.shape[1]
+        self.total += n
+        if n >= self.capacity:
+            self._data[:] = block[:, -self.capacity:]
+            self._next, self._size = 0, self.capacity
+            return
+
+        end = self._next + n
+        if end <= self.capacity:
+            self._data[:, self._next:end] = block
+        else:
+            split = self.capacity - self._next
+            self._data[:, self._next:] = block[:, :split]
+            self._data[:, :n - split] = block[:, split:]
+        self._next = end % self.capacity
+        self._size = min(self._size + n, self.capacity)
+
+    def to_frame(self):
+        """The buffered rows, oldest first, as a new DataFrame."""
+        start = (self._next - self._size) % self.capacity
+        order = (start + np.arange(self._size)) % self.capacity
+        return pd.DataFrame(self._data[:, order].T, columns=self.columns)
+
+
+class FileTail:
+    """Reads the bytes appended to a regular file since the previous read.
+
+    Truncation or replacement of the file (a smaller size or a new inode)
+    restarts from the beginning.
+    """
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.offset = 0
+        self._inode = None
+
+    def read(self):
+        """Return ``(data, restarted)``; ``restarted`` means earlier partial lines are stale."""
+        try:
+            info = os.stat(self.path)
+        except FileNotFoundError:
+            return b'', False
+
+        restarted = False
+        if info.st_ino != self._inode or info.st_size < self.offset:
+            self._inode, self.offset, restarted = info.st_ino, 0, True
+
+        pending = info.st_size - self.offset
+        skipped = pending > self.max_bytes
+        if skipped:
+            self.offset = info.st_size - self.max_bytes
+            restarted = True
+        if pending <= 0:
+            return b'', restarted
+
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read(info.st_size - self.offset)
+        self.offset += len(data)
+
+        if skipped:
+            # Landed mid-line; resume at the next full line
+            newline = data.find(b'\n')
+            data = data[newline + 1:] if newline >= 0 else b''
+        return data, restarted
+
+    def close(self):
+        pass
+
+
+class PipeTail:
+    """Non-blocking reader for a named pipe or a character device such as a serial port."""
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+
+    def read(self):
+        chunks, size = [], 0
+        while size < self.max_bytes:
+            try:
+                chunk = os.read(self._fd, min(65536, self.max_bytes - size))
+            except BlockingIOError:
+                break
+            if not chunk:  # no writer connected right now
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+        return b''.join(chunks), False
+
+    def close(self):
+        os.close(self._fd)
+
+
+def allowed_source(path, data_dir, devices=()):
+    """Real path of ``path`` (relative to ``data_dir``), if it is under ``data_dir`` or one of ``devices``.
+
+    Anything else raises ValueError, so a path typed into the dashboard
+    cannot read arbitrary files on the server. Symlinks are resolved before
+    the check.
+    """
+    data_dir = os.path.realpath(data_dir)
+    resolved = os.path.realpath(os.path.join(data_dir, os.path.expanduser(path)))
+    if resolved in {os.path.realpath(device) for device in devices}:
+        return resolved
+    if os.path.commonpath([data_dir, resolved]) != data_dir or resolved == data_dir:
+        raise ValueError(f"{path} is not a file under {data_dir} or a configured sensor device")
+    return resolved
+
+
+def open_source(path, max_bytes=DEFAULT_MAX_BYTES):
+    """Pick the tail reader for ``path``: pipes and devices stream, files are seeked."""
+    mode = os.stat(path).st_mode
+    if stat.S_ISFIFO(mode) or stat.S_ISCHR(mode):
+        return PipeTail(path, max_bytes)
+    return FileTail(path, max_bytes)
+
+
+class LineDecoder:
+    """Splits a byte stream into complete lines, carrying partial lines between reads."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._partial = b''
+
+    def reset(self):
+        self._partial = b''
+
+    def feed(self, data):
+        data = self._partial + data
+        cut = data.rfind(b'\n') + 1
+        self._partial = data[cut:]
+        if len(self._partial) > self.max_bytes:  # not line-oriented input; drop it
+            self._partial = b''
+        return data[:cut]
+
+
+def parse_lines(data):
+    """Parse complete CSV lines into a (4, n) float array, timestamps as epoch seconds.
+
+    Header lines and malformed rows are dropped.
+    """
+    if not data:
+        return np.empty((len(SENSOR_COLUMNS), 0))
+
+    frame = pd.read_csv(
+        io.BytesIO(data), header=None, names=SENSOR_COLUMNS, dtype=str,
+        on_bad_lines='skip', skip_blank_lines=True,
+    )
+    frame = frame[frame['timestamp'] != 'timestamp']
+    timestamps = pd.to_datetime(frame['timestamp'], errors='coerce', format='ISO8601')
+    block = np.empty((len(SENSOR_COLUMNS), len(frame)))
+    block[0] = (timestamps - pd.Timestamp(0)) / pd.Timedelta(seconds=1)
+    for i, col in enumerate(SENSOR_COLUMNS[1:], start=1):
+        block[i] = pd.to_numeric(frame[col], errors='coerce')
+    return block[:, ~np.isnan(block).any(axis=0)]
+
+
+class SensorStream:
+    """A tailed source feeding a ring buffer; safe to poll from several sessions."""
+
+    def __init__(self, path, capacity=6000, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.buffer = RingBuffer(capacity, SENSOR_COLUMNS)
+        self._decoder = LineDecoder(max_bytes)
+        self._source = None
+        self._lock = threading.Lock()
+
+    def poll(self):
+        """Ingest whatever was appended since the last poll; returns the number of new rows."""
+        with self._lock:
+            if self._source is None:
+                if not os.path.exists(self.path):
+                    return 0
+                self._source = open_source(self.path, self.max_bytes)
+
+            data, restarted = self._source.read()
+            if restarted:
+                self._decoder.reset()
+            block = parse_lines(self._decoder.feed(data))
+            self.buffer.extend(block)
+            return block.shape[1]
+
+    def snapshot(self):
+        """Buffered readings, oldest first, with a datetime ``timestamp`` column."""
+        with self._lock:
+            frame = self.buffer.to_frame()
+        micros = np.rint(frame['timestamp'].to_numpy() * 1e6).astype(np.int64)
+        frame['timestamp'] = pd.to_datetime(micros, unit='us')
+        return frame
+
+    def close(self):
+        with self._lock:
+            if self._source is not None:
+                self._source.close()
+                self._source = None
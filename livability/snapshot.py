@@ -0,0 +1,262 @@
+"""Static snapshots of the dashboard: precomputed figures and tables served from disk.
+
+The data changes about once a year, but every Streamlit session reruns the
+script and rebuilds the same figures. A snapshot precomputes them once:
+
+    python -m livability.snapshot build --output snapshot
+    python -m livability.snapshot serve --root snapshot --port 8000
+
+build writes snapshot/<version>/ with every exported figure (see
+livability.export), every page table as JSON, and a snapshot.json index,
+then points snapshot/LATEST at it. The version hashes the dataset
+fingerprint with every build parameter that shapes the output (the snapshot
+format, --comparison-size, --max-comparisons), so rebuilding unchanged data
+with the same parameters is a no-op, a build with other parameters gets its
+own directory, and clients can cache URLs forever.
+
+serve maps the routes listed in the latest snapshot.json to their files and
+streams each GET from disk, so its memory does not grow with the snapshot:
+
+- /snapshot.json: the index of figures and tables
+- /figures/<path>.json, /tables/<name>.json: Plotly figure / table JSON
+- /view/<path>: a minimal Plotly.js page rendering one figure
+- /v/<version>/...: the same, pinned to a version (immutable)
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from livability.export import MAX_COMPARISONS, city_slugs, data_version, export_figures, load_city_index
+from livability.reload import CityStats
+from livability.storage import DISPLAY_COLUMNS
+
+SNAPSHOT_FORMAT = 3
+VIEW_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<script src="https://cdn.plot.ly/plotly-2.35.2.min.js"></script></head>
+<body><div id="figure" style="height:90vh"></div>
+<script>
+fetch("{url}").then(r => r.json()).then(fig => Plotly.newPlot("figure", fig.data, fig.layout, {{responsive: true}}));
+</script></body></html>
+"""
+
+
+def build_parameters(comparison_size=0, max_comparisons=MAX_COMPARISONS):
+    """Every build parameter that shapes a snapshot's contents."""
+    return {'format': SNAPSHOT_FORMAT, 'figures': 'json', 'comparison_size': comparison_size,
+            'max_comparisons': max_comparisons}
+
+
+def snapshot_version(city_index, parameters):
+    """Hex version of a snapshot of ``city_index`` built with ``parameters``."""
+    key = json.dumps({'data': data_version(city_index), **parameters}, sort_keys=True)
+    return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+
+def page_tables(city_index):
+    """Yield (name, frame) for every table the dashboard pages show."""
+    df = city_index.frame
+    yield 'home', df.head(12)
+    for city, name in city_slugs(city_index.cities).items():
+        yield f'city/{name}', city_index.city(city)[DISPLAY_COLUMNS]
+    for year in city_index.years.tolist():
+        # Comparisons of any set of cities are row subsets of their year's table
+        yield f'comparison/{year}', city_index.year(year)[DISPLAY_COLUMNS]
+    stats = CityStats('livability_index')
+    stats.reset(df)
+    yield 'leaderboard', stats.table()
+
+
+def build_snapshot(source, root, workers=None, comparison_size=0, force=False, max_comparisons=MAX_COMPARISONS):
+    """Write a snapshot of ``source`` under ``root`` and make it the latest; returns its directory."""
+    city_index = load_city_index(source)
+    parameters = build_parameters(comparison_size, max_comparisons)
+    version = snapshot_version(city_index, parameters)
+    target = os.path.join(root, version)
+    if os.path.exists(os.path.join(target, 'snapshot.json')) and not force:
+        _set_latest(root, version)
+        return target
+
+    # Build next to the target and rename, so a server never sees half a snapshot
+    staging = target + '.partial'
+    shutil.rmtree(staging, ignore_errors=True)
+    n_figures, _, _ = export_figures(source, os.path.join(staging, 'figures'), parameters['figures'], workers,
+                                     comparison_size, max_comparisons, city_index=city_index)
+    with open(os.path.join(staging, 'figures', 'manifest.json')) as f:
+        figure_paths = [entry['path'] for entry in json.load(f)]
+
+    tables = []
+    for name, frame in page_tables(city_index):
+        path = os.path.join(staging, 'tables', f'{name}.json')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        frame.to_json(path, orient='split', index=False)
+        tables.append(f'{name}.json')
+
+    index = {
+        'format': SNAPSHOT_FORMAT,
+        'version': version,
+        'parameters': parameters,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'source': str(source),
+        'rows': len(city_index),
+        'cities': len(city_index.cities),
+        'years': city_index.years.tolist(),
+        'figures': figure_paths,
+        'tables': tables,
+    }
+    with open(os.path.join(staging, 'snapshot.json'), 'w') as f:
+        json.dump(index, f, indent=1)
+
+    shutil.rmtree(target, ignore_errors=True)
+    os.rename(staging, target)
+    _set_latest(root, version)
+    print(f"Snapshot {version}: {n_figures:,} figures, {len(tables):,} tables in {target}")
+    return target
+
+
+def _set_latest(root, version):
+    tmp = os.path.join(root, 'LATEST.tmp')
+    with open(tmp, 'w') as f:
+        f.write(version + '\n')
+    os.replace(tmp, os.path.join(root, 'LATEST'))
+
+
+def latest_version(root):
+    with open(os.path.join(root, 'LATEST')) as f:
+        return f.read().strip()
+
+
+class SnapshotStore:
+    """The routes of one snapshot version, each mapped to its file; bodies stay on disk."""
+
+    def __init__(self, root, version=None):
+        self.version = version or latest_version(root)
+        self.base = os.path.join(root, self.version)
+        with open(os.path.join(self.base, 'snapshot.json')) as f:
+            index = json.load(f)
+        self.routes = {'/snapshot.json': 'snapshot.json'}
+        self.routes.update((f'/figures/{path}', f'figures/{path}') for path in index['figures'])
+        self.routes.update((f'/tables/{name}', f'tables/{name}') for name in index['tables'])
+
+    def __len__(self):
+        return len(self.routes) + sum(route.startswith('/figures/') for route in self.routes)
+
+    def _resolve(self, route):
+        """(file, size, content type) of a route without its version prefix, or None."""
+        if route == '/':
+            route = '/snapshot.json'
+        if route.startswith('/view/'):
+            figure = route[len('/view/'):]
+            if f'/figures/{figure}.json' not in self.routes:
+                return None
+            page = VIEW_PAGE.format(title=figure, url=f'/v/{self.version}/figures/{figure}.json').encode()
+            return io.BytesIO(page), len(page), 'text/html'
+        relative = self.routes.get(route)
+        if relative is None:
+            return None
+        try:
+            body = open(os.path.join(self.base, relative), 'rb')
+        except FileNotFoundError:
+            return None
+        return body, os.fstat(body.fileno()).st_size, 'application/json'
+
+    def lookup(self, path):
+        """(open file, size, content type, immutable) for a request path, or None; the caller closes the file."""
+        match = re.match(r'^/v/([0-9a-f]+)(/.*)$', path)
+        if match:
+            if match.group(1) != self.version:
+                return None
+            found = self._resolve(match.group(2))
+            return found and (*found, True)
+        found = self._resolve(path)
+        return found and (*found, False)
+
+
+def make_handler(store):
+    class SnapshotHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Headers and body are separate writes; with Nagle on, keep-alive clients wait on delayed ACKs
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            found = store.lookup(self.path.split('?', 1)[0])
+            if found is None:
+                self.send_error(404)
+                return
+            body, size, content_type, immutable = found
+            with body:
+                etag = f'"{store.version}"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(size))
+                self.send_header('ETag', etag)
+                self.send_header('Cache-Control', 'public, max-age=31536000, immutable' if immutable else 'no-cache')
+                self.end_headers()
+                shutil.copyfileobj(body, self.wfile)
+
+        def log_message(self, format, *args):
+            pass
+
+    return SnapshotHandler
+
+
+def make_server(root, host='127.0.0.1', port=8000):
+    """HTTP server over the latest snapshot in ``root``; port 0 picks a free port."""
+    store = SnapshotStore(root)
+    server = ThreadingHTTPServer((host, port), make_handler(store))
+    server.daemon_threads = True
+    server.store = store
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or serve static snapshots of the dashboard.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help="precompute every figure and table of a data source")
+    build.add_argument('--source', default=os.environ.get('LIVABILITY_DATA', 'urban_livability_data.csv'))
+    build.add_argument('--output', default='snapshot')
+    build.add_argument('--workers', type=int)
+    build.add_argument('--comparison-size', type=int, default=0,
+                       help="cities per comparison figure; 0 (the default) skips comparisons")
+    build.add_argument('--max-comparisons', type=int, default=MAX_COMPARISONS,
+                       help="refuse to build more comparison groups than this")
+    build.add_argument('--force', action='store_true', help="rebuild even if this data version exists")
+
+    serve = subparsers.add_parser('serve', help="serve the latest snapshot over HTTP")
+    serve.add_argument('--root', default='snapshot')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8000)
+
+    args = parser.parse_args()
+    if args.command == 'build':
+        started = time.perf_counter()
+        build_snapshot(args.source, args.output, args.workers, args.comparison_size, args.force,
+                       args.max_comparisons)
+        print(f"Done in {time.perf_counter() - started:.1f} s")
+    else:
+        server = make_server(args.root, args.host, args.port)
+        print(f"Serving snapshot {server.store.version} ({len(server.store):,} routes) "
+              f"on http://{args.host}:{server.server_address[1]}/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
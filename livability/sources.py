@@ -0,0 +1,199 @@
+"""Pluggable data sources for the livability dataset.
+
+Every source loads the same schema-typed frame (see livability.storage), so
+the dashboard's cached pipeline does not care where rows come from. A source
+is chosen from a spec string, e.g. the LIVABILITY_DATA environment variable:
+
+- ``embedded``: the sample dataset compiled into livability.embedded
+- ``*.parquet``: a columnar store (needs pyarrow)
+- ``*.db`` / ``*.sqlite`` / ``sqlite:///path``: a SQLite table, ``livability``
+  unless named with ``#table``
+- a directory: per-city pollution, census, poverty and health files, joined
+  on (city, year) by livability.ingest
+- anything else: a CSV file, read from its Parquet copy when that is fresh
+
+``stamp()`` is a cheap change token for reload checks. CSV files also support
+reading only the rows appended since an earlier read (``read_appended``).
+"""
+
+import hashlib
+import io
+import os
+import sqlite3
+from collections import namedtuple
+
+import pandas as pd
+
+from livability.ingest import directory_stamp, load_indicator_files
+from livability.storage import apply_schema, read_csv, read_dataset, read_parquet
+
+EMBEDDED = 'embedded'
+DEFAULT_TABLE = 'livability'
+_SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+# Bytes at the start of the file and before the read offset that must be
+# unchanged for a change to count as an append
+DIGEST_BYTES = 4096
+
+# Byte offset just past the last row read, file size at that read, and a
+# digest of the guarded bytes
+AppendCursor = namedtuple('AppendCursor', ['offset', 'size', 'digest'])
+
+
+def file_stamp(path):
+    """(mtime, size) of ``path``; changes whenever the file is written."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FileSource:
+    """A CSV file, shadowed by its columnar copy when one is fresh."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self, columns=None):
+        return read_dataset(self.path, columns=columns)
+
+    def stamp(self):
+        return file_stamp(self.path)
+
+    def cursor(self, stamp):
+        """Append cursor for a load made while the file had ``stamp``, or None if it ended mid-row."""
+        size = stamp[1]
+        with open(self.path, 'rb') as f:
+            digest, ends_row = _guard_digest(f, size)
+        return AppendCursor(size, size, digest) if ends_row else None
+
+    def read_appended(self, cursor, columns=None):
+        """Rows appended after ``cursor`` and the cursor past them, or None unless the file only grew.
+
+        A trailing row without its newline yet is left for the next read.
+        """
+        if cursor is None:
+            return None
+        with open(self.path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size <= cursor.size or _guard_digest(f, cursor.offset)[0] != cursor.digest:
+                return None
+            f.seek(0)
+            header = f.readline()
+            f.seek(cursor.offset)
+            tail = f.read(size - cursor.offset)
+            tail = tail[:tail.rfind(b'\n') + 1]
+            offset = cursor.offset + len(tail)
+            digest = _guard_digest(f, offset)[0]
+
+        rows = read_csv(io.BytesIO(header + tail), columns=columns)
+        return rows, AppendCursor(offset, size, digest)
+
+
+def _guard_digest(f, offset):
+    """Digest of the first and the last DIGEST_BYTES before ``offset``, and whether ``offset`` ends a row."""
+    f.seek(0)
+    head = f.read(min(offset, DIGEST_BYTES))
+    start = max(0, offset - DIGEST_BYTES)
+    f.seek(start)
+    block = f.read(offset - start)
+    return hashlib.sha1(head + block).digest(), block.endswith(b'\n')
+
+
+class ColumnarSource:
+    """A Parquet file."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self, columns=None):
+        return read_parquet(self.path, columns=columns)
+
+    def stamp(self):
+        return file_stamp(self.path)
+
+    def __repr__(self):
+        return self.path
+
+
+class EmbeddedSource:
+    """CSV text held in memory; the embedded sample dataset by default."""
+
+    def __init__(self, text=None):
+        if text is None:
+            from livability.embedded import EMBEDDED_CSV as text
+        self.text = text
+
+    def load(self, columns=None):
+        return read_csv(io.StringIO(self.text), columns=columns)
+
+    def stamp(self):
+        return None
+
+    def __repr__(self):
+        return EMBEDDED
+
+
+class IndicatorFilesSource:
+    """A directory of per-city, per-source indicator files, read concurrently and joined."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def load(self, columns=None):
+        frame = load_indicator_files(self.root)
+        if columns is not None:
+            frame = frame[[col for col in columns if col in frame.columns]]
+        return frame
+
+    def stamp(self):
+        return directory_stamp(self.root)
+
+    def __repr__(self):
+        return self.root
+
+
+def quote_identifier(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+class DatabaseSource:
+    """A table in a SQLite database."""
+
+    def __init__(self, path, table=DEFAULT_TABLE):
+        self.path = path
+        self.table = table
+
+    def connect(self):
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(self.path)
+        return sqlite3.connect(f'file:{self.path}?mode=ro', uri=True)
+
+    def load(self, columns=None):
+        with self.connect() as con:
+            stored = [row[1] for row in con.execute(f'PRAGMA table_info({quote_identifier(self.table)})')]
+            if columns is not None:
+                stored = [col for col in columns if col in stored]
+            query = f"SELECT {', '.join(map(quote_identifier, stored))} FROM {quote_identifier(self.table)}"
+            return apply_schema(pd.read_sql_query(query, con))
+
+    def stamp(self):
+        # SQLite may keep recent writes in the -wal file until a checkpoint
+        wal = self.path + '-wal'
+        return file_stamp(self.path), file_stamp(wal) if os.path.exists(wal) else None
+
+    def __repr__(self):
+        return f'sqlite:///{self.path}#{self.table}'
+
+
+def resolve_source(spec):
+    """The data source described by ``spec``."""
+    if spec == EMBEDDED:
+        return EmbeddedSource()
+
+    if spec.startswith('sqlite:///') or spec.split('#')[0].endswith(_SQLITE_EXTENSIONS):
+        path, _, table = spec.removeprefix('sqlite:///').partition('#')
+        return DatabaseSource(path, table or DEFAULT_TABLE)
+
+    if spec.endswith('.parquet'):
+        return ColumnarSource(spec)
+    if os.path.isdir(spec):
+        return IndicatorFilesSource(spec)
+    return FileSource(spec)
@@ -0,0 +1,119 @@
+"""Schema-typed loading of the livability dataset, with an optional columnar store.
+
+The columnar store is a Parquet file next to the CSV and needs pyarrow; without
+it, or while the Parquet file is missing or older than the CSV, loading falls
+back to the CSV. Convert the CSV once with:
+
+    python -m livability.storage urban_livability_data.csv
+"""
+
+import argparse
+import os
+
+import pandas as pd
+
+from livability.indices import add_indices
+
+SCHEMA = {
+    'year': 'int16',
+    'city': 'category',
+    'pm2.5': 'float32',
+    'pm10': 'float32',
+    'no2': 'float32',
+    'so2': 'float32',
+    # Nullable, so a row with a blank population still parses (its pdi stays blank)
+    'population': 'Int32',
+    'area': 'float32',
+    'bpl_population': 'float32',
+    'aqi': 'float32',
+    'pdi': 'float32',
+    'hi': 'float32',
+    'bpl_index': 'float32',
+    'livability_index': 'float32',
+}
+DATASET_COLUMNS = list(SCHEMA)
+# Raw columns the dashboard's data tables show
+DISPLAY_COLUMNS = ['year', 'city', 'pm2.5', 'pm10', 'no2', 'so2', 'population', 'area', 'bpl_population']
+
+
+def parquet_available():
+    """Whether the pyarrow engine needed for the columnar store is installed."""
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def columnar_path(csv_path):
+    """Path of the Parquet file that shadows ``csv_path``."""
+    return os.path.splitext(csv_path)[0] + '.parquet'
+
+
+def apply_schema(df):
+    """Cast the known dataset columns to their SCHEMA dtypes."""
+    dtypes = {col: dtype for col, dtype in SCHEMA.items() if col in df.columns and df[col].dtype != dtype}
+    return df.astype(dtypes) if dtypes else df
+
+
+def prepare_rows(df):
+    """Rows with every index column filled in, all in SCHEMA dtypes (computed indices come out as float64)."""
+    return apply_schema(add_indices(df))
+
+
+def read_csv(path_or_buffer, columns=None):
+    """Parse the CSV straight into SCHEMA dtypes, keeping only ``columns`` if given."""
+    usecols = None if columns is None else (lambda col: col in columns)
+    return pd.read_csv(path_or_buffer, dtype=SCHEMA, usecols=usecols)
+
+
+def read_parquet(path, columns=None):
+    """Read the columnar store, projecting to the requested columns it contains."""
+    if columns is not None:
+        import pyarrow.parquet as pq
+
+        stored = set(pq.read_schema(path).names)
+        columns = [col for col in columns if col in stored]
+    return apply_schema(pd.read_parquet(path, columns=columns, engine='pyarrow'))
+
+
+def has_fresh_columnar(csv_path):
+    """Whether a Parquet copy of ``csv_path`` exists and is at least as new as the CSV."""
+    path = columnar_path(csv_path)
+    if not os.path.exists(path) or not parquet_available():
+        return False
+    return not os.path.exists(csv_path) or os.path.getmtime(path) >= os.path.getmtime(csv_path)
+
+
+def read_dataset(csv_path, columns=None):
+    """Load the dataset, preferring the columnar store over the CSV when it is fresh."""
+    if has_fresh_columnar(csv_path):
+        return read_parquet(columnar_path(csv_path), columns=columns)
+    return read_csv(csv_path, columns=columns)
+
+
+def dataset_fingerprint(df):
+    """Content hash of a loaded frame, used as the dataset version for derived caches."""
+    return int(pd.util.hash_pandas_object(df, index=False).sum())
+
+
+def convert_csv(csv_path, out_path=None):
+    """One-shot conversion of the CSV to a schema-typed Parquet file; returns its path."""
+    out_path = out_path or columnar_path(csv_path)
+    read_csv(csv_path).to_parquet(out_path, index=False, engine='pyarrow')
+    return out_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert the livability CSV to the columnar store.")
+    parser.add_argument('csv_path', nargs='?', default='urban_livability_data.csv')
+    parser.add_argument('-o', '--output', help="Parquet path (default: next to the CSV)")
+    args = parser.parse_args()
+
+    if not parquet_available():
+        parser.error("pyarrow is required for the columnar store: pip install pyarrow")
+    print(f"Wrote {convert_csv(args.csv_path, args.output)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""Server-side paging, sorting and filtering of the dashboard's data tables.
+
+A TableView wraps a frame already in memory. Only the rows of the visible
+page are handed to st.dataframe, so the browser receives one window rather
+than the whole frame. Sorting and filtering run in the server on the frame's
+columns. The resulting row orders are memoized per (filter, sort), so paging
+through a sorted, filtered table only slices an array.
+"""
+
+import numpy as np
+import pandas as pd
+
+from livability.memo import LRUCache
+
+PAGE_SIZES = (10, 25, 50, 100, 250)
+DEFAULT_PAGE_SIZE = 25
+
+
+def _sort_key(column):
+    """Integer or float array ordering like ``column``; missing values sort last ascending."""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        codes = column.cat.codes.to_numpy().astype(np.int64)
+        categories = column.cat.categories
+        if not categories.is_monotonic_increasing:
+            rank = np.empty(len(categories), dtype=np.int64)
+            rank[categories.argsort()] = np.arange(len(categories))
+            codes = np.where(codes >= 0, rank[codes], codes)
+        return np.where(codes >= 0, codes, np.nan)
+    if column.dtype.kind in 'biuf':
+        return column.to_numpy(dtype=np.float64, na_value=np.nan)
+    # Strings and other objects: rank their distinct values
+    codes, _ = pd.factorize(column, sort=True)
+    return np.where(codes >= 0, codes, np.nan).astype(np.float64)
+
+
+class TableView:
+    """Pages of ``frame`` after an optional text filter and sort, with memoized row orders."""
+
+    def __init__(self, frame, maxsize=16):
+        self.frame = frame
+        self.memo = LRUCache(maxsize)
+
+    def __len__(self):
+        return len(self.frame)
+
+    @property
+    def columns(self):
+        return list(self.frame.columns)
+
+    def text_columns(self):
+        return [col for col, dtype in self.frame.dtypes.items()
+                if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(dtype)]
+
+    def _matches(self, query):
+        """Row mask of rows with ``query`` in any text column, case-insensitively."""
+        mask = np.zeros(len(self.frame), dtype=bool)
+        for col in self.text_columns():
+            column = self.frame[col]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                # Match the distinct values once, then select rows by code
+                hits = column.cat.categories.astype(str).str.contains(query, case=False, regex=False)
+                mask |= np.isin(column.cat.codes.to_numpy(), np.flatnonzero(hits))
+            else:
+                mask |= column.astype(str).str.contains(query, case=False, regex=False).to_numpy()
+        return mask
+
+    def rows(self, query=None, sort_by=None, ascending=True):
+        """Positions of the rows matching ``query``, ordered by ``sort_by``."""
+        query = (query or '').strip() or None
+        return self.memo.memoize((query, sort_by, ascending), lambda: self._order(query, sort_by, ascending))
+
+    def _order(self, query, sort_by, ascending):
+        positions = np.arange(len(self.frame)) if query is None else np.flatnonzero(self._matches(query))
+        if sort_by is not None:
+            values = _sort_key(self.frame[sort_by])[positions]
+            if not ascending:
+                # Negating keeps missing values (NaN) last and ties in frame order
+                values = -values
+            positions = positions[np.argsort(values, kind='stable')]
+        positions.flags.writeable = False
+        return positions
+
+    def count(self, query=None, sort_by=None, ascending=True):
+        """Number of rows matching ``query``; memoizes their order for the page() that follows."""
+        return len(self.rows(query, sort_by, ascending))
+
+    def page(self, page=1, page_size=DEFAULT_PAGE_SIZE, query=None, sort_by=None, ascending=True):
+        """(rows of page ``page``, counting from 1, and the number of matching rows)."""
+        positions = self.rows(query, sort_by, ascending)
+        start = (max(page, 1) - 1) * page_size
+        window = self.frame.iloc[positions[start:start + page_size]]
+        # A categorical column would otherwise ship every category of the frame with each page
+        categorical = {col: window[col].cat.remove_unused_categories() for col, dtype in window.dtypes.items()
+                       if isinstance(dtype, pd.CategoricalDtype)}
+        return window.assign(**categorical) if categorical else window, len(positions)
+
+
+def page_count(n_rows, page_size):
+    return max(1, -(-n_rows // page_size))
@@ -0,0 +1,42 @@
+"""Reshaping helpers shared by the dashboard pages."""
+
+import numpy as np
+import pandas as pd
+
+from livability.indices import SUB_INDICES
+
+
+def sub_indices_long(df):
+    """Melt the sub-index columns into a long (city, year, subindex, value) frame.
+
+    Rows are ordered by sub-index, then by the original row order, so charts
+    colour the series AQI, PDI, HI, BPL in the same order as before. The
+    columns keep the frame's dtypes, and subindex is categorical, so the
+    long frame costs about as much per row as the four columns it repeats.
+    """
+    n_subs = len(SUB_INDICES)
+    city = df['city']
+    if isinstance(city.dtype, pd.CategoricalDtype):
+        city = pd.Categorical.from_codes(np.tile(city.cat.codes.to_numpy(), n_subs), dtype=city.dtype)
+    else:
+        city = np.tile(city.to_numpy(), n_subs)
+    return pd.DataFrame({
+        'city': city,
+        'year': np.tile(df['year'].to_numpy(), n_subs),
+        'subindex': pd.Categorical.from_codes(np.repeat(np.arange(n_subs, dtype=np.int8), len(df)),
+                                              categories=SUB_INDICES),
+        'value': np.concatenate([df[col].to_numpy() for col in SUB_INDICES]),
+    })
+
+
+def take_sub_indices(sub_long, positions):
+    """Rows of a long sub-index frame for the given row positions (or slice) of the wide frame it was melted from.
+
+    Each sub-index is its own block of the long frame, so the result is
+    always a copy.
+    """
+    n_rows = len(sub_long) // len(SUB_INDICES)
+    if isinstance(positions, slice):
+        positions = np.arange(*positions.indices(n_rows))
+    offsets = n_rows * np.arange(len(SUB_INDICES))
+    return sub_long.iloc[(offsets[:, None] + np.asarray(positions)[None, :]).ravel()]
@@ -0,0 +1,124 @@
+"""What-if composite index: custom sub-index weights and year windows over the whole dataset.
+
+The published livability index is the equal-weight mean of the four
+sub-indices, scaled to 0–100. Under other weights a row scores its published
+index plus the weight changes times its sub-indices (weight_offsets), so equal
+weights give back the published index exactly and a small change of weights
+moves every score only slightly, including on rows whose published index is
+not exactly the mean of their sub-indices. A WeightedIndex holds the
+sub-indices as one contiguous n × 4 matrix, so re-weighting every row is a
+single matrix-vector product, and per-city means over a year window are two
+bincounts. Results are memoized in an LRU keyed on the normalized weights
+(and window), so scrubbing a slider back and forth is served from memory.
+"""
+
+import numpy as np
+import pandas as pd
+
+from livability.indices import SUB_INDICES
+from livability.memo import LRUCache
+
+EQUAL_WEIGHTS = (0.25, 0.25, 0.25, 0.25)
+
+
+def normalize_weights(weights):
+    """Weights scaled to sum to 1 and rounded, as an LRU key; None for the published index or all-zero weights."""
+    if weights is None:
+        return None
+    weights = np.asarray(weights, dtype=np.float64)
+    total = weights.sum()
+    if total <= 0:
+        return None
+    return tuple(np.round(weights / total, 6).tolist())
+
+
+def weight_offsets(key):
+    """Points each sub-index adds to the published index under normalized weights ``key`` (zero at equal weights)."""
+    return (np.asarray(key, dtype=np.float64) - np.asarray(EQUAL_WEIGHTS)) * 100
+
+
+def weighted_scores(rows, weights):
+    """Livability index (0–100) of the dataset ``rows`` under ``weights``, computed as WeightedIndex does."""
+    key = normalize_weights(weights)
+    published = rows['livability_index'].to_numpy(dtype=np.float32)
+    if key is None:
+        return published
+    return published + rows[SUB_INDICES].to_numpy(dtype=np.float32) @ weight_offsets(key).astype(np.float32)
+
+
+class WeightedIndex:
+    """Livability index and city ranking under custom weights, over the rows of a CityYearIndex.
+
+    Scores are aligned with ``city_index.frame``, so the index's row
+    positions select from them directly. Weights of None stand for the
+    published livability_index column as stored.
+    """
+
+    def __init__(self, city_index, maxsize=16):
+        frame = city_index.frame
+        # float32 like the stored columns: half the memory, and ample precision for a 0–100 score
+        self.matrix = np.ascontiguousarray(frame[SUB_INDICES].to_numpy(dtype=np.float32))
+        self.published = frame['livability_index'].to_numpy(dtype=np.float32)
+        self.codes = city_index.city_codes
+        self.cities = city_index.cities
+        self.years = frame['year'].to_numpy()
+        self.memo = LRUCache(maxsize)
+
+    @property
+    def hits(self):
+        return self.memo.hits
+
+    @property
+    def misses(self):
+        return self.memo.misses
+
+    def scores(self, weights):
+        """Livability index (0–100) of every row under ``weights``; read-only."""
+        return self._scores(normalize_weights(weights))
+
+    def _scores(self, key):
+        if key is None:
+            return self.published
+
+        def compute():
+            scores = self.published + self.matrix @ weight_offsets(key).astype(np.float32)
+            scores.flags.writeable = False
+            return scores
+
+        return self.memo.memoize(('scores', key), compute)
+
+    def ranking(self, weights, first_year=None, last_year=None):
+        """Cities ranked by their mean weighted index over an inclusive year window, best first."""
+        key = normalize_weights(weights)
+
+        def compute():
+            scores = self._scores(key)
+            codes = self.codes
+            years = self.years
+            if first_year is not None or last_year is not None:
+                low = years.min() if first_year is None else first_year
+                high = years.max() if last_year is None else last_year
+                in_window = (years >= low) & (years <= high)
+                scores, codes, years = scores[in_window], codes[in_window], years[in_window]
+
+            # A row with a blank sub-index has no score and does not count towards its city
+            scored = ~np.isnan(scores)
+            if not scored.all():
+                scores, codes, years = scores[scored], codes[scored], years[scored]
+            counts = np.bincount(codes, minlength=len(self.cities))
+            sums = np.bincount(codes, weights=scores, minlength=len(self.cities))
+            # Rows are in (city, year) order, so each city-year starts where the pair changes
+            first = np.ones(len(codes), dtype=bool)
+            first[1:] = (codes[1:] != codes[:-1]) | (years[1:] != years[:-1])
+            distinct_years = np.bincount(codes[first], minlength=len(self.cities))
+            present = np.flatnonzero(counts)
+            means = sums[present] / counts[present]
+            order = np.argsort(-means, kind='stable')
+            return pd.DataFrame({
+                'city': self.cities[present[order]],
+                'livability_index': means[order],
+                'years': distinct_years[present[order]],
+                'rank': np.arange(1, len(order) + 1),
+            })
+
+        return self.memo.memoize(('ranking', key, first_year, last_year), compute)
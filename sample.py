@@ -1,27 +1,114 @@
-# Create complete Arduino sensor monitoring Streamlit app
-# This will create a comprehensive dashboard for monitoring LDR and DHT11 sensor data
-
-import pandas as pd
-import numpy as np
-
-# Create sample sensor data to simulate what would come from Arduino
-np.random.seed(42)
-
-# Generate sample data for demonstration (in real scenario this would come from serial communication)
-timestamps = pd.date_range('2024-10-15 14:00:00', periods=100, freq='10S')
-light_values = np.random.randint(0, 1023, 100)  # LDR values (0-1023)
-temperature = 20 + 10 * np.random.random(100)  # DHT11 temperature (20-30°C)
-humidity = 40 + 20 * np.random.random(100)  # DHT11 humidity (40-60%)
-
-# Create sample data
-sample_data = pd.DataFrame({
-    'timestamp': timestamps,
-    'light_intensity': light_values,
-    'temperature': temperature,
-    'humidity': humidity
-})
-
-# Save sample data for the Streamlit app to use
-sample_data.to_csv('sensor_data.csv', index=False)
-print("Sample sensor data created and saved to sensor_data.csv")
-print(sample_data.head())
\ No newline at end of file
+# Create complete Arduino sensor monitoring Streamlit app
+# This will create a comprehensive dashboard for monitoring LDR and DHT11 sensor data
+#
+#   python sample.py                                   # static 100-row sample -> sensor_data.csv
+#   python sample.py sensors --live --rate 100         # keep appending readings at 100 Hz
+#   python sample.py sensors --rows 100000000 --freq 10ms --output sensors.parquet
+#   python sample.py livability --cities 1000000 --years 10 --output livability.csv
+
+import argparse
+import os
+import time
+from datetime import datetime
+
+import pandas as pd
+import numpy as np
+
+from livability.synthetic import DEFAULT_SEED, livability_chunks, sensor_chunks, write_chunks
+
+
+def write_sample_data(path):
+    """Write the fixed 100-row demo dataset"""
+    # Create sample sensor data to simulate what would come from Arduino
+    np.random.seed(42)
+
+    # Generate sample data for demonstration (in real scenario this would come from serial communication)
+    timestamps = pd.date_range('2024-10-15 14:00:00', periods=100, freq='10s')
+    light_values = np.random.randint(0, 1023, 100)  # LDR values (0-1023)
+    temperature = 20 + 10 * np.random.random(100)  # DHT11 temperature (20-30°C)
+    humidity = 40 + 20 * np.random.random(100)  # DHT11 humidity (40-60%)
+
+    # Create sample data
+    sample_data = pd.DataFrame({
+        'timestamp': timestamps,
+        'light_intensity': light_values,
+        'temperature': temperature,
+        'humidity': humidity
+    })
+
+    # Save sample data for the Streamlit app to use
+    sample_data.to_csv(path, index=False)
+    print(f"Sample sensor data created and saved to {path}")
+    print(sample_data.head())
+
+
+def append_live_data(path, rate):
+    """Append simulated readings to a CSV file or named pipe at `rate` rows/sec until interrupted"""
+    rng = np.random.default_rng()
+    write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+    interval = 1.0 / rate
+
+    with open(path, 'a') as out:
+        if write_header:
+            out.write('timestamp,light_intensity,temperature,humidity\n')
+        print(f"Appending readings to {path} at {rate:g} Hz (Ctrl+C to stop)")
+        next_tick = time.perf_counter()
+        try:
+            while True:
+                now = datetime.now().isoformat(sep=' ', timespec='milliseconds')
+                out.write(f"{now},{rng.integers(0, 1023)},{20 + 10 * rng.random():.2f},{40 + 20 * rng.random():.2f}\n")
+                out.flush()
+                next_tick += interval
+                time.sleep(max(0.0, next_tick - time.perf_counter()))
+        except KeyboardInterrupt:
+            pass
+
+
+# Output file of each command when --output is not given
+DEFAULT_OUTPUTS = {None: 'sensor_data.csv', 'sensors': 'sensor_data.csv', 'livability': 'synthetic_livability.csv'}
+
+
+def report(path, rows, started):
+    elapsed = time.perf_counter() - started
+    print(f"Wrote {rows:,} rows to {path} in {elapsed:.1f} s ({rows / elapsed:,.0f} rows/sec)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Simulated sensor and urban livability datasets")
+    # Given before or after the command; the subcommands leave it unset, so they keep a value given before
+    output_help = "output file (default: sensor_data.csv, or synthetic_livability.csv for livability)"
+    parser.add_argument('--output', help=output_help)
+    subparsers = parser.add_subparsers(dest='command')
+
+    sensors = subparsers.add_parser('sensors', help="LDR/DHT11 readings, as a file or a live stream")
+    sensors.add_argument('--rows', type=int, default=100)
+    sensors.add_argument('--freq', default='10s', help="sampling interval, e.g. 10s or 10ms")
+    sensors.add_argument('--start', default='2024-10-15 14:00:00')
+    sensors.add_argument('--live', action='store_true', help="append readings continuously instead")
+    sensors.add_argument('--rate', type=float, default=1.0, help="readings per second in --live mode")
+
+    livability = subparsers.add_parser('livability', help="N cities × M years shaped like urban_livability_data.csv")
+    livability.add_argument('--cities', type=int, default=1000)
+    livability.add_argument('--years', type=int, default=5)
+    livability.add_argument('--start-year', type=int, default=2019)
+
+    for command in (sensors, livability):
+        command.add_argument('--output', default=argparse.SUPPRESS, help=output_help)
+        command.add_argument('--format', choices=['csv', 'parquet'], help="default: from the file extension")
+        command.add_argument('--chunk-rows', type=int, default=1_000_000, help="rows generated and written at a time")
+        command.add_argument('--seed', type=int, default=DEFAULT_SEED)
+
+    args = parser.parse_args()
+    output = args.output or DEFAULT_OUTPUTS[args.command]
+    started = time.perf_counter()
+
+    if args.command == 'sensors' and args.live:
+        append_live_data(output, args.rate)
+    elif args.command == 'sensors':
+        chunks = sensor_chunks(args.rows, args.start, args.freq, args.chunk_rows, args.seed)
+        report(output, write_chunks(chunks, output, args.format), started)
+    elif args.command == 'livability':
+        chunks = livability_chunks(args.cities, args.years, args.start_year, args.chunk_rows, args.seed)
+        report(output, write_chunks(chunks, output, args.format, typed=True), started)
+    else:
+        write_sample_data(output)
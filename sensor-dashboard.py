@@ -0,0 +1,105 @@
+import html
+import os
+
+import streamlit as st
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from livability.downsample import optimize_line_figure
+from livability.sensors import SensorStream, allowed_source
+
+# Sources are confined to this directory, plus any devices listed (os.pathsep-separated) in SENSOR_DEVICES
+DATA_DIR = os.environ.get('SENSOR_DATA_DIR', os.path.dirname(os.path.abspath(__file__)))
+DEVICES = [device for device in os.environ.get('SENSOR_DEVICES', '').split(os.pathsep) if device]
+
+# Page configuration
+st.set_page_config(
+    page_title="Live Sensor Monitor",
+    page_icon="📡",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Custom CSS styling
+st.markdown("""
+<style>
+.main-header {
+    color: #1f4e79;
+    font-size: 2.5rem;
+    font-weight: bold;
+    text-align: center;
+    margin-bottom: 1rem;
+}
+
+.info-box {
+    background-color: #e8f4ff;
+    padding: 1rem;
+    border-left: 4px solid #2c5aa0;
+    margin: 1rem 0;
+    border-radius: 5px;
+}
+</style>
+""", unsafe_allow_html=True)
+
+# One stream per source, shared by every session so the file is tailed once
+@st.cache_resource
+def get_stream(path, capacity):
+    """Tail `path` into a ring buffer of `capacity` readings"""
+    return SensorStream(path, capacity=capacity)
+
+# Sidebar controls
+st.sidebar.title("Live Source")
+source_path = st.sidebar.text_input("CSV file or named pipe in the data directory, or a serial device",
+                                    "sensor_data.csv")
+capacity = st.sidebar.number_input("Buffer size (readings)", min_value=100, max_value=1_000_000, value=6000, step=100)
+refresh_seconds = st.sidebar.slider("Refresh interval (s)", 0.2, 2.0, 0.5, 0.1)
+
+st.markdown("<h1 class='main-header'>📡 Live Sensor Monitor — LDR & DHT11</h1>", unsafe_allow_html=True)
+
+st.markdown(f"""
+<div class='info-box'>
+Tails <code>{html.escape(source_path)}</code> and shows the latest {capacity:,} readings. Only bytes appended since the
+previous refresh are read. Start a simulated sensor with <code>python sample.py sensors --live --rate 100</code>.
+</div>
+""", unsafe_allow_html=True)
+
+try:
+    stream = get_stream(allowed_source(source_path, DATA_DIR, DEVICES), int(capacity))
+except ValueError as error:
+    st.error(str(error))
+    st.stop()
+
+def live_panel():
+    new_rows = stream.poll()
+    readings = stream.snapshot()
+
+    if readings.empty:
+        st.info(f"Waiting for readings on {source_path}…")
+        return
+
+    latest = readings.iloc[-1]
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("Light Intensity", f"{latest['light_intensity']:.0f}")
+
+    with col2:
+        st.metric("Temperature (°C)", f"{latest['temperature']:.1f}")
+
+    with col3:
+        st.metric("Humidity (%)", f"{latest['humidity']:.1f}")
+
+    with col4:
+        st.metric("Readings ingested", f"{stream.buffer.total:,}", delta=f"+{new_rows}")
+
+    fig = make_subplots(rows=3, cols=1, shared_xaxes=True, vertical_spacing=0.05,
+                        subplot_titles=("Light Intensity (LDR)", "Temperature (°C)", "Humidity (%)"))
+    for row, column in enumerate(['light_intensity', 'temperature', 'humidity'], start=1):
+        fig.add_trace(go.Scatter(x=readings['timestamp'], y=readings[column], mode='lines', name=column),
+                      row=row, col=1)
+    fig.update_layout(height=700, showlegend=False, uirevision=source_path)
+    # WebGL plus min/max downsampling keeps every spike at a bounded payload
+    optimize_line_figure(fig, method='minmax')
+    st.plotly_chart(fig, use_container_width=True)
+
+st.fragment(live_panel, run_every=refresh_seconds)()
@@ -0,0 +1,29 @@
+import os
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SHIPPED_CSV = os.path.join(ROOT, 'urban_livability_data.csv')
+
+
+@pytest.fixture
+def shipped():
+    """The published dataset as shipped, parsed without the storage schema."""
+    return pd.read_csv(SHIPPED_CSV)
+
+
+@pytest.fixture
+def shipped_copy(tmp_path, shipped):
+    """Path of a copy of the shipped CSV, for backends that build files next to it."""
+    path = tmp_path / 'urban_livability_data.csv'
+    shipped.to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def gapped_copy(tmp_path, shipped):
+    """Path of the shipped CSV without its Delhi 2021 row."""
+    path = tmp_path / 'gapped.csv'
+    shipped[~((shipped['city'] == 'Delhi') & (shipped['year'] == 2021))].to_csv(path, index=False)
+    return str(path)
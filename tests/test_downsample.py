@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from livability import figures
+from livability.downsample import lttb_indices
+
+
+def reference_lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets, one bucket at a time."""
+    n = len(y)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = [0]
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        cx, cy = x[stop:next_stop].mean(), y[stop:next_stop].mean()
+        ax, ay = x[keep[-1]], y[keep[-1]]
+        areas = np.abs((cx - ax) * (y[start:stop] - ay) - (cy - ay) * (x[start:stop] - ax))
+        keep.append(start + int(np.argmax(areas)))
+    return np.array(keep + [n - 1])
+
+
+@pytest.mark.parametrize('n', [2001, 5000, 60_000, 200_000])
+@pytest.mark.parametrize('kind', ['walk', 'noise', 'sine'])
+def test_lttb_matches_sequential(n, kind):
+    rng = np.random.default_rng(n)
+    x = np.arange(n, dtype=np.float64)
+    y = {'walk': rng.normal(size=n).cumsum(), 'noise': rng.normal(size=n), 'sine': np.sin(x / 50)}[kind]
+    np.testing.assert_array_equal(lttb_indices(x, y, 2000), reference_lttb(x, y, 2000))
+
+
+def test_lttb_skips_nan_points():
+    y = np.sin(np.arange(10_000) / 30)
+    y[::7] = np.nan
+    keep = lttb_indices(np.arange(10_000), y, 500)
+    assert len(keep) == 500 and np.all(np.diff(keep) > 0)
+    assert not np.isnan(y[keep[1:-1]]).any()
+
+
+def many_cities(n_cities, years=(2019, 2020, 2021)):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'city': np.repeat([f'City{i:04d}' for i in range(n_cities)], len(years)),
+        'year': np.tile(years, n_cities),
+        'livability_index': rng.uniform(20, 80, n_cities * len(years)),
+    })
+
+
+@pytest.mark.parametrize('build', [figures.trends_figure, figures.grouped_bar_figure])
+def test_whole_dataset_figures_are_bounded(build):
+    df = many_cities(500)
+    fig = build(df)
+    assert len(fig.data) == figures.MAX_CITY_TRACES + 1
+
+    means = df.groupby('city')['livability_index'].mean()
+    best = means.nlargest(figures.MAX_CITY_TRACES)
+    assert [trace.name for trace in fig.data[:-1]] == list(best.index)
+    others = df[~df['city'].isin(best.index)].groupby('year')['livability_index'].mean()
+    assert fig.data[-1].name == 'Mean of the other 480 cities'
+    np.testing.assert_allclose(fig.data[-1].y, others.to_numpy())
+
+
+def test_few_cities_keep_a_trace_each(shipped):
+    assert [trace.name for trace in figures.trends_figure(shipped).data] == sorted(shipped['city'].unique())
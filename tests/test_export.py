@@ -0,0 +1,52 @@
+import json
+import os
+
+import pytest
+
+from livability.export import city_slugs, export_figures, figure_jobs, load_city_index
+
+
+def manifest(output):
+    with open(os.path.join(output, 'manifest.json')) as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_export_skips_missing_city_years(tmp_path, gapped_copy, workers):
+    output = str(tmp_path / 'figures')
+    count, size, _ = export_figures(gapped_copy, output, workers=workers, comparison_size=2)
+    entries = manifest(output)
+    assert count == len(entries) and size > 0
+    paths = {entry['path'] for entry in entries}
+    assert 'radar/Delhi_2020.json' in paths
+    assert 'radar/Delhi_2021.json' not in paths
+    assert len([path for path in paths if path.startswith('radar/')]) == 24
+    # Four cities in 2021 make 6 pairs, five in the other years 10 each
+    comparisons = [entry['figure'] for entry in entries if entry['figure'][0] == 'comparison']
+    assert len(comparisons) == 4 * 10 + 6
+    assert not any('Delhi' in group and year == 2021 for _, group, year in comparisons)
+
+
+def test_comparisons_are_opt_in_and_capped(tmp_path, shipped_copy):
+    city_index = load_city_index(shipped_copy)
+    assert not any(job[0] == 'comparison' for job in figure_jobs(city_index))
+    with pytest.raises(ValueError, match='50 groups'):
+        export_figures(shipped_copy, str(tmp_path / 'figures'), workers=1, comparison_size=2, max_comparisons=49)
+
+
+def test_city_slugs_are_unique():
+    names = city_slugs(['New Delhi', 'New/Delhi', 'new delhi', 'New_Delhi_2', 'Pune'])
+    assert names == {'New Delhi': 'New_Delhi', 'New/Delhi': 'New_Delhi_2', 'new delhi': 'new_delhi_3',
+                     'New_Delhi_2': 'New_Delhi_2_2', 'Pune': 'Pune'}
+
+
+def test_cities_that_slug_alike_get_their_own_files(tmp_path, shipped):
+    path = tmp_path / 'alike.csv'
+    renamed = {'Mumbai': 'New Delhi', 'Chennai': 'New/Delhi', 'Kolkata': 'new delhi'}
+    shipped.assign(city=shipped['city'].replace(renamed)).to_csv(path, index=False)
+    output = str(tmp_path / 'figures')
+    export_figures(str(path), output, workers=1, comparison_size=2)
+    paths = [entry['path'] for entry in manifest(output)]
+    assert len(set(path.casefold() for path in paths)) == len(paths)
+    assert len([path for path in paths if path.startswith('radar/')]) == 25
+    assert len([path for path in paths if path.startswith('city/')]) == 10
@@ -0,0 +1,103 @@
+import os
+import threading
+import time
+
+import plotly.graph_objects as go
+
+from livability.figure_cache import FigureCache, figure_bytes
+
+
+def bar(n, name='a'):
+    return go.Figure(go.Bar(x=list(range(n)), y=list(range(n)), name=name))
+
+
+def test_evicts_least_recently_used_within_max_bytes():
+    size = figure_bytes(bar(10))
+    cache = FigureCache(max_bytes=2 * size + size // 2)
+    builds = []
+
+    def build(n):
+        builds.append(n)
+        return bar(10)
+
+    for key in ('a', 'b'):
+        cache.get_or_build(key, lambda key=key: build(key))
+    cache.get_or_build('a', lambda: build('a'))
+    cache.get_or_build('c', lambda: build('c'))
+    assert len(cache) == 2
+    assert cache.bytes == 2 * size <= cache.max_bytes
+    # 'b' was least recently used, so it went to make room for 'c'
+    cache.get_or_build('a', lambda: build('a'))
+    cache.get_or_build('b', lambda: build('b'))
+    assert builds == ['a', 'b', 'c', 'b']
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (2, 4, 2)
+
+    # A figure larger than the whole budget is returned but not kept
+    big = cache.get_or_build('big', lambda: bar(5000))
+    assert len(big.data[0].x) == 5000
+    assert len(cache) == 2
+
+
+def test_evicted_figures_are_read_back_from_the_spill_dir(tmp_path):
+    size = figure_bytes(bar(10))
+    cache = FigureCache(max_bytes=size, spill_dir=str(tmp_path))
+    first = cache.get_or_build(('fig', 1), lambda: bar(10))
+    cache.get_or_build(('fig', 2), lambda: bar(10, 'b'))
+    assert cache.spills == 1
+    assert len(os.listdir(tmp_path)) == 1
+
+    def fail():
+        raise AssertionError('rebuilt a spilled figure')
+
+    again = cache.get_or_build(('fig', 1), fail)
+    assert again.to_plotly_json() == first.to_plotly_json()
+    assert cache.stats()['disk_hits'] == 1
+
+    # Another cache over the same directory reuses what this one spilled
+    other = FigureCache(max_bytes=size, spill_dir=str(tmp_path))
+    assert other.get_or_build(('fig', 2), fail).to_plotly_json() == bar(10, 'b').to_plotly_json()
+
+
+def test_spill_dir_is_bounded(tmp_path):
+    size = figure_bytes(bar(10))
+    cache = FigureCache(max_bytes=size, spill_dir=str(tmp_path), spill_max_bytes=2 * size)
+    for key in range(5):
+        cache.get_or_build(key, lambda: bar(10))
+    assert cache.spills == 4
+    assert len(os.listdir(tmp_path)) == 2
+    assert cache.spill_bytes == 2 * size
+
+
+def test_concurrent_misses_build_once():
+    cache = FigureCache()
+    started, release = threading.Event(), threading.Event()
+    builds = []
+
+    def build():
+        builds.append(1)
+        started.set()
+        release.wait(5)
+        return bar(10)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_build('key', build))) for _ in range(4)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    # Let the others find the build under way before it finishes
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(builds) == 1
+    assert len(results) == 4
+    assert all(fig is results[0] for fig in results)
+
+
+def test_none_is_not_cached():
+    cache = FigureCache()
+    assert cache.get_or_build('empty', lambda: None) is None
+    assert len(cache) == 0
+    assert cache.get_or_build('empty', lambda: bar(3)) is not None
@@ -0,0 +1,15 @@
+import numpy as np
+
+from livability import figures
+from livability.heatmap import pivot_table
+
+
+def test_year_span():
+    assert figures.year_span([2023, 2019, 2021]) == '2019–2023'
+    assert figures.year_span(np.array([2021, 2021])) == '2021'
+
+
+def test_titles_follow_the_data(shipped):
+    gapped = shipped[shipped['year'].between(2020, 2022)]
+    assert figures.trends_figure(gapped).layout.title.text == 'Livability Index Trends (2020–2022)'
+    assert figures.heatmap_figure(pivot_table(gapped)).layout.title.text == 'Livability Index Heatmap (2020–2022)'
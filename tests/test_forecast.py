@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from livability.forecast import FORECAST_COLUMNS, TrendForecast, city_forecast
+
+YEARS = [2019, 2020, 2021, 2022, 2023]
+
+
+@pytest.fixture
+def table():
+    rng = np.random.default_rng(0)
+    values = rng.uniform(20, 80, (6, 1)) + rng.normal(0, 2, (6, 1)) * np.arange(5) + rng.normal(0, 3, (6, 5))
+    frame = pd.DataFrame(values, index=['Full', 'Flat', 'Gapped', 'Three', 'Pair', 'Single'], columns=YEARS)
+    frame.loc['Flat'] = 50.0 + np.arange(5) * 0.5
+    frame.loc['Gapped', [2020, 2022]] = np.nan
+    frame.loc['Three', [2019, 2023]] = np.nan
+    frame.loc['Pair', [2019, 2020, 2022]] = np.nan
+    frame.loc['Single', YEARS[1:]] = np.nan
+    return frame
+
+
+def linregress_interval(row, future, level):
+    """Forecast and prediction interval of a straight line fitted to the observed cells of ``row``."""
+    observed = row.dropna()
+    x, y = observed.index.to_numpy(dtype=np.float64), observed.to_numpy()
+    fit = stats.linregress(x, y)
+    forecast = fit.intercept + fit.slope * future
+    dof = len(x) - 2
+    residual_variance = ((y - (fit.intercept + fit.slope * x)) ** 2).sum() / dof
+    se = np.sqrt(residual_variance * (1 + 1 / len(x) + (future - x.mean()) ** 2 / ((x - x.mean()) ** 2).sum()))
+    half = stats.t.ppf((1 + level) / 2, dof) * se
+    return forecast, forecast - half, forecast + half
+
+
+@pytest.mark.parametrize('level', [0.8, 0.95])
+def test_matches_per_city_prediction_intervals(table, level):
+    model = TrendForecast(table)
+    future = model.future_years(4)
+    np.testing.assert_array_equal(future, [2024, 2025, 2026, 2027])
+    forecast, lower, upper = model.predict(future, level)
+    for position, city in enumerate(['Full', 'Flat', 'Gapped', 'Three']):
+        expected = linregress_interval(table.loc[city], future.astype(np.float64), level)
+        for got, want in zip((forecast, lower, upper), expected):
+            np.testing.assert_allclose(got[position], want, rtol=1e-9, atol=1e-9)
+
+
+def test_matches_polyfit_for_higher_degrees(table):
+    model = TrendForecast(table, degree=2)
+    future = model.future_years()
+    forecast, _, _ = model.predict(future)
+    for position, city in enumerate(['Full', 'Flat', 'Gapped', 'Three']):
+        observed = table.loc[city].dropna()
+        coef = np.polyfit(observed.index.to_numpy(dtype=np.float64) - model.center, observed.to_numpy(), 2)
+        np.testing.assert_allclose(forecast[position], np.polyval(coef, future - model.center), rtol=1e-9)
+
+
+def test_too_few_years_for_a_band_or_a_trend(table):
+    model = TrendForecast(table)
+    pair, single = model.city('Pair'), model.city('Single')
+    # Two years fix the line exactly: a trend, but no residuals to size a band from
+    observed = table.loc['Pair'].dropna()
+    slope = (observed.iat[1] - observed.iat[0]) / (observed.index[1] - observed.index[0])
+    np.testing.assert_allclose(pair['forecast'], observed.iat[1] + slope * (pair['year'] - observed.index[1]))
+    assert pair[['lower', 'upper']].isna().all().all()
+    assert single[['forecast', 'lower', 'upper']].isna().all().all()
+
+
+def test_unknown_city_has_an_empty_forecast(table):
+    forecast = TrendForecast(table).city('Atlantis')
+    assert forecast.empty
+    assert list(forecast.columns) == FORECAST_COLUMNS
+
+
+def test_frame_lists_every_city_by_year(table):
+    model = TrendForecast(table)
+    frame = model.frame(horizon=2)
+    assert list(frame.columns) == ['city'] + FORECAST_COLUMNS
+    assert len(frame) == 2 * len(table)
+    pd.testing.assert_frame_equal(frame[frame['city'] == 'Gapped'].drop(columns='city').reset_index(drop=True),
+                                  model.city('Gapped', horizon=2))
+
+
+def test_city_forecast_averages_and_reindexes_years():
+    rows = pd.DataFrame({
+        'year': [2019, 2019, 2020, 2022],
+        'livability_index': [40.0, 42.0, 43.0, 47.0],
+    })
+    table = pd.DataFrame([[41.0, 43.0, np.nan, 47.0, np.nan]], index=['city'], columns=YEARS)
+    expected = TrendForecast(table).city('city')
+    forecast = city_forecast(rows, years=YEARS)
+    pd.testing.assert_frame_equal(forecast, expected)
+    # The projection starts after the dataset's last year, not the city's
+    assert forecast['year'].tolist() == [2024, 2025, 2026]
+    assert city_forecast(rows)['year'].tolist() == [2023, 2024, 2025]
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from livability.chunked import ChunkedQueries
+from livability.heatmap import pivot_table
+from livability.query import SqlQueries
+from livability.reload import CityYearPivot, ReloadingDataset
+from livability.sources import FileSource
+from livability.storage import DATASET_COLUMNS, prepare_rows
+
+
+def test_duplicate_city_years_are_averaged_everywhere(tmp_path, shipped):
+    path = tmp_path / 'data.csv'
+    shipped.to_csv(path, index=False)
+    dataset = ReloadingDataset(FileSource(str(path)), columns=DATASET_COLUMNS, prepare=prepare_rows,
+                               aggregates={'heatmap': CityYearPivot('livability_index')})
+    dataset.refresh()
+    # Delhi 2020 appended twice more, with other scores
+    repeats = shipped[(shipped['city'] == 'Delhi') & (shipped['year'] == 2020)]
+    repeats = pd.concat([repeats.assign(livability_index=10.0), repeats.assign(livability_index=40.0)])
+    repeats.to_csv(path, mode='a', header=False, index=False)
+    dataset.refresh()
+    assert dataset.appends == 1
+
+    expected = np.mean([shipped.loc[repeats.index[0], 'livability_index'], 10.0, 40.0])
+    full = pivot_table(dataset.frame)
+    assert full.loc['Delhi', 2020] == pytest.approx(expected, rel=1e-6)
+    sql = SqlQueries.open(str(path))
+    sql.refresh()
+    chunked = ChunkedQueries.open(str(path))
+    chunked.refresh()
+    for table in (dataset.aggregates['heatmap'].table, sql.pivot(), chunked.pivot()):
+        np.testing.assert_allclose(table.loc[full.index, full.columns], full, rtol=1e-6)
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from livability.indices import INDEX_COLUMNS, RAW_INDICATORS, SUB_INDICES, compute_indices
+
+
+def consistent_rows(frame):
+    """Rows whose published livability_index is the mean of their own published sub-indices."""
+    # The columns are published to 6 decimals, so the composite carries up to ~1e-5 of rounding
+    composite = frame[SUB_INDICES].mean(axis=1) * 100
+    return frame[(frame['livability_index'] - composite).abs() < 1e-4]
+
+
+def test_shipped_composite_is_mean_of_sub_indices_only_for_some_cities(shipped):
+    # The Delhi, Kolkata and Mumbai rows are not reproducible from any formula of the raw
+    # indicators: their livability_index is not even the mean of their own sub-indices
+    assert set(consistent_rows(shipped)['city']) == {'Bangalore', 'Chennai'}
+
+
+def test_compute_indices_reproduces_published_columns(shipped):
+    rows = consistent_rows(shipped)
+    computed = compute_indices(rows[RAW_INDICATORS + ['hi']])
+    for col in ['aqi', 'pdi', 'bpl_index']:
+        np.testing.assert_allclose(computed[col], rows[col], atol=1e-6, err_msg=col)
+    np.testing.assert_allclose(computed['livability_index'], rows['livability_index'], atol=1e-4)
+
+
+def test_compute_indices_needs_raw_columns(shipped):
+    with pytest.raises(KeyError, match='pm10'):
+        compute_indices(shipped.drop(columns='pm10'))
+
+
+def test_indices_stay_in_range():
+    rows = pd.DataFrame({
+        'pm2.5': [0.0, 500.0], 'pm10': [0.0, 900.0], 'no2': [0.0, 400.0], 'so2': [0.0, 300.0],
+        'population': [1000, 50_000_000], 'area': [100.0, 10.0], 'bpl_population': [0.0, 120.0], 'hi': [1.0, 0.0],
+    })
+    computed = compute_indices(rows)
+    np.testing.assert_allclose(computed.loc[0, INDEX_COLUMNS], [1.0, 0.999, 1.0, 1.0, 99.975])
+    np.testing.assert_allclose(computed.loc[1, INDEX_COLUMNS], [0.0, 0.0, 0.0, 0.0, 0.0])
@@ -0,0 +1,49 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from livability.indices import INDEX_COLUMNS
+from livability.ingest import load_indicator_files, write_indicator_files
+from livability.sources import IndicatorFilesSource
+from livability.storage import DATASET_COLUMNS, prepare_rows
+
+
+def test_round_trip_keeps_published_scores(tmp_path, shipped):
+    root = str(tmp_path / 'indicators')
+    write_indicator_files(shipped, root)
+    loaded = prepare_rows(IndicatorFilesSource(root).load(columns=DATASET_COLUMNS))
+    expected = prepare_rows(shipped)
+    assert len(loaded) == len(expected)
+    for col in INDEX_COLUMNS:
+        np.testing.assert_array_equal(loaded[col], expected[col], err_msg=col)
+
+
+def test_blank_published_indices_are_computed(tmp_path, shipped):
+    root = str(tmp_path / 'indicators')
+    write_indicator_files(shipped, root)
+    path = os.path.join(root, 'indices', 'Delhi.csv')
+    published = pd.read_csv(path)
+    published.loc[published['year'] == 2021, 'livability_index'] = np.nan
+    published.to_csv(path, index=False)
+
+    loaded = prepare_rows(load_indicator_files(root))
+    delhi = loaded[(loaded['city'] == 'Delhi') & (loaded['year'] == 2021)]
+    assert delhi['livability_index'].notna().all()
+    others = loaded[~loaded.index.isin(delhi.index)]
+    np.testing.assert_array_equal(others['livability_index'],
+                                  prepare_rows(shipped).drop(index=delhi.index)['livability_index'])
+
+
+def test_join_warns_about_dropped_city_years(tmp_path, shipped):
+    root = str(tmp_path / 'indicators')
+    write_indicator_files(shipped, root)
+    path = os.path.join(root, 'census', 'Delhi.csv')
+    census = pd.read_csv(path)
+    census[census['year'] != 2021].to_csv(path, index=False)
+
+    with pytest.warns(UserWarning, match=r'1 city-year\(s\).*Delhi 2021 \(no census\)'):
+        loaded = load_indicator_files(root)
+    assert len(loaded) == len(shipped) - 1
+    assert not ((loaded['city'] == 'Delhi') & (loaded['year'] == 2021)).any()
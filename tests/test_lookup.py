@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from livability.app import Dashboard
+from livability.lookup import CityYearIndex
+from livability.storage import prepare_rows
+from livability.transforms import take_sub_indices
+
+WEIGHTS = (0.4, 0.1, 0.3, 0.2)
+
+
+@pytest.fixture
+def dashboard(shipped_copy):
+    dashboard = Dashboard(shipped_copy)
+    assert dashboard.load()
+    dashboard.weights = None
+    return dashboard
+
+
+def test_city_slices_share_the_frame(shipped):
+    index = CityYearIndex(prepare_rows(shipped))
+    rows = index.city('Delhi', 2020, 2022)
+    assert rows['year'].tolist() == [2020, 2021, 2022]
+    for col in ('pm2.5', 'livability_index'):
+        assert np.shares_memory(rows[col].to_numpy(), index.frame[col].to_numpy())
+    assert index.city('Atlantis').empty
+
+
+def test_city_rows_are_views_with_whatif_scores(dashboard):
+    frame = dashboard.city_index.frame
+    rows = dashboard.city_rows('Mumbai', 2021, 2023)
+    assert np.shares_memory(rows['pm2.5'].to_numpy(), frame['pm2.5'].to_numpy())
+
+    dashboard.weights = WEIGHTS
+    rows = dashboard.city_rows('Mumbai', 2021, 2023)
+    scores = dashboard.weighted_index().scores(WEIGHTS)
+    assert np.shares_memory(rows['pm2.5'].to_numpy(), frame['pm2.5'].to_numpy())
+    assert np.shares_memory(rows['livability_index'].to_numpy(), scores)
+    positions = dashboard.city_index.city_positions('Mumbai', 2021, 2023)
+    np.testing.assert_array_equal(rows['livability_index'], scores[positions])
+
+
+def test_city_sub_indices_match_positions(dashboard):
+    index = dashboard.city_index
+    expected = take_sub_indices(index.sub_indices, index.city_positions('Chennai', 2020, 2021))
+    assert dashboard.city_sub_indices('Chennai', 2020, 2021).equals(expected)
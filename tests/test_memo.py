@@ -0,0 +1,40 @@
+from livability.memo import LRUCache
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    assert cache.put('a', 1) == []
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    assert cache.put('c', 3) == [('b', 2)]
+    assert 'b' not in cache
+    assert (len(cache), cache.weight) == (2, 2)
+    assert cache.get('b', 'missing') == 'missing'
+
+
+def test_weights_bound_the_total():
+    cache = LRUCache(maxsize=10)
+    cache.put('a', 'aaaa', 4)
+    cache.put('b', 'bbbb', 4)
+    # Replacing an entry swaps its weight
+    assert cache.put('a', 'aa', 2) == []
+    assert cache.weight == 6
+    assert cache.put('c', 'ccccc', 5) == [('b', 'bbbb')]
+    assert cache.weight == 7
+    cache.clear()
+    assert (len(cache), cache.weight) == (0, 0)
+
+
+def test_memoize_counts_hits_and_misses():
+    cache = LRUCache(maxsize=2)
+    calls = []
+
+    def compute(key):
+        calls.append(key)
+        return None if key == 'none' else key * 2
+
+    for key in ('x', 'x', 'none', 'none', 'y', 'x'):
+        cache.memoize(key, lambda: compute(key))
+    # None results are memoized too; 'x' was evicted by 'y'
+    assert calls == ['x', 'none', 'y', 'x']
+    assert (cache.hits, cache.misses) == (2, 4)
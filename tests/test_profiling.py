@@ -0,0 +1,84 @@
+import json
+import threading
+
+from livability import profiling
+from livability.profiling import Profiler, profiling_enabled, prometheus_text, tracked_cache
+
+
+def memo(fn):
+    """A stand-in for st.cache_data: one stored result per argument tuple."""
+    results = {}
+
+    def cached(*args):
+        if args not in results:
+            results[args] = fn(*args)
+        return results[args]
+
+    cached.clear = results.clear
+    return cached
+
+
+def test_profiling_is_requested_by_env_or_query(monkeypatch):
+    monkeypatch.delenv('LIVABILITY_PROFILE', raising=False)
+    assert not profiling_enabled()
+    assert not profiling_enabled({'profile': '0'})
+    assert profiling_enabled({'profile': 'yes'})
+    monkeypatch.setenv('LIVABILITY_PROFILE', '1')
+    assert profiling_enabled({})
+
+
+def test_sections_are_recorded_only_when_enabled():
+    off = Profiler(False)
+    with off.section('test.off') as section:
+        section.rows = 5
+    assert off.records == []
+
+    on = Profiler(True)
+    with on.section('test.on', rows=3):
+        pass
+    with on.section('test.on') as section:
+        section.rows = 4
+    assert [(record.name, record.rows) for record in on.records] == [('test.on', 3), ('test.on', 4)]
+    assert all(record.seconds >= 0 for record in on.records)
+    assert 'livability_section_calls_total{section="test.on"} 2' in prometheus_text()
+    assert 'livability_section_rows_total{section="test.on"} 7' in prometheus_text()
+    assert 'test.off' not in prometheus_text()
+
+
+def test_cache_activity_counts_this_run_only():
+    @tracked_cache(memo)
+    def test_square(x):
+        return x * x
+
+    other = threading.Thread(target=lambda: (Profiler(True), test_square(9), test_square(9)))
+    profiler = Profiler(True)
+    assert [test_square(x) for x in (2, 2, 3)] == [4, 4, 9]
+    other.start()
+    other.join()
+    # The other thread's run neither shows here nor replaced this thread's profiler
+    assert test_square(3) == 9
+    assert profiler.cache_activity() == {'test_square': {'hits': 2, 'misses': 2}}
+    assert profiling.cache_totals()['test_square'] == (6, 3)
+    assert 'livability_cache_hits_total{function="test_square"} 3' in prometheus_text()
+    assert 'livability_cache_misses_total{function="test_square"} 3' in prometheus_text()
+
+    # A new run on this thread starts from zero
+    assert Profiler(True).cache_activity() == {}
+
+
+def test_jsonl_has_sections_and_caches(tmp_path):
+    @tracked_cache(memo)
+    def test_double(x):
+        return 2 * x
+
+    profiler = Profiler(True)
+    with profiler.section('test.jsonl', rows=1):
+        test_double(1)
+    path = tmp_path / 'profile.jsonl'
+    profiler.append_log(str(path), page='Home')
+    profiler.append_log(str(path), page='Home')
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(entries) == 4
+    assert entries[0]['section'] == 'test.jsonl' and entries[0]['rows'] == 1 and entries[0]['page'] == 'Home'
+    assert entries[1] == {'ts': entries[0]['ts'], 'cache': 'test_double', 'hits': 0, 'misses': 1, 'page': 'Home'}
+    assert Profiler(False).to_jsonl() == ''
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from livability.quantiles import CityQuantiles
+
+
+@pytest.fixture
+def rows():
+    rng = np.random.default_rng(0)
+    sizes = {'Tiny': 1, 'Pair': 2, 'Small': 7, 'Medium': 300, 'Large': 5000}
+    return pd.DataFrame({
+        'city': np.repeat(list(sizes), list(sizes.values())),
+        # Stored as float32, as the dataset's columns are
+        'livability_index': np.concatenate([rng.normal(50, 10, n) for n in sizes.values()]).astype(np.float32),
+    })
+
+
+def expected_quartiles(rows):
+    return rows.groupby('city')['livability_index'].apply(
+        lambda values: pd.Series(np.quantile(values.astype(np.float64), [0.25, 0.5, 0.75], method='hazen'), index=['q1', 'median', 'q3'])
+    ).unstack()
+
+
+def test_exact_quartiles_match_numpy_hazen(rows):
+    quantiles = CityQuantiles(exact_max=10_000)
+    # Folded in uneven chunks, as the chunked backend and appends do
+    shuffled = rows.sample(frac=1, random_state=0)
+    for start, stop in [(0, 1000), (1000, 1001), (1001, len(shuffled))]:
+        quantiles.update(shuffled.iloc[start:stop])
+    stats = quantiles.stats()
+    assert stats['exact'].all()
+    np.testing.assert_allclose(stats[['q1', 'median', 'q3']], expected_quartiles(rows).loc[stats.index], rtol=1e-12)
+    np.testing.assert_array_equal(stats['count'], rows.groupby('city').size().loc[stats.index])
+
+
+def test_sketched_quartiles_are_close_in_rank(rows):
+    quantiles = CityQuantiles(exact_max=100)
+    quantiles.update(rows)
+    stats = quantiles.stats()
+    assert stats.loc[['Medium', 'Large'], 'exact'].eq(False).all()
+    for city in ('Medium', 'Large'):
+        values = np.sort(rows.loc[rows['city'] == city, 'livability_index'].to_numpy())
+        for p, col in [(0.25, 'q1'), (0.5, 'median'), (0.75, 'q3')]:
+            rank = np.searchsorted(values, stats.loc[city, col]) / len(values)
+            assert abs(rank - p) < 0.02, (city, col)
+    np.testing.assert_allclose(stats.loc[['Tiny', 'Pair', 'Small'], ['q1', 'median', 'q3']],
+                               expected_quartiles(rows).loc[['Tiny', 'Pair', 'Small']], rtol=1e-12)
@@ -0,0 +1,98 @@
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from livability.app import Dashboard, SqlDashboard
+from livability.query import CITIES_SUFFIX, DEFAULT_TABLE, build_database, quote_identifier
+
+WEIGHTS = (0.4, 0.1, 0.3, 0.2)
+
+
+def drop_city_stats(path, duckdb):
+    """Drop the per-city table, as in a database written by another tool."""
+    if duckdb:
+        import duckdb as engine
+    else:
+        engine = sqlite3
+    con = engine.connect(path)
+    con.execute(f'DROP TABLE {quote_identifier(DEFAULT_TABLE + CITIES_SUFFIX)}')
+    con.commit()
+    con.close()
+
+
+@pytest.fixture
+def memory(gapped_copy):
+    dashboard = Dashboard(gapped_copy)
+    assert dashboard.load()
+    dashboard.weights, dashboard.year_window = None, None
+    return dashboard
+
+
+@pytest.fixture(params=[('sqlite', True), ('sqlite', False), ('duckdb', True), ('duckdb', False)],
+                ids=lambda param: f'{param[0]}-{"stats" if param[1] else "rows"}')
+def sql(request, tmp_path, gapped_copy):
+    engine, city_stats = request.param
+    duckdb = engine == 'duckdb'
+    if duckdb:
+        pytest.importorskip('duckdb')
+    path = str(tmp_path / f'gapped.{"duckdb" if duckdb else "db"}')
+    build_database(gapped_copy, path)
+    if not city_stats:
+        drop_city_stats(path, duckdb)
+    dashboard = SqlDashboard(path)
+    assert dashboard.load()
+    assert dashboard.queries.has_city_stats() == city_stats
+    dashboard.weights, dashboard.year_window = None, None
+    return dashboard
+
+
+def plain(frame):
+    """``frame`` with names as strings and numbers as float64, to compare backends' dtypes."""
+    return frame.astype({col: str if col == 'city' else 'float64' for col in frame.columns}).reset_index(drop=True)
+
+
+def test_overview_matches_memory(memory, sql):
+    expected, overview = memory.overview(), sql.overview()
+    assert overview.keys() == expected.keys()
+    for key, value in expected.items():
+        assert overview[key] == pytest.approx(value, rel=1e-6), key
+
+
+@pytest.mark.parametrize('top_k', [None, 3])
+def test_leaderboard_matches_memory(memory, sql, top_k):
+    pd.testing.assert_frame_equal(plain(sql.leaderboard_rows(top_k)), plain(memory.leaderboard_rows(top_k)), rtol=1e-6)
+
+
+@pytest.mark.parametrize('weights, window', [(WEIGHTS, None), (None, (2020, 2022)), (WEIGHTS, (2021, 2023))])
+def test_whatif_ranking_matches_memory(memory, sql, weights, window):
+    for dashboard in (memory, sql):
+        dashboard.weights, dashboard.year_window = weights, window
+    expected = memory.whatif_leaderboard()
+    ranking = sql.whatif_leaderboard()
+    assert ranking['city'].astype(str).tolist() == expected['city'].astype(str).tolist()
+    pd.testing.assert_frame_equal(plain(ranking[expected.columns]), plain(expected), rtol=1e-5)
+
+
+def test_heatmap_pivot_matches_memory(memory, sql):
+    expected = memory.heatmap.sort_index()
+    pivot = sql.queries.pivot().sort_index()
+    assert np.isnan(pivot.loc['Delhi', 2021])
+    pd.testing.assert_frame_equal(pivot, expected, check_names=False, check_dtype=False, check_index_type=False,
+                                  check_column_type=False, rtol=1e-6)
+
+
+def test_box_stats_match_memory(memory, sql):
+    expected = memory.box_stats().sort_index()
+    stats = sql.box_stats().sort_index()
+    pd.testing.assert_frame_equal(stats, expected, check_index_type=False, check_names=False, rtol=1e-6)
+
+
+def test_city_rows_match_memory(memory, sql):
+    for dashboard in (memory, sql):
+        dashboard.weights = WEIGHTS
+    expected = memory.city_rows('Delhi', 2020, 2023)
+    rows = sql.city_rows('Delhi', 2020, 2023)
+    assert rows['year'].tolist() == [2020, 2022, 2023]
+    pd.testing.assert_frame_equal(plain(rows[expected.columns]), plain(expected), rtol=1e-5)
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+from livability.chunked import ChunkedQueries
+from livability.indices import INDEX_COLUMNS, RAW_INDICATORS, compute_indices
+from livability.lookup import CityYearIndex
+from livability.query import SqlQueries
+from livability.reload import CityStats, ReloadingDataset
+from livability.sources import FileSource
+from livability.storage import DATASET_COLUMNS, prepare_rows
+from livability.whatif import WeightedIndex
+
+PUNE = 'Pune,2023,40.0,70.0,30.0,10.0,7000000,730.0,12.0,,,0.6,,\n'
+# No raw pollution either: its AQI, and so its composite, cannot be computed
+NAGPUR = 'Nagpur,2023,,,,,2500000,220.0,15.0,,,0.6,,\n'
+
+
+def appended_dataset(tmp_path, shipped, lines):
+    path = tmp_path / 'data.csv'
+    shipped[['city', 'year'] + [col for col in DATASET_COLUMNS if col not in ('city', 'year')]].to_csv(path, index=False)
+    dataset = ReloadingDataset(FileSource(str(path)), columns=DATASET_COLUMNS, prepare=prepare_rows,
+                               aggregates={'leaderboard': CityStats('livability_index')})
+    dataset.refresh()
+    with open(path, 'a') as f:
+        f.write(''.join(lines))
+    dataset.refresh()
+    assert dataset.appends == 1
+    return dataset
+
+
+def test_append_fills_blank_index_cells(tmp_path, shipped):
+    dataset = appended_dataset(tmp_path, shipped, [PUNE])
+    pune = dataset.frame[dataset.frame['city'] == 'Pune']
+    expected = compute_indices(pune[RAW_INDICATORS + ['hi']])
+    np.testing.assert_allclose(pune[INDEX_COLUMNS], expected, rtol=1e-6)
+
+    table = dataset.aggregates['leaderboard'].table()
+    assert table['livability_index'].notna().all()
+    row = table[table['city'] == 'Pune'].iloc[0]
+    assert row['years'] == 1
+    assert row['livability_index'] == pune['livability_index'].iat[0]
+
+
+def test_shipped_index_cells_are_kept(shipped):
+    prepared = prepare_rows(shipped)
+    np.testing.assert_allclose(prepared[INDEX_COLUMNS], shipped[INDEX_COLUMNS], rtol=1e-6)
+
+
+def test_unscored_city_is_not_ranked(tmp_path, shipped):
+    dataset = appended_dataset(tmp_path, shipped, [PUNE, NAGPUR])
+    nagpur = dataset.frame[dataset.frame['city'] == 'Nagpur']
+    assert np.isnan(nagpur['livability_index'].iat[0])
+
+    stats = dataset.aggregates['leaderboard']
+    assert 'Nagpur' not in set(stats.table()['city'])
+    assert stats.rank('Nagpur') is None
+    assert stats.table()['rank'].tolist() == list(range(1, 7))
+
+    ranking = WeightedIndex(CityYearIndex(dataset.frame)).ranking([1, 2, 3, 4])
+    assert 'Nagpur' not in set(ranking['city'])
+    assert ranking['livability_index'].notna().all()
+    assert len(ranking) == 6
+
+
+def test_duplicate_city_years_count_once(tmp_path, shipped):
+    # Delhi 2020 appended again
+    delhi = shipped[(shipped['city'] == 'Delhi') & (shipped['year'] == 2020)].iloc[0]
+    line = ','.join('' if pd.isna(delhi[col]) else str(delhi[col]) for col in DATASET_COLUMNS[2:])
+    dataset = appended_dataset(tmp_path, shipped, [f'Delhi,2020,{line}\n', PUNE])
+    path = str(tmp_path / 'data.csv')
+    sql = SqlQueries.open(path)
+    sql.refresh()
+    chunked = ChunkedQueries.open(path)
+    chunked.refresh()
+    weighted = WeightedIndex(CityYearIndex(dataset.frame))
+    for ranking in (dataset.aggregates['leaderboard'].table(), weighted.ranking([1, 2, 3, 4]),
+                    weighted.ranking([1, 2, 3, 4], 2020), sql.leaderboard(), sql.leaderboard(None, None, 2020),
+                    chunked.leaderboard(), chunked.leaderboard(None, (0.4, 0.1, 0.3, 0.2), 2020)):
+        years = ranking.set_index(ranking['city'].astype(str))['years']
+        assert years['Delhi'] == years['Mumbai'], ranking
+        assert years['Pune'] == 1
@@ -0,0 +1,144 @@
+import os
+
+import numpy as np
+import pytest
+
+from livability.sensors import (SENSOR_COLUMNS, SENSOR_HEADER, FileTail, LineDecoder, PipeTail, RingBuffer,
+                                SensorStream, allowed_source, parse_lines)
+
+
+def reading(i):
+    return f'2024-10-15 14:00:{i:02d},{i},20.{i:02d},40.5\n'.encode()
+
+
+def block(start, stop):
+    return np.vstack([np.arange(start, stop, dtype=np.float64)] * 2)
+
+
+def test_ring_buffer_keeps_the_latest_rows_in_order():
+    buffer = RingBuffer(5, ['a', 'b'])
+    buffer.extend(block(0, 3))
+    assert len(buffer) == 3
+    buffer.extend(block(3, 7))  # wraps around
+    assert len(buffer) == 5
+    assert buffer.to_frame()['a'].tolist() == [2, 3, 4, 5, 6]
+    buffer.extend(block(7, 20))  # more than the capacity at once
+    assert buffer.to_frame()['b'].tolist() == [15, 16, 17, 18, 19]
+    buffer.extend(block(20, 20))
+    assert (len(buffer), buffer.total) == (5, 20)
+
+
+def test_line_decoder_carries_partial_lines():
+    decoder = LineDecoder(max_bytes=64)
+    line = reading(1)
+    assert decoder.feed(line[:10]) == b''
+    assert decoder.feed(line[10:] + reading(2)[:5]) == line
+    assert decoder.feed(reading(2)[5:]) == reading(2)
+    # A partial line is dropped on reset, and once it outgrows max_bytes
+    decoder.feed(b'2024-10')
+    decoder.reset()
+    assert decoder.feed(reading(3)) == reading(3)
+    assert decoder.feed(b'x' * 100) == b''
+    assert decoder.feed(reading(4)) == reading(4)
+
+
+def test_parse_lines_drops_headers_and_malformed_rows():
+    data = (SENSOR_HEADER.encode() + b'\n' + reading(1) + b'not,a,reading,row\n' + b'2024-10-15 14:00:02,5\n'
+            + b'\n' + b'2024-10-15 14:00:03,1,2,3,4,5\n' + reading(4))
+    parsed = parse_lines(data)
+    assert parsed.shape == (len(SENSOR_COLUMNS), 2)
+    assert parsed[1].tolist() == [1, 4]
+    np.testing.assert_allclose(np.diff(parsed[0]), 3)
+    assert parse_lines(b'').shape == (len(SENSOR_COLUMNS), 0)
+
+
+def test_file_tail_reads_appends_and_restarts(tmp_path):
+    path = tmp_path / 'sensors.csv'
+    tail = FileTail(str(path))
+    assert tail.read() == (b'', False)
+    path.write_bytes(reading(1) + reading(2)[:8])
+    assert tail.read() == (reading(1) + reading(2)[:8], True)
+    with open(path, 'ab') as f:
+        f.write(reading(2)[8:])
+    assert tail.read() == (reading(2)[8:], False)
+    assert tail.read() == (b'', False)
+
+    # Truncated in place
+    path.write_bytes(reading(3))
+    assert tail.read() == (reading(3), True)
+    # Rotated: replaced by a new file
+    rotated = tmp_path / 'new.csv'
+    rotated.write_bytes(reading(4) + reading(5) + reading(6))
+    os.replace(rotated, path)
+    assert tail.read() == (reading(4) + reading(5) + reading(6), True)
+
+
+def test_file_tail_skips_a_backlog_to_a_full_line(tmp_path):
+    path = tmp_path / 'sensors.csv'
+    path.write_bytes(b''.join(reading(i) for i in range(10)))
+    tail = FileTail(str(path), max_bytes=len(reading(0)) * 2 + 3)
+    assert tail.read() == (reading(8) + reading(9), True)
+
+
+def test_pipe_tail_reads_what_was_written(tmp_path):
+    path = str(tmp_path / 'sensors.fifo')
+    os.mkfifo(path)
+    tail = PipeTail(path)
+    try:
+        assert tail.read() == (b'', False)
+        writer = os.open(path, os.O_WRONLY)
+        os.write(writer, reading(1) + reading(2)[:6])
+        assert tail.read() == (reading(1) + reading(2)[:6], False)
+        os.write(writer, reading(2)[6:])
+        assert tail.read() == (reading(2)[6:], False)
+        os.close(writer)
+    finally:
+        tail.close()
+
+
+def test_sensor_stream_parses_lines_split_across_polls(tmp_path):
+    path = tmp_path / 'sensors.csv'
+    stream = SensorStream(str(path), capacity=3)
+    assert stream.poll() == 0
+    path.write_bytes(SENSOR_HEADER.encode() + b'\n' + reading(1) + reading(2)[:12])
+    assert stream.poll() == 1
+    with open(path, 'ab') as f:
+        f.write(reading(2)[12:] + reading(3) + reading(4))
+    assert stream.poll() == 3
+    snapshot = stream.snapshot()
+    assert snapshot['light_intensity'].tolist() == [2, 3, 4]
+    assert str(snapshot['timestamp'].iat[0]) == '2024-10-15 14:00:02'
+
+    # After truncation, the stale partial line is not glued to the new data
+    with open(path, 'ab') as f:
+        f.write(reading(5)[:9])
+    stream.poll()
+    path.write_bytes(reading(6))
+    assert stream.poll() == 1
+    assert stream.snapshot()['light_intensity'].tolist() == [3, 4, 6]
+    stream.close()
+
+
+def test_allowed_source_resolves_under_data_dir(tmp_path):
+    assert allowed_source('sensor_data.csv', tmp_path) == os.path.join(os.path.realpath(tmp_path), 'sensor_data.csv')
+    assert allowed_source(str(tmp_path / 'sub' / 'live.csv'), tmp_path).endswith(os.path.join('sub', 'live.csv'))
+
+
+@pytest.mark.parametrize('path', ['/etc/passwd', '../outside.csv', 'sub/../../outside.csv', '.', '~/secrets.csv'])
+def test_allowed_source_rejects_paths_outside_data_dir(tmp_path, path):
+    (tmp_path / 'sub').mkdir()
+    with pytest.raises(ValueError):
+        allowed_source(path, tmp_path / 'sub')
+
+
+def test_allowed_source_rejects_symlink_out_of_data_dir(tmp_path):
+    (tmp_path / 'data').mkdir()
+    (tmp_path / 'data' / 'link.csv').symlink_to('/etc/passwd')
+    with pytest.raises(ValueError):
+        allowed_source('link.csv', tmp_path / 'data')
+
+
+def test_allowed_source_accepts_configured_devices(tmp_path):
+    assert allowed_source('/dev/null', tmp_path, devices=['/dev/null']) == '/dev/null'
+    with pytest.raises(ValueError):
+        allowed_source('/dev/zero', tmp_path, devices=['/dev/null'])
@@ -0,0 +1,64 @@
+import http.client
+import json
+import os
+import threading
+
+import pytest
+
+from livability.snapshot import build_snapshot, latest_version, make_server
+
+
+@pytest.fixture
+def snapshot_root(tmp_path, gapped_copy):
+    root = str(tmp_path / 'snapshot')
+    build_snapshot(gapped_copy, root, workers=1)
+    return root
+
+
+def test_snapshot_of_gapped_data(snapshot_root):
+    with open(os.path.join(snapshot_root, latest_version(snapshot_root), 'snapshot.json')) as f:
+        index = json.load(f)
+    assert index['rows'] == 24
+    assert 'radar/Delhi_2021.json' not in index['figures']
+    assert not any(path.startswith('comparison/') for path in index['figures'])
+
+
+def test_version_covers_build_parameters(tmp_path, gapped_copy, snapshot_root):
+    default = latest_version(snapshot_root)
+    assert build_snapshot(gapped_copy, snapshot_root, workers=1).endswith(default)
+    build_snapshot(gapped_copy, snapshot_root, workers=1, comparison_size=2)
+    paired = latest_version(snapshot_root)
+    assert paired != default
+    with open(os.path.join(snapshot_root, paired, 'snapshot.json')) as f:
+        assert any(path.startswith('comparison/2021/') for path in json.load(f)['figures'])
+
+
+def test_server_streams_files_from_disk(snapshot_root):
+    server = make_server(snapshot_root, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    version = server.store.version
+    figure = os.path.join(snapshot_root, version, 'figures', 'radar', 'Delhi_2020.json')
+    try:
+        conn = http.client.HTTPConnection('127.0.0.1', server.server_address[1])
+
+        def get(path):
+            conn.request('GET', path)
+            response = conn.getresponse()
+            return response, response.read()
+
+        response, body = get(f'/v/{version}/figures/radar/Delhi_2020.json')
+        assert response.status == 200 and 'immutable' in response.getheader('Cache-Control')
+        with open(figure, 'rb') as f:
+            assert body == f.read()
+        assert json.loads(get('/')[1])['version'] == version
+        assert get('/view/radar/Delhi_2020')[0].getheader('Content-Type') == 'text/html'
+        for missing in ('/figures/radar/Delhi_2021.json', '/view/radar/Delhi_2021', '/v/0/snapshot.json'):
+            assert get(missing)[0].status == 404
+        # Files are read per request, not held by the store
+        with open(figure, 'w') as f:
+            f.write('{}')
+        assert get('/figures/radar/Delhi_2020.json')[1] == b'{}'
+        conn.close()
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from livability.storage import (DATASET_COLUMNS, SCHEMA, columnar_path, convert_csv, prepare_rows, read_csv,
+                                read_dataset)
+
+# A hand-appended row without its population: its pdi, and so its composite, stay blank
+PUNE = 'Pune,2023,40.0,70.0,30.0,10.0,,730.0,12.0,,,0.6,,\n'
+
+
+def with_pune(tmp_path, shipped):
+    path = tmp_path / 'data.csv'
+    shipped[['city', 'year'] + [col for col in DATASET_COLUMNS if col not in ('city', 'year')]].to_csv(
+        path, index=False)
+    with open(path, 'a') as f:
+        f.write(PUNE)
+    return str(path)
+
+
+def test_csv_reads_into_schema_with_blank_population(tmp_path, shipped):
+    frame = read_csv(with_pune(tmp_path, shipped))
+    assert dict(frame.dtypes.astype(str)) == {col: SCHEMA[col] for col in frame.columns}
+    assert frame['population'].isna().sum() == 1
+    pune = prepare_rows(frame).iloc[-1]
+    assert pd.isna(pune['pdi']) and pd.isna(pune['livability_index'])
+    assert not pd.isna(pune['aqi'])
+
+
+def test_parquet_round_trip(tmp_path, shipped):
+    path = with_pune(tmp_path, shipped)
+    from_csv = read_csv(path)
+    assert convert_csv(path) == columnar_path(path)
+    from_parquet = read_dataset(path)
+    pd.testing.assert_frame_equal(from_parquet, from_csv)
+    columns = ['city', 'population', 'livability_index']
+    pd.testing.assert_frame_equal(read_dataset(path, columns=columns), from_csv[columns])
+    np.testing.assert_array_equal(from_parquet['population'].isna(), from_csv['population'].isna())
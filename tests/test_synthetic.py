@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from livability.indices import INDEX_COLUMNS
+from livability.storage import DATASET_COLUMNS, read_csv, read_parquet
+from livability.synthetic import livability_chunks, sensor_chunks, write_chunks
+
+
+def test_livability_chunks_are_reproducible():
+    first = pd.concat(livability_chunks(7, 3, chunk_rows=6), ignore_index=True)
+    again = pd.concat(livability_chunks(7, 3, chunk_rows=6, seed=0), ignore_index=True)
+    pd.testing.assert_frame_equal(first, again)
+    other = pd.concat(livability_chunks(7, 3, chunk_rows=6, seed=1), ignore_index=True)
+    assert not first['pm2.5'].equals(other['pm2.5'])
+
+    assert list(first.columns) == DATASET_COLUMNS
+    assert first['city'].tolist() == [f'City{i}' for i in range(7) for _ in range(3)]
+    assert first['year'].tolist() == [2019, 2020, 2021] * 7
+    assert first[INDEX_COLUMNS].notna().all().all()
+    assert first['livability_index'].between(0, 100).all()
+
+
+def test_sensor_chunks_continue_across_chunks():
+    readings = pd.concat(sensor_chunks(10, freq='10ms', chunk_rows=4), ignore_index=True)
+    assert len(readings) == 10
+    assert (readings['timestamp'].diff().dropna() == pd.Timedelta('10ms')).all()
+    pd.testing.assert_frame_equal(readings, pd.concat(sensor_chunks(10, freq='10ms', chunk_rows=4), ignore_index=True))
+
+
+@pytest.mark.parametrize('name', ['synthetic.csv', 'synthetic.parquet'])
+def test_written_livability_reads_back(tmp_path, name):
+    pytest.importorskip('pyarrow')
+    path = str(tmp_path / name)
+    assert write_chunks(livability_chunks(7, 3, chunk_rows=6), path, typed=True) == 21
+    expected = pd.concat(livability_chunks(7, 3, chunk_rows=6), ignore_index=True)
+    read = read_parquet(path) if name.endswith('.parquet') else read_csv(path)
+    assert read['city'].astype(str).tolist() == expected['city'].tolist()
+    numeric = [col for col in DATASET_COLUMNS if col != 'city']
+    np.testing.assert_allclose(read[numeric].to_numpy(dtype=np.float64), expected[numeric].to_numpy(dtype=np.float64),
+                               rtol=1e-6)
+
+
+def test_written_sensors_read_back(tmp_path):
+    path = str(tmp_path / 'sensors.csv')
+    assert write_chunks(sensor_chunks(10, chunk_rows=4), path) == 10
+    read = pd.read_csv(path, parse_dates=['timestamp'])
+    expected = pd.concat(sensor_chunks(10, chunk_rows=4), ignore_index=True)
+    pd.testing.assert_frame_equal(read, expected, check_dtype=False)
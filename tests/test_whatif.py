@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from livability.chunked import ChunkedQueries
+from livability.indices import SUB_INDICES
+from livability.lookup import CityYearIndex
+from livability.query import SqlQueries
+from livability.storage import prepare_rows
+from livability.whatif import EQUAL_WEIGHTS, WeightedIndex, normalize_weights, weighted_scores
+
+WEIGHTS = (0.4, 0.1, 0.3, 0.2)
+
+
+@pytest.fixture
+def city_index(shipped):
+    return CityYearIndex(prepare_rows(shipped))
+
+
+@pytest.fixture
+def engine(city_index):
+    return WeightedIndex(city_index)
+
+
+def test_equal_weights_give_the_published_index(engine):
+    np.testing.assert_allclose(engine.scores((1, 1, 1, 1)), engine.published, atol=1e-4)
+
+
+@pytest.mark.parametrize('step', [1e-3, 1e-2, 5e-2])
+def test_small_weight_changes_move_scores_slightly(engine, step):
+    # Sub-indices lie in [0, 1], so a score moves at most 100 × the total weight change
+    for column in range(len(SUB_INDICES)):
+        weights = np.array(EQUAL_WEIGHTS)
+        weights[column] += step
+        change = np.abs(np.asarray(normalize_weights(weights)) - EQUAL_WEIGHTS).sum()
+        moved = np.abs(engine.scores(weights) - engine.published)
+        assert moved.max() <= 100 * change + 1e-4
+
+
+def test_weighted_scores_match_engine(engine, city_index):
+    np.testing.assert_allclose(weighted_scores(city_index.frame, WEIGHTS), engine.scores(WEIGHTS), atol=1e-4)
+
+
+@pytest.mark.parametrize('window', [(None, None), (2020, 2022)])
+def test_backends_rank_alike(engine, shipped_copy, window):
+    expected = engine.ranking(WEIGHTS, *window)
+    sql = SqlQueries.open(shipped_copy)
+    sql.refresh()
+    chunked = ChunkedQueries.open(shipped_copy)
+    chunked.refresh()
+    key = normalize_weights(WEIGHTS)
+    for ranking in (sql.leaderboard(None, key, *window), chunked.leaderboard(None, key, *window)):
+        assert ranking['city'].astype(str).tolist() == expected['city'].tolist()
+        np.testing.assert_allclose(ranking['livability_index'], expected['livability_index'], atol=1e-3)